@@ -2,7 +2,8 @@ import dash
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 from app.utils.utils import navbar, footer
-from app.utils.forecast_loader import start_forecast_thread
+from app.utils.forecast_loader import build_master_volume_forecast, start_forecast_thread
+from app.utils.generation import start_generation_watcher
 
 import logging
 logger = logging.getLogger('cmdstanpy')
@@ -20,6 +21,9 @@ app.config.suppress_callback_exceptions = True
 
 start_forecast_thread()
 
+# Swap in each new data generation without a restart, then refit the home page forecast on it
+start_generation_watcher(after_reload=build_master_volume_forecast)
+
 app.layout = dbc.Container([
     navbar(),
     dash.page_container,
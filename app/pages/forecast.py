@@ -3,184 +3,191 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases
 from app.utils.utils import make_table, empty_figure
 from app.utils.forecast_engine import *
 
+# The houston_311 columns this module reads
+CASE_COLUMNS = ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY"]
+
 register_page(__name__, path="/forecasts", title="Forecasts")
 
 # Layout
-layout = dbc.Container([
-    html.H2("Complaint Forecasts (Prophet Model)", className="text-center text-primary mt-4 mb-4"),
-
-    dbc.Row([
-        dbc.Col(
-            dbc.RadioItems(
-                id="forecast-level",
-                options=[
-                    {"label": "Department", "value": "department"},
-                    {"label": "Division", "value": "division"},
-                    {"label": "Category", "value": "category"},
-                ],
-                value="department",
-                inline=True,
-                inputClassName="btn-check",
-                labelClassName="btn btn-outline-primary",
-                labelCheckedClassName="btn btn-primary"
-            ),
-            width="auto"
-        )
-    ], justify="center", className="mb-4"),
-
-    dbc.Row([
-        dbc.Col([
-            dbc.Label("Select Neighborhood(s):", className="text-white"),
-            dcc.Dropdown(
-                id="neighborhood-select",
-                options=[
-                    {"label": n, "value": n}
-                    for n in sorted(
-                        df["NEIGHBORHOOD"]
-                        .dropna()
-                        .astype(str)
-                        .str.replace(r"\s+", " ", regex=True)
-                        .str.replace("\u00a0", " ", regex=False)
-                        .str.strip()
-                        .str.title()
-                        .unique()
-                    )
-                ],
-                value=[],
-                multi=True,
-                clearable=True,
-                placeholder="Select neighborhood(s)",
-                style={
-                    "width": "100%",
-                    "backgroundColor": "#361566",
-                    "color": "white",
-                    "border": "none",
-                    "boxShadow": "none"
-                }
-            ),
-        ], width=4),
-        dbc.Col([
-            html.Label(id="item-select-label", className="text-white pb-2"),
-            dbc.Select(id="item-select", options=[{"label": "All Items", "value": "ALL"}], value="ALL")
-        ], width=4),
-    ], justify="center", className="mb-3"),
-
-    dbc.Row(
-        [
+def layout():
+    # Rows are loaded on the first visit, not when the app imports its pages
+    df = load_cases(CASE_COLUMNS)
+
+    return dbc.Container([
+        html.H2("Complaint Forecasts (Prophet Model)", className="text-center text-primary mt-4 mb-4"),
+
+        dbc.Row([
             dbc.Col(
                 dbc.RadioItems(
-                    id="forecast-type",
+                    id="forecast-level",
                     options=[
-                        {"label": "Complaint Volume", "value": "volume"},
-                        {"label": "Severity", "value": "severity"}
+                        {"label": "Department", "value": "department"},
+                        {"label": "Division", "value": "division"},
+                        {"label": "Category", "value": "category"},
                     ],
-                    value="volume",
+                    value="department",
                     inline=True,
                     inputClassName="btn-check",
-                    labelClassName="btn btn-outline-info",
-                    labelCheckedClassName="btn btn-info"
+                    labelClassName="btn btn-outline-primary",
+                    labelCheckedClassName="btn btn-primary"
                 ),
-                width="auto",
-                className="text-center"
-            )
-        ],
-        justify="center",
-        className="my-4"
-    ),
-
-    html.H5(
-        id="forecast-subtitle",
-        className="text-center text-white mb-2"
-    ),
-    
-    dbc.Row(
-        dbc.Col([
-            dbc.Label("Forecast Horizon (Months):", className="text-white"),
-            dcc.Slider(
-                id="forecast-horizon",
-                min=3,
-                max=18,
-                step=3,
-                value=12,
-                marks={i: str(i) for i in range(3, 19, 3)}
+                width="auto"
             )
-        ], width=6),
-        justify="center",
-        className="mb-4"
-    ),
+        ], justify="center", className="mb-4"),
 
-    # Forecast Graph Card
-    dbc.Card(
-        dbc.CardBody(
-            dbc.Spinner(
-                dcc.Graph(
-                    id="forecast-graph",
-                    figure={},
-                    style={"height": "500px"}
+        dbc.Row([
+            dbc.Col([
+                dbc.Label("Select Neighborhood(s):", className="text-white"),
+                dcc.Dropdown(
+                    id="neighborhood-select",
+                    options=[
+                        {"label": n, "value": n}
+                        for n in sorted(
+                            df["NEIGHBORHOOD"]
+                            .dropna()
+                            .astype(str)
+                            .str.replace(r"\s+", " ", regex=True)
+                            .str.replace("\u00a0", " ", regex=False)
+                            .str.strip()
+                            .str.title()
+                            .unique()
+                        )
+                    ],
+                    value=[],
+                    multi=True,
+                    clearable=True,
+                    placeholder="Select neighborhood(s)",
+                    style={
+                        "width": "100%",
+                        "backgroundColor": "#361566",
+                        "color": "white",
+                        "border": "none",
+                        "boxShadow": "none"
+                    }
                 ),
-                color="primary",
-                type="grow",
-                size="lg"
-            )
+            ], width=4),
+            dbc.Col([
+                html.Label(id="item-select-label", className="text-white pb-2"),
+                dbc.Select(id="item-select", options=[{"label": "All Items", "value": "ALL"}], value="ALL")
+            ], width=4),
+        ], justify="center", className="mb-3"),
+
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.RadioItems(
+                        id="forecast-type",
+                        options=[
+                            {"label": "Complaint Volume", "value": "volume"},
+                            {"label": "Severity", "value": "severity"}
+                        ],
+                        value="volume",
+                        inline=True,
+                        inputClassName="btn-check",
+                        labelClassName="btn btn-outline-info",
+                        labelCheckedClassName="btn btn-info"
+                    ),
+                    width="auto",
+                    className="text-center"
+                )
+            ],
+            justify="center",
+            className="my-4"
         ),
-        className="bg-dark border-dark mb-4"
-    ),
-
-    dbc.Row(
-        dbc.Col(
-            dbc.Card(
-                dbc.CardBody([
-                    html.H5(
-                        "Monthly Complaint Predictions",
-                        className="text-center text-white mb-4"
+
+        html.H5(
+            id="forecast-subtitle",
+            className="text-center text-white mb-2"
+        ),
+    
+        dbc.Row(
+            dbc.Col([
+                dbc.Label("Forecast Horizon (Months):", className="text-white"),
+                dcc.Slider(
+                    id="forecast-horizon",
+                    min=3,
+                    max=18,
+                    step=3,
+                    value=12,
+                    marks={i: str(i) for i in range(3, 19, 3)}
+                )
+            ], width=6),
+            justify="center",
+            className="mb-4"
+        ),
+
+        # Forecast Graph Card
+        dbc.Card(
+            dbc.CardBody(
+                dbc.Spinner(
+                    dcc.Graph(
+                        id="forecast-graph",
+                        figure={},
+                        style={"height": "500px"}
                     ),
+                    color="primary",
+                    type="grow",
+                    size="lg"
+                )
+            ),
+            className="bg-dark border-dark mb-4"
+        ),
 
-                    dbc.Spinner(
-                        html.Div(
-                            id="forecast-table-container",
-                            style={"maxHeight": "500px", "overflowY": "auto"}  # optional scroll
+        dbc.Row(
+            dbc.Col(
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H5(
+                            "Monthly Complaint Predictions",
+                            className="text-center text-white mb-4"
                         ),
-                        color="primary",
-                        type="grow",
-                        size="lg"
-                    )
-                ]),
-                className="bg-dark border-dark mb-4"
+
+                        dbc.Spinner(
+                            html.Div(
+                                id="forecast-table-container",
+                                style={"maxHeight": "500px", "overflowY": "auto"}  # optional scroll
+                            ),
+                            color="primary",
+                            type="grow",
+                            size="lg"
+                        )
+                    ]),
+                    className="bg-dark border-dark mb-4"
+                ),
+                width=10
             ),
-            width=10
+            justify="center",
+            className="mb-4"
+        ),
+
+        # Alert
+        dbc.Alert(
+            id="forecast-alert",
+            is_open=False,
+            className="mb-4",
+            style={
+                "textAlign": "center",
+                "fontWeight": "bold",
+                "fontSize": "18px",
+                "borderRadius": "12px",
+                "margin": "auto",
+                "width": "50%"
+            }
         ),
-        justify="center",
-        className="mb-4"
-    ),
-
-    # Alert
-    dbc.Alert(
-        id="forecast-alert",
-        is_open=False,
-        className="mb-4",
-        style={
-            "textAlign": "center",
-            "fontWeight": "bold",
-            "fontSize": "18px",
-            "borderRadius": "12px",
-            "margin": "auto",
-            "width": "50%"
-        }
-    ),
     
-    html.Div(
-        id="mape-description",
-        className="text-center text-info m-5",
-        style={"fontSize": "14px"}
-    ),
+        html.Div(
+            id="mape-description",
+            className="text-center text-info m-5",
+            style={"fontSize": "14px"}
+        ),
 
 
-    dbc.Row([dbc.Col(dbc.Button("🏠 Home", href="/", color="primary"), width="auto")], justify="center"),
-])
+        dbc.Row([dbc.Col(dbc.Button("🏠 Home", href="/", color="primary"), width="auto")], justify="center"),
+    ])
 
 
 # Callbacks
@@ -216,6 +223,7 @@ def update_items_dropdown(selected_neighs, forecast_level):
         selected_neighs = [selected_neighs]
 
     # Collect items
+    df = load_cases(CASE_COLUMNS)
     items = set()
 
     for neigh in selected_neighs:
@@ -2,22 +2,16 @@ from dash import html, dcc, register_page, Output, Input, callback
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases
 from app.utils.utils import empty_map
 
-register_page(__name__, path="/map", title="Map")
-
-# Load data=
-df["MonthName"] = df["CREATED DATE"].dt.month_name()
-
-# Create dropdown options
-year_options = [
-    {"label": str(y), "value": str(y)}
-    for y in sorted(df["Year"].dropna().unique())
+# The houston_311 columns this module reads
+CASE_COLUMNS = [
+    "CREATED DATE", "Year", "MonthName", "LATITUDE", "LONGITUDE",
+    "NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY", "RESOLUTION_TIME_DAYS",
 ]
 
-month_options = [{"label": "All Months", "value": "all"}] + \
-                [{"label": m, "value": m} for m in df["MonthName"].unique()]
+register_page(__name__, path="/map", title="Map")
 
 color_options = [
     {"label": "Department", "value": "DEPARTMENT"},
@@ -26,25 +20,38 @@ color_options = [
     {"label": "Resolution Time (days)", "value": "RESOLUTION_TIME_DAYS"}
 ]
 
-# Default value = most recent year
-default_year = str(df["Year"].dropna().max())
 default_month = "all"
 
-# Base map
-initial_df = df[df["Year"] == int(default_year)]
-fig = px.scatter_map(
-    initial_df.sample(min(1000, len(initial_df))),
-    lat="LATITUDE",
-    lon="LONGITUDE",
-    color="DEPARTMENT",
-    map_style="carto-darkmatter",
-    zoom=9,
-    title=f"311 Complaint Hotspots ({default_year})",
-)
-fig.update_layout(height=700, paper_bgcolor="#181818", font_color="#FFFFFF")
-
 # Layout
 def layout():
+    # Rows are loaded on the first visit, not when the app imports its pages
+    df = load_cases(CASE_COLUMNS)
+
+    # Create dropdown options
+    year_options = [
+        {"label": str(y), "value": str(y)}
+        for y in sorted(df["Year"].dropna().unique())
+    ]
+
+    month_options = [{"label": "All Months", "value": "all"}] + \
+                    [{"label": m, "value": m} for m in df["MonthName"].unique()]
+
+    # Default value = most recent year
+    default_year = str(df["Year"].dropna().max())
+
+    # Base map
+    initial_df = df[df["Year"] == int(default_year)]
+    fig = px.scatter_map(
+        initial_df.sample(min(1000, len(initial_df))),
+        lat="LATITUDE",
+        lon="LONGITUDE",
+        color="DEPARTMENT",
+        map_style="carto-darkmatter",
+        zoom=9,
+        title=f"311 Complaint Hotspots ({default_year})",
+    )
+    fig.update_layout(height=700, paper_bgcolor="#181818", font_color="#FFFFFF")
+
     return html.Div([
         html.H2("Complaint Locations in Houston", className="text-center text-primary mb-4 mt-4"),
         
@@ -123,6 +130,7 @@ def update_map(selected_year, selected_month, selected_color):
         selected_color = "CATEGORY"
 
     # Filter by year
+    df = load_cases(CASE_COLUMNS)
     try:
         dff = df[df["Year"] == int(selected_year)]
     except Exception:
@@ -178,13 +186,13 @@ def update_map(selected_year, selected_month, selected_color):
         hover_data["RESOLUTION_TIME_DAYS"] = ":.0f"
     else:
         # format numbers nicely; otherwise just show value
-        if str(dff[color_arg].dtype) != "object":
+        if pd.api.types.is_numeric_dtype(dff[color_arg]):
             hover_data[color_arg] = ":,"
         else:
             hover_data[color_arg] = True
             
     # Make sure neighborhood is never NaN
-    dff["NEIGHBORHOOD"] = dff["NEIGHBORHOOD"].fillna("Unknown")
+    dff["NEIGHBORHOOD"] = dff["NEIGHBORHOOD"].astype(object).fillna("Unknown")
 
     # Pretty label for hover
     label_map = {
@@ -198,10 +206,10 @@ def update_map(selected_year, selected_month, selected_color):
     # Create hover display value BEFORE building the figure
     if color_arg == "RESOLUTION_TIME_DAYS":
         dff["_hover_val"] = dff[color_arg].round(0).astype("Int64").astype(str) + " days"
-    elif str(dff[color_arg].dtype) != "object":
+    elif pd.api.types.is_numeric_dtype(dff[color_arg]):
         dff["_hover_val"] = dff[color_arg].map(lambda x: f"{x:,.0f}" if pd.notna(x) else "—")
     else:
-        dff["_hover_val"] = dff[color_arg].fillna("—").astype(str)
+        dff["_hover_val"] = dff[color_arg].astype(object).fillna("—").astype(str)
 
     # Build the map (no hover_data needed)
     try:
@@ -1,8 +1,8 @@
 from dash import html, dcc, register_page, callback, Output, Input
 import pandas as pd
 import plotly.express as px
-from app.utils.data_loader import df
 import dash_bootstrap_components as dbc
+from app.utils.generation import Reloadable
 from app.utils.utils import make_table, category_to_types, empty_figure
 
 register_page(__name__, path="/neighborhood-metrics", title="Neighborhood Metrics")
@@ -13,230 +13,235 @@ metrics = ["DEPARTMENT", "DIVISION", "CATEGORY"]
 # LOAD PRECOMPUTED DATA
 BASE_PATH = "precomputed_data/metrics/"
 
-NEIGH_LIST = pd.read_parquet(BASE_PATH + "neighborhood_list.parquet").iloc[:, 0].tolist()
-MONTH_LIST = pd.read_parquet(BASE_PATH + "month_list.parquet").iloc[:, 0].tolist()
 
-BY_CATEGORY_NEIGH = pd.read_parquet(BASE_PATH + "by_category_neigh.parquet")
-BY_DEPT_NEIGH = pd.read_parquet(BASE_PATH + "by_department_neigh.parquet")
-BY_DIV_NEIGH = pd.read_parquet(BASE_PATH + "by_division_neigh.parquet")
-
-CATEGORY_TOTAL = pd.read_parquet(BASE_PATH + "by_category.parquet")
-DEPARTMENT_TOTAL = pd.read_parquet(BASE_PATH + "by_department.parquet")
-DIVISION_TOTAL = pd.read_parquet(BASE_PATH + "by_division.parquet")
-
-NEIGH_TOTAL = pd.read_parquet(BASE_PATH + "neighborhood_totals.parquet")
-
-
-# Metrics map → tells callback which parquet to use
-METRIC_TO_PARQUET = {
-    "CATEGORY": (BY_CATEGORY_NEIGH, CATEGORY_TOTAL),
-    "DEPARTMENT": (BY_DEPT_NEIGH, DEPARTMENT_TOTAL),
-    "DIVISION": (BY_DIV_NEIGH, DIVISION_TOTAL),
-}
+def load_tables():
+    by_category_neigh = pd.read_parquet(BASE_PATH + "by_category_neigh.parquet")
+    by_dept_neigh = pd.read_parquet(BASE_PATH + "by_department_neigh.parquet")
+    by_div_neigh = pd.read_parquet(BASE_PATH + "by_division_neigh.parquet")
+
+    category_total = pd.read_parquet(BASE_PATH + "by_category.parquet")
+    department_total = pd.read_parquet(BASE_PATH + "by_department.parquet")
+    division_total = pd.read_parquet(BASE_PATH + "by_division.parquet")
+
+    return {
+        "NEIGH_LIST": pd.read_parquet(BASE_PATH + "neighborhood_list.parquet").iloc[:, 0].tolist(),
+        "MONTH_LIST": pd.read_parquet(BASE_PATH + "month_list.parquet").iloc[:, 0].tolist(),
+        "NEIGH_TOTAL": pd.read_parquet(BASE_PATH + "neighborhood_totals.parquet"),
+        # Metrics map → tells callback which parquet to use
+        "METRIC_TO_PARQUET": {
+            "CATEGORY": (by_category_neigh, category_total),
+            "DEPARTMENT": (by_dept_neigh, department_total),
+            "DIVISION": (by_div_neigh, division_total),
+        },
+        "ALL_MONTH_MAP": {
+            "CATEGORY": pd.read_parquet(BASE_PATH + "by_category_neigh_allmonths.parquet"),
+            "DEPARTMENT": pd.read_parquet(BASE_PATH + "by_department_neigh_allmonths.parquet"),
+            "DIVISION": pd.read_parquet(BASE_PATH + "by_division_neigh_allmonths.parquet"),
+        },
+    }
+
+
+# Swapped for each new data generation; a callback reads it once per request
+TABLES = Reloadable(load_tables)
+
+
+def layout():
+    tables = TABLES.get()
+    month_options = [{"label": "All Months", "value": "all"}] + [
+        {"label": m, "value": m} for m in tables["MONTH_LIST"]
+    ]
+    neighborhood_options = [{"label": "All Neighborhoods", "value": "all"}] + [
+        {"label": n, "value": n} for n in tables["NEIGH_LIST"]
+    ]
+
+    return dbc.Container([
+        html.H2("Neighborhood Metrics", className="text-center text-primary mb-4 mt-4"),
+
+        # Metric + Month dropdowns
+        dbc.Row([
+            dbc.Col([
+                html.Label("Group By:", className="text-white mb-2"),
+                dbc.Select(
+                    id="stackedbar-metric-dropdown",
+                    options=[{"label": m.title(), "value": m} for m in metrics],
+                    value="DEPARTMENT",
+                    style={"width": "300px"}
+                )
+            ], width="auto"),
+
+            dbc.Col([
+                html.Label("Select Month:", className="text-white mb-2"),
+                dbc.Select(
+                    id="month-dropdown",
+                    options=month_options,
+                    value="all",
+                    style={"width": "300px"}
+                )
+            ], width="auto")
+        ], justify="center", className="mb-4"),
+
+        html.H5(id="selected-metric-display", className="text-white text-center mx-4"),
+
+        # Neighborhood Breakdown
+        dbc.Row([
+            dbc.Col(
+                dbc.Card(
+                    dbc.CardBody([
+                        html.H4(
+                            "Neighborhood Breakdown",
+                            className="text-white mb-4"
+                        ),
+                        # Neighborhood Dropdown
+                        dbc.Row([
+                            dbc.Col([
+                                html.Label("Select Neighborhood:", className="text-white mb-2 fw-bold"),
+                                dbc.Select(
+                                    id="neighborhood-dropdown",
+                                    options=neighborhood_options,
+                                    value="all",
+                                    style={"maxWidth": "320px"}
+                                )
+                            ], width="auto")
+                        ], className="mb-4"),
+
+                        # Pie + Table Row (ONE spinner for both)
+                        dbc.Row([
+                            dbc.Spinner(
+                                dbc.Row([
+                                    # Pie Chart
+                                    dbc.Col(
+                                        dbc.Card(
+                                            dbc.CardBody(
+                                                dcc.Graph(
+                                                    id="metric-pie-chart",
+                                                    config={"displayModeBar": False},
+                                                    style={"height": "450px"}
+                                                )
+                                            ),
+                                            color="dark",
+                                            outline=True,
+                                            className="border-secondary shadow-sm",
+                                        ),
+                                        width=5,
+                                        style={"paddingRight": "8px"}
+                                    ),
 
-ALL_MONTH_MAP = {
-    "CATEGORY": pd.read_parquet(BASE_PATH + "by_category_neigh_allmonths.parquet"),
-    "DEPARTMENT": pd.read_parquet(BASE_PATH + "by_department_neigh_allmonths.parquet"),
-    "DIVISION": pd.read_parquet(BASE_PATH + "by_division_neigh_allmonths.parquet"),
-}
+                                    # Table
+                                    dbc.Col(
+                                        dbc.Card(
+                                            dbc.CardBody(
+                                                html.Div(
+                                                    id="stackedbar-table",
+                                                    style={
+                                                        "maxHeight": "450px",
+                                                        "overflowY": "auto",
+                                                        "paddingRight": "6px"
+                                                    }
+                                                )
+                                            ),
+                                            color="dark",
+                                            outline=True,
+                                            className="border-secondary shadow-sm",
+                                        ),
+                                        width=7,
+                                        style={"paddingLeft": "8px"}
+                                    )
 
-month_options = [{"label": "All Months", "value": "all"}] + [
-    {"label": m, "value": m} for m in MONTH_LIST
-]
+                                ], className="g-0"),
 
-neighborhood_options = [{"label": "All Neighborhoods", "value": "all"}] + [
-    {"label": n, "value": n} for n in NEIGH_LIST
-]
+                                color="primary",
+                                type="grow",
+                                size="lg"
+                            )
+                        ])
+                    ]),
+                    color="dark",
+                    className="border-dark bg-dark my-4",
+                    style={"padding": "20px"}
+                ),
+                width=12
+            )
+        ]),
 
+        dbc.Row([
+            dbc.Col(
+                dbc.Card(
+                    dbc.CardBody([
 
-layout = dbc.Container([
-    html.H2("Neighborhood Metrics", className="text-center text-primary mb-4 mt-4"),
+                        # Optional section header
+                        html.H4(
+                            "Chart Breakdown (Top 30 NeighborhoodS)",
+                            className="text-white mb-4"
+                        ),
 
-    # Metric + Month dropdowns
-    dbc.Row([
-        dbc.Col([
-            html.Label("Group By:", className="text-white mb-2"),
-            dbc.Select(
-                id="stackedbar-metric-dropdown",
-                options=[{"label": m.title(), "value": m} for m in metrics],
-                value="DEPARTMENT",
-                style={"width": "300px"}
-            )
-        ], width="auto"),
-
-        dbc.Col([
-            html.Label("Select Month:", className="text-white mb-2"),
-            dbc.Select(
-                id="month-dropdown",
-                options=month_options,
-                value="all",
-                style={"width": "300px"}
-            )
-        ], width="auto")
-    ], justify="center", className="mb-4"),
+                        # Inner row holding Chart + Legend
+                        dbc.Row([
 
-    html.H5(id="selected-metric-display", className="text-white text-center mx-4"),
-    
-    # Neighborhood Breakdown
-    dbc.Row([
-        dbc.Col(
-            dbc.Card(
-                dbc.CardBody([
-                    html.H4(
-                        "Neighborhood Breakdown",
-                        className="text-white mb-4"
-                    ),
-                    # Neighborhood Dropdown
-                    dbc.Row([
-                        dbc.Col([
-                            html.Label("Select Neighborhood:", className="text-white mb-2 fw-bold"),
-                            dbc.Select(
-                                id="neighborhood-dropdown",
-                                options=neighborhood_options,
-                                value="all",
-                                style={"maxWidth": "320px"}
-                            )
-                        ], width="auto")
-                    ], className="mb-4"),
-
-                    # Pie + Table Row (ONE spinner for both)
-                    dbc.Row([
-                        dbc.Spinner(
-                            dbc.Row([
-                                # Pie Chart
-                                dbc.Col(
-                                    dbc.Card(
-                                        dbc.CardBody(
+                            # Chart
+                            dbc.Col(
+                                dbc.Card(
+                                    dbc.CardBody(
+                                        dbc.Spinner(
                                             dcc.Graph(
-                                                id="metric-pie-chart",
-                                                config={"displayModeBar": False},
-                                                style={"height": "450px"}
-                                            )
-                                        ),
-                                        color="dark",
-                                        outline=True,
-                                        className="border-secondary shadow-sm",
+                                                id="stackedbar-graph",
+                                                style={"minWidth": "1200px"}
+                                            ),
+                                            color="primary",
+                                            type="grow",
+                                            size="lg"
+                                        )
                                     ),
-                                    width=5,
-                                    style={"paddingRight": "8px"}
-                                ),
-
-                                # Table
-                                dbc.Col(
-                                    dbc.Card(
-                                        dbc.CardBody(
-                                            html.Div(
-                                                id="stackedbar-table",
-                                                style={
-                                                    "maxHeight": "450px",
-                                                    "overflowY": "auto",
-                                                    "paddingRight": "6px"
-                                                }
-                                            )
-                                        ),
-                                        color="dark",
-                                        outline=True,
-                                        className="border-secondary shadow-sm",
-                                    ),
-                                    width=7,
-                                    style={"paddingLeft": "8px"}
-                                )
-
-                            ], className="g-0"),
-
-                            color="primary",
-                            type="grow",
-                            size="lg"
-                        )
-                    ])
-                ]),
-                color="dark",
-                className="border-dark bg-dark my-4",
-                style={"padding": "20px"}
-            ),
-            width=12
-        )
-    ]),
-    
-    dbc.Row([
-        dbc.Col(
-            dbc.Card(
-                dbc.CardBody([
-
-                    # Optional section header
-                    html.H4(
-                        "Chart Breakdown (Top 30 NeighborhoodS)",
-                        className="text-white mb-4"
-                    ),
-
-                    # Inner row holding Chart + Legend
-                    dbc.Row([
-
-                        # Chart
-                        dbc.Col(
-                            dbc.Card(
-                                dbc.CardBody(
-                                    dbc.Spinner(
-                                        dcc.Graph(
-                                            id="stackedbar-graph",
-                                            style={"minWidth": "1200px"}
-                                        ),
-                                        color="primary",
-                                        type="grow",
-                                        size="lg"
-                                    )
+                                    color="dark",
+                                    outline=False,
+                                    className="bg-dark border-0",
+                                    style={
+                                        "overflowX": "auto",
+                                        "padding": "5px",
+                                    }
                                 ),
-                                color="dark",
-                                outline=False,
-                                className="bg-dark border-0",
-                                style={
-                                    "overflowX": "auto",
-                                    "padding": "5px",
-                                }
+                                width=9
                             ),
-                            width=9
-                        ),
 
-                        # Legend
-                        dbc.Col(
-                            dbc.Card(
-                                dbc.CardBody(
-                                    dbc.Spinner(
-                                        html.Div(id="stackedbar-legend"),
-                                        color="primary",
-                                        type="grow",
-                                        size="lg"
-                                    )
+                            # Legend
+                            dbc.Col(
+                                dbc.Card(
+                                    dbc.CardBody(
+                                        dbc.Spinner(
+                                            html.Div(id="stackedbar-legend"),
+                                            color="primary",
+                                            type="grow",
+                                            size="lg"
+                                        )
+                                    ),
+                                    color="dark",
+                                    outline=False,
+                                    className="bg-dark border-0",
+                                    style={
+                                        "height": "700px",
+                                        "overflowY": "auto",
+                                        "padding": "5px",
+                                    }
                                 ),
-                                color="dark",
-                                outline=False,
-                                className="bg-dark border-0",
-                                style={
-                                    "height": "700px",
-                                    "overflowY": "auto",
-                                    "padding": "5px",
-                                }
+                                width=3
                             ),
-                            width=3
-                        ),
 
-                    ], style={"flexWrap": "nowrap"}),
+                        ], style={"flexWrap": "nowrap"}),
 
-                ]),
-                color="dark",
-                className="border-dark bg-dark my-4",
-                style={"padding": "20px"}
-            ),
-            width=12
-        )
-    ]),
+                    ]),
+                    color="dark",
+                    className="border-dark bg-dark my-4",
+                    style={"padding": "20px"}
+                ),
+                width=12
+            )
+        ]),
 
-    # Home button
-    html.Div([
-        dbc.Button("🏠 Home", href="/", color="primary", className="mt-4")
-    ], style={"textAlign": "center"})
+        # Home button
+        html.Div([
+            dbc.Button("🏠 Home", href="/", color="primary", className="mt-4")
+        ], style={"textAlign": "center"})
 
-], fluid=True)
+    ], fluid=True)
 
 @callback(
     Output("stackedbar-graph", "figure"),
@@ -250,14 +255,15 @@ layout = dbc.Container([
 def update_fig(selected_metric, selected_month, selected_neighborhood):
 
     # LOAD METRIC DATA
+    tables = TABLES.get()
 
-    neigh_df, metric_total_df = METRIC_TO_PARQUET[selected_metric]
+    neigh_df, metric_total_df = tables["METRIC_TO_PARQUET"][selected_metric]
 
     # Filter by month
     if selected_month != "all":
         dff = neigh_df[neigh_df["MonthName"] == selected_month]
     else:
-        all_month_df = ALL_MONTH_MAP[selected_metric]
+        all_month_df = tables["ALL_MONTH_MAP"][selected_metric]
         dff = all_month_df.copy()
 
     if dff.empty:
@@ -265,7 +271,7 @@ def update_fig(selected_metric, selected_month, selected_neighborhood):
         return fig, html.Div(), html.Div(), empty_figure("No pie data")
 
     # GET TOP 30 NEIGHBORHOODS (FOR CHART ONLY)
-    top_neigh = NEIGH_TOTAL["NEIGHBORHOOD"].head(30).tolist()
+    top_neigh = tables["NEIGH_TOTAL"]["NEIGHBORHOOD"].head(30).tolist()
 
     # DO NOT inject selected neighborhood into bar chart
     dff = dff[dff["NEIGHBORHOOD"].isin(top_neigh)]
@@ -4,6 +4,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
+from app.utils.generation import Reloadable
 from app.utils.utils import make_table, empty_figure, empty_table
 
 register_page(__name__, path="/resolution-insights", title="Resolution Insights")
@@ -11,31 +12,35 @@ register_page(__name__, path="/resolution-insights", title="Resolution Insights"
 # LOAD PRECOMPUTED DATA
 BASE = "precomputed_data/resolution/"
 
-RES_STATS = {
-    "neighborhood": {
-        "monthly": pd.read_parquet(BASE + "resolution_stats_neighborhood.parquet"),
-        "all": pd.read_parquet(BASE + "resolution_stats_all_months_neighborhood.parquet"),
-        "heatmap": pd.read_parquet(BASE + "sla_heatmap_neighborhood.parquet"),
-    },
-    "department": {
-        "monthly": pd.read_parquet(BASE + "resolution_stats_department.parquet"),
-        "all": pd.read_parquet(BASE + "resolution_stats_all_months_department.parquet"),
-        "heatmap": pd.read_parquet(BASE + "sla_heatmap_department.parquet"),
-    },
-    "category": {
-        "monthly": pd.read_parquet(BASE + "resolution_stats_category.parquet"),
-        "all": pd.read_parquet(BASE + "resolution_stats_all_months_category.parquet"),
-        "heatmap": pd.read_parquet(BASE + "sla_heatmap_category.parquet"),
-    },
-}
-
-
-CITY = pd.read_parquet(BASE + "resolution_citywide.parquet")
-FAST_SLOW = pd.read_parquet(BASE + "fastest_slowest.parquet")
-TREND = pd.read_parquet(BASE + "trend.parquet")
-
-MONTHS = pd.read_parquet(BASE + "months.parquet").iloc[:, 0].tolist()
-NEIGH_LIST = pd.read_parquet(BASE + "neighborhoods.parquet").iloc[:, 0].tolist()
+def load_tables():
+    return {
+        "RES_STATS": {
+            "neighborhood": {
+                "monthly": pd.read_parquet(BASE + "resolution_stats_neighborhood.parquet"),
+                "all": pd.read_parquet(BASE + "resolution_stats_all_months_neighborhood.parquet"),
+                "heatmap": pd.read_parquet(BASE + "sla_heatmap_neighborhood.parquet"),
+            },
+            "department": {
+                "monthly": pd.read_parquet(BASE + "resolution_stats_department.parquet"),
+                "all": pd.read_parquet(BASE + "resolution_stats_all_months_department.parquet"),
+                "heatmap": pd.read_parquet(BASE + "sla_heatmap_department.parquet"),
+            },
+            "category": {
+                "monthly": pd.read_parquet(BASE + "resolution_stats_category.parquet"),
+                "all": pd.read_parquet(BASE + "resolution_stats_all_months_category.parquet"),
+                "heatmap": pd.read_parquet(BASE + "sla_heatmap_category.parquet"),
+            },
+        },
+        "CITY": pd.read_parquet(BASE + "resolution_citywide.parquet"),
+        "FAST_SLOW": pd.read_parquet(BASE + "fastest_slowest.parquet"),
+        "TREND": pd.read_parquet(BASE + "trend.parquet"),
+        "MONTHS": pd.read_parquet(BASE + "months.parquet").iloc[:, 0].tolist(),
+        "NEIGH_LIST": pd.read_parquet(BASE + "neighborhoods.parquet").iloc[:, 0].tolist(),
+    }
+
+
+# Swapped for each new data generation; a callback reads it once per request
+TABLES = Reloadable(load_tables)
 
 TAB_TO_LEVEL = {
     "rank-nbh": "neighborhood",
@@ -55,10 +60,6 @@ LEVEL_TO_LABEL = {
     "category": "Category",
 }
 
-month_options = [{"label": "All Months", "value": "all"}] + [
-    {"label": m, "value": m} for m in MONTHS
-]
-
 def make_kpi(title, value, color="primary"):
     return dbc.Col(
         dbc.Card(
@@ -73,142 +74,148 @@ def make_kpi(title, value, color="primary"):
 
 
 # PAGE LAYOUT
-layout = dbc.Container([
+def layout():
+    month_options = [{"label": "All Months", "value": "all"}] + [
+        {"label": m, "value": m} for m in TABLES.get()["MONTHS"]
+    ]
 
-    html.H2("Resolution Time Insights", className="text-center text-primary mt-4 mb-4"),
+    return dbc.Container([
+
+        html.H2("Resolution Time Insights", className="text-center text-primary mt-4 mb-4"),
+
+        # Month filter
+        dbc.Row([
+            dbc.Col([
+                html.Label("Select Month:", className="text-white mb-2"),
+                dbc.Select(id="resolution-month", options=month_options, value="all")
+            ], width="auto")
+        ], justify="center", className="mb-4"),
+
+        # KPI Row
+        dbc.Row(id="resolution-kpi-row", className="mb-4"),
+
+        dbc.Spinner(
+            children=html.Div([
+
+                dbc.Row(
+                    [
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody([
+                                    html.H4("Resolution Ranking", className="text-white"),
+                                    dbc.Tabs(
+                                        [
+                                            dbc.Tab(label="Department", tab_id="rank-dept", labelClassName="text-info-emphasis"),
+                                            dbc.Tab(label="Category", tab_id="rank-cat", labelClassName="text-info-emphasis"),
+                                            dbc.Tab(label="Neighborhood", tab_id="rank-nbh", labelClassName="text-info-emphasis"),
+                                        ],
+                                        id="rank-tabs",
+                                        active_tab="rank-nbh",
+                                        className="mb-3 custom-tabs",
+                                    ),
+                                    html.Div(
+                                        id="resolution-table",
+                                        style={
+                                            "maxHeight": "500px",
+                                            "overflowY": "auto",
+                                        }
+                                    )
+                                ]),
+                                className="bg-dark border-dark h-100"
+                            ),
+                            md=6
+                        ),
 
-    # Month filter
-    dbc.Row([
-        dbc.Col([
-            html.Label("Select Month:", className="text-white mb-2"),
-            dbc.Select(id="resolution-month", options=month_options, value="all")
-        ], width="auto")
-    ], justify="center", className="mb-4"),
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody([
+                                    html.H4("Volume vs Resolution Time", className="text-white"),
+                                    dbc.Tabs(
+                                        [
+                                            dbc.Tab(label="Department", tab_id="scatter-dept", labelClassName="text-info-emphasis"),
+                                            dbc.Tab(label="Category", tab_id="scatter-cat", labelClassName="text-info-emphasis"),
+                                            dbc.Tab(label="Neighborhood", tab_id="scatter-nbh", labelClassName="text-info-emphasis"),
+                                        ],
+                                        id="scatter-tabs",
+                                        active_tab="scatter-nbh",
+                                        className="mb-3 custom-tabs",
+                                    ),
+                                    dcc.Graph(
+                                        id="resolution-scatter",
+                                        style={"height": "500px"}
+                                    )
+                                ]),
+                                className="bg-dark border-dark h-100"
+                            ),
+                            md=6
+                        ),
+                    ],
+                    className="mb-4"
+                ),
 
-    # KPI Row
-    dbc.Row(id="resolution-kpi-row", className="mb-4"),
-    
-    dbc.Spinner(
-        children=html.Div([
-            
-            dbc.Row(
-                [
+                # Trend Over Time
+                dbc.Row([
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody([
-                                html.H4("Resolution Ranking", className="text-white"),
-                                dbc.Tabs(
-                                    [
-                                        dbc.Tab(label="Department", tab_id="rank-dept", labelClassName="text-info-emphasis"),
-                                        dbc.Tab(label="Category", tab_id="rank-cat", labelClassName="text-info-emphasis"),
-                                        dbc.Tab(label="Neighborhood", tab_id="rank-nbh", labelClassName="text-info-emphasis"),
-                                    ],
-                                    id="rank-tabs",
-                                    active_tab="rank-nbh",
-                                    className="mb-3 custom-tabs",
-                                ),
-                                html.Div(
-                                    id="resolution-table",
-                                    style={
-                                        "maxHeight": "500px",
-                                        "overflowY": "auto",
-                                    }
-                                )
+                                html.H4("Resolution Trend Over Time", className="text-white"),
+                                dcc.Graph(id="resolution-trend")
                             ]),
-                            className="bg-dark border-dark h-100"
-                        ),
-                        md=6
-                    ),
+                            className="bg-dark border-dark"
+                        )
+                    )
+                ], className="mb-4"),
 
+                # SLA Heatmap
+                dbc.Row([
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody([
-                                html.H4("Volume vs Resolution Time", className="text-white"),
+                                html.H4("SLA Performance Heatmap", className="text-white"),
                                 dbc.Tabs(
                                     [
-                                        dbc.Tab(label="Department", tab_id="scatter-dept", labelClassName="text-info-emphasis"),
-                                        dbc.Tab(label="Category", tab_id="scatter-cat", labelClassName="text-info-emphasis"),
-                                        dbc.Tab(label="Neighborhood", tab_id="scatter-nbh", labelClassName="text-info-emphasis"),
+                                        dbc.Tab(label="Department", tab_id="heat-dept", labelClassName="text-info-emphasis"),
+                                        dbc.Tab(label="Category", tab_id="heat-cat", labelClassName="text-info-emphasis"),
+                                        dbc.Tab(label="Neighborhood", tab_id="heat-nbh", labelClassName="text-info-emphasis"),
                                     ],
-                                    id="scatter-tabs",
-                                    active_tab="scatter-nbh",
+                                    id="heat-tabs",
+                                    active_tab="heat-nbh",
                                     className="mb-3 custom-tabs",
                                 ),
-                                dcc.Graph(
-                                    id="resolution-scatter",
-                                    style={"height": "500px"}
-                                )
+                                dcc.Graph(id="resolution-sla-heatmap", style={"height": "800px", "overflowY": "auto",})
                             ]),
-                            className="bg-dark border-dark h-100"
-                        ),
-                        md=6
-                    ),
-                ],
-                className="mb-4"
-            ),
-                        
-            # Trend Over Time
-            dbc.Row([
-                dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody([
-                            html.H4("Resolution Trend Over Time", className="text-white"),
-                            dcc.Graph(id="resolution-trend")
-                        ]),
-                        className="bg-dark border-dark"
+                            className="bg-dark border-dark"
+                        )
                     )
-                )
-            ], className="mb-4"),
-
-            # SLA Heatmap
-            dbc.Row([
-                dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody([
-                            html.H4("SLA Performance Heatmap", className="text-white"),
-                            dbc.Tabs(
-                                [
-                                    dbc.Tab(label="Department", tab_id="heat-dept", labelClassName="text-info-emphasis"),
-                                    dbc.Tab(label="Category", tab_id="heat-cat", labelClassName="text-info-emphasis"),
-                                    dbc.Tab(label="Neighborhood", tab_id="heat-nbh", labelClassName="text-info-emphasis"),
-                                ],
-                                id="heat-tabs",
-                                active_tab="heat-nbh",
-                                className="mb-3 custom-tabs",
-                            ),
-                            dcc.Graph(id="resolution-sla-heatmap", style={"height": "800px", "overflowY": "auto",})
-                        ]),
-                        className="bg-dark border-dark"
-                    )
-                )
-            ], className="mb-4"),
+                ], className="mb-4"),
+
+            ]),
 
-        ]),
+            color="primary",
+            type="grow",
+            fullscreen=True,
+            fullscreen_style={"backgroundColor": "rgba(0, 0, 0, 0)"}
+        ),
 
-        color="primary",
-        type="grow",
-        fullscreen=True,
-        fullscreen_style={"backgroundColor": "rgba(0, 0, 0, 0)"}
-    ),
-    
-    html.Div([
-        dbc.Button("🏠 Home", href="/", color="primary", className="mt-4")
-    ], style={"textAlign": "center"})
+        html.Div([
+            dbc.Button("🏠 Home", href="/", color="primary", className="mt-4")
+        ], style={"textAlign": "center"})
 
-], fluid=True)
+    ], fluid=True)
 
 @callback(
     Output("resolution-kpi-row", "children"),
     Input("resolution-month", "value"),
 )
 def update_resolution_kpis(month):
+    tables = TABLES.get()
 
     if month == "all":
-        r = CITY.query("MonthName == 'all'").iloc[0]
-        fs = FAST_SLOW.query("MonthName == 'all'").iloc[0]
+        r = tables["CITY"].query("MonthName == 'all'").iloc[0]
+        fs = tables["FAST_SLOW"].query("MonthName == 'all'").iloc[0]
     else:
-        r = CITY.query("MonthName == @month").iloc[0]
-        fs = FAST_SLOW.query("MonthName == @month").iloc[0]
+        r = tables["CITY"].query("MonthName == @month").iloc[0]
+        fs = tables["FAST_SLOW"].query("MonthName == @month").iloc[0]
 
     return [
         make_kpi("Avg Resolution (Citywide)", f"{r['Avg_Resolution']:.0f} days"),
@@ -226,7 +233,7 @@ def update_resolution_kpis(month):
 def update_resolution_table(tab, month):
 
     level = TAB_TO_LEVEL[tab]
-    data = RES_STATS[level]
+    data = TABLES.get()["RES_STATS"][level]
     label = LEVEL_TO_LABEL[level]
 
     if month == "all":
@@ -265,7 +272,7 @@ def update_resolution_table(tab, month):
 def update_resolution_scatter(tab, month):
 
     level = TAB_TO_LEVEL[tab]
-    data = RES_STATS[level]
+    data = TABLES.get()["RES_STATS"][level]
 
     if month == "all":
         df = data["all"]
@@ -313,7 +320,7 @@ def update_resolution_scatter(tab, month):
 def update_heatmap(tab):
 
     level = TAB_TO_LEVEL[tab]
-    heatmap = RES_STATS[level]["heatmap"]
+    heatmap = TABLES.get()["RES_STATS"][level]["heatmap"]
 
     fig = px.imshow(
         heatmap,
@@ -365,7 +372,7 @@ def update_heatmap(tab):
 def update_trend(_):
 
     fig = px.line(
-        TREND,
+        TABLES.get()["TREND"],
         x="Month",
         y="RESOLUTION_TIME_DAYS",
         markers=True,
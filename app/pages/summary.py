@@ -3,6 +3,7 @@ import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
 
+from app.utils.generation import Reloadable
 from app.utils.utils import make_table, empty_table, empty_figure
 
 register_page(__name__, path="/summary", title="Summary")
@@ -10,36 +11,34 @@ register_page(__name__, path="/summary", title="Summary")
 # LOAD PRECOMPUTED DATA
 BASE = "precomputed_data/summary/"
 
-KPI_MONTHLY = pd.read_parquet(BASE + "kpi_monthly.parquet")
-SLOW_DEPT = pd.read_parquet(BASE + "slowest_department.parquet")
-SLOW_CAT = pd.read_parquet(BASE + "slowest_category.parquet")
-SLOW_NBH = pd.read_parquet(BASE + "slowest_neighborhood.parquet")
+def load_tables():
+    kpi_monthly = pd.read_parquet(BASE + "kpi_monthly.parquet")
+    category_casetypes = pd.read_parquet(BASE + "category_case_types.parquet")
 
-SLA_DEPT = pd.read_parquet(BASE + "sla_risk_department.parquet")
-SLA_CAT = pd.read_parquet(BASE + "sla_risk_category.parquet")
-SLA_NBH = pd.read_parquet(BASE + "sla_risk_neighborhood.parquet")
+    return {
+        "KPI_MONTHLY": kpi_monthly,
+        "SLOW_DEPT": pd.read_parquet(BASE + "slowest_department.parquet"),
+        "SLOW_CAT": pd.read_parquet(BASE + "slowest_category.parquet"),
+        "SLOW_NBH": pd.read_parquet(BASE + "slowest_neighborhood.parquet"),
 
-VOLUME_COUNTS = pd.read_parquet(BASE + "volume_counts.parquet")
-VOLUME_TREND = pd.read_parquet(BASE + "volume_monthly.parquet")
+        "SLA_DEPT": pd.read_parquet(BASE + "sla_risk_department.parquet"),
+        "SLA_CAT": pd.read_parquet(BASE + "sla_risk_category.parquet"),
+        "SLA_NBH": pd.read_parquet(BASE + "sla_risk_neighborhood.parquet"),
 
-CATEGORY_CASETYPES = pd.read_parquet(BASE + "category_case_types.parquet")
+        "VOLUME_COUNTS": pd.read_parquet(BASE + "volume_counts.parquet"),
+        "VOLUME_TREND": pd.read_parquet(BASE + "volume_monthly.parquet"),
 
-CATEGORY_TO_TYPES = {
-    row["CATEGORY"]: row["CaseTypes"] 
-    for _, row in CATEGORY_CASETYPES.iterrows()
-}
+        "CATEGORY_TO_TYPES": {
+            row["CATEGORY"]: row["CaseTypes"]
+            for _, row in category_casetypes.iterrows()
+        },
 
-# MONTH DROPDOWN OPTIONS (correct!)
-MONTH_LIST = sorted(KPI_MONTHLY["MonthName"].unique())
-month_options = (
-    [{"label": "All Months", "value": "all"}] +
-    [{"label": m, "value": m} for m in MONTH_LIST if m != "all"]
-)
+        "MONTH_LIST": sorted(kpi_monthly["MonthName"].unique()),
+    }
 
-# CATEGORY DROPDOWN FOR MODAL
-category_values = sorted(CATEGORY_TO_TYPES.keys())
-category_options = [{"label": c, "value": c} for c in category_values]
-default_category_value = category_options[0]["value"] if category_options else None
+
+# Swapped for each new data generation; a callback reads it once per request
+TABLES = Reloadable(load_tables)
 
 
 # Data Dictionary (static metadata)
@@ -151,327 +150,341 @@ def build_data_dictionary_table():
 
 
 # Layout
-layout = dbc.Container(
-    [
-        html.H2(
-            "Complaint Summary & Reference",
-            className="text-center text-primary mb-4 mt-4",
-        ),
+def layout():
+    tables = TABLES.get()
 
-        # Month filter
-        dbc.Row(
-            dbc.Col(
-                [
-                    dbc.Label(
-                        "Select Month (for diagnostics):", className="text-white"
-                    ),
-                    dbc.Select(
-                        id="summary-month-dropdown",
-                        options=month_options,
-                        value="all",
-                        style={"maxWidth": "300px"},
-                    ),
-                ],
-                width="auto",
-                className="d-flex flex-column align-items-center",
+    # MONTH DROPDOWN OPTIONS (correct!)
+    month_options = (
+        [{"label": "All Months", "value": "all"}] +
+        [{"label": m, "value": m} for m in tables["MONTH_LIST"] if m != "all"]
+    )
+
+    # CATEGORY DROPDOWN FOR MODAL
+    category_values = sorted(tables["CATEGORY_TO_TYPES"].keys())
+    category_options = [{"label": c, "value": c} for c in category_values]
+    default_category_value = category_options[0]["value"] if category_options else None
+
+    return dbc.Container(
+        [
+            html.H2(
+                "Complaint Summary & Reference",
+                className="text-center text-primary mb-4 mt-4",
             ),
-            justify="center",
-            className="mb-4",
-        ),
 
-        # KPI Row
-        dbc.Row(
-            [
-                dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody(
-                            [
-                                html.H6("Total Complaints", className="text-info"),
-                                html.H3(
-                                    id="kpi-total-complaints",
-                                    className="text-white",
-                                ),
-                            ]
-                        ),
-                        className="bg-dark border-dark",
-                    ),
-                    md=3,
-                    sm=6,
-                    className="mb-3",
-                ),
-                dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody(
-                            [
-                                html.H6("Avg Complaints / Month", className="text-info"),
-                                html.H3(
-                                    id="kpi-avg-month",
-                                    className="text-white",
-                                ),
-                            ]
-                        ),
-                        className="bg-dark border-dark",
-                    ),
-                    md=3,
-                    sm=6,
-                    className="mb-3",
-                ),
+            # Month filter
+            dbc.Row(
                 dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody(
-                            [
-                                html.H6(
-                                    "Median Resolution (Days)", className="text-info"
-                                ),
-                                html.H3(
-                                    id="kpi-median-resolution",
-                                    className="text-white",
-                                ),
-                            ]
+                    [
+                        dbc.Label(
+                            "Select Month (for diagnostics):", className="text-white"
                         ),
-                        className="bg-dark border-dark",
-                    ),
-                    md=3,
-                    sm=6,
-                    className="mb-3",
-                ),
-                dbc.Col(
-                    dbc.Card(
-                        dbc.CardBody(
-                            [
-                                html.H6("SLA Compliance", className="text-info"),
-                                html.H3(
-                                    id="kpi-sla-rate",
-                                    className="text-white",
-                                ),
-                            ]
+                        dbc.Select(
+                            id="summary-month-dropdown",
+                            options=month_options,
+                            value="all",
+                            style={"maxWidth": "300px"},
                         ),
-                        className="bg-dark border-dark",
-                    ),
-                    md=3,
-                    sm=6,
-                    className="mb-3",
+                    ],
+                    width="auto",
+                    className="d-flex flex-column align-items-center",
                 ),
-            ],
-            className="mb-4",
-            justify="center",
-        ),
-
-        # SYSTEM SNAPSHOT + TREND/RISK WITH ONE SPINNER
-        dbc.Spinner(
-        children=html.Div([
+                justify="center",
+                className="mb-4",
+            ),
 
-            # SYSTEM SNAPSHOT ROW
+            # KPI Row
             dbc.Row(
                 [
-                    # Left: Volume Breakdown
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody(
                                 [
-                                    html.H4("Complaint Volume Breakdown", className="text-white mb-3"),
-                                    dbc.Tabs(
-                                        [
-                                            dbc.Tab(label="Category", tab_id="vol-cat", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Department", tab_id="vol-dept", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Neighborhood", tab_id="vol-nbh", labelClassName="text-info-emphasis"),
-                                        ],
-                                        id="vol-tabs",
-                                        active_tab="vol-cat",
-                                        className="mb-3 custom-tabs",
-                                    ),
-                                    html.Div(
-                                        dcc.Graph(id="volume-treemap"),
-                                        style={"height": "400px"}
+                                    html.H6("Total Complaints", className="text-info"),
+                                    html.H3(
+                                        id="kpi-total-complaints",
+                                        className="text-white",
                                     ),
                                 ]
                             ),
-                            className="bg-dark border-dark h-100",
+                            className="bg-dark border-dark",
                         ),
-                        md=6,
-                        className="mb-4",
+                        md=3,
+                        sm=6,
+                        className="mb-3",
                     ),
-
-                    # Right: 12-Month Volume Trend
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody(
                                 [
-                                    html.H4("12-Month Volume Trend", className="text-white mb-3"),
-                                    html.Div(
-                                        dcc.Graph(id="volume-trend"),
-                                        style={"height": "420px"}
+                                    html.H6("Avg Complaints / Month", className="text-info"),
+                                    html.H3(
+                                        id="kpi-avg-month",
+                                        className="text-white",
                                     ),
                                 ]
                             ),
-                            className="bg-dark border-dark h-100",
+                            className="bg-dark border-dark",
                         ),
-                        md=6,
-                        className="mb-4",
+                        md=3,
+                        sm=6,
+                        className="mb-3",
                     ),
-                ]
-            ),
-
-            # TREND / RISK CARDS
-            dbc.Row(
-                [
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody(
                                 [
-                                    html.H4("Slowest Areas (Resolution Time)", className="text-white mb-3"),
-                                    dbc.Tabs(
-                                        [
-                                            dbc.Tab(label="Department", tab_id="slow-dept", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Category", tab_id="slow-cat", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Neighborhood", tab_id="slow-nbh", labelClassName="text-info-emphasis"),
-                                        ],
-                                        id="slow-tabs",
-                                        active_tab="slow-dept",
-                                        className="mb-3 custom-tabs",
+                                    html.H6(
+                                        "Median Resolution (Days)", className="text-info"
+                                    ),
+                                    html.H3(
+                                        id="kpi-median-resolution",
+                                        className="text-white",
                                     ),
-                                    html.Div(id="slow-content"),
                                 ]
                             ),
-                            className="bg-dark border-dark h-100",
+                            className="bg-dark border-dark",
                         ),
-                        md=6,
-                        className="mb-4 d-flex",
+                        md=3,
+                        sm=6,
+                        className="mb-3",
                     ),
-
                     dbc.Col(
                         dbc.Card(
                             dbc.CardBody(
                                 [
-                                    html.H4("SLA Risk Flags", className="text-white mb-3"),
-                                    dbc.Tabs(
-                                        [
-                                            dbc.Tab(label="Department", tab_id="sla-dept", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Category", tab_id="sla-cat", labelClassName="text-info-emphasis"),
-                                            dbc.Tab(label="Neighborhood", tab_id="sla-nbh", labelClassName="text-info-emphasis"),
-                                        ],
-                                        id="sla-tabs",
-                                        active_tab="sla-dept",
-                                        className="mb-3 custom-tabs",
+                                    html.H6("SLA Compliance", className="text-info"),
+                                    html.H3(
+                                        id="kpi-sla-rate",
+                                        className="text-white",
                                     ),
-                                    html.Div(id="sla-content"),
                                 ]
                             ),
-                            className="bg-dark border-dark h-100",
+                            className="bg-dark border-dark",
                         ),
-                        md=6,
-                        className="mb-4 d-flex",
+                        md=3,
+                        sm=6,
+                        className="mb-3",
                     ),
-                ]
-            )
+                ],
+                className="mb-4",
+                justify="center",
+            ),
 
-        ]),
-        color="primary",
-        type="grow",
-        size="lg",
-    ),
-    # Data Dictionary Accordion + Modal Trigger
-    dbc.Card(
-        dbc.CardBody(
-            [
-                html.H4(
-                    "Data Dictionary & Case Types",
-                    className="text-white mb-3",
-                ),
-                dbc.Accordion(
+            # SYSTEM SNAPSHOT + TREND/RISK WITH ONE SPINNER
+            dbc.Spinner(
+            children=html.Div([
+
+                # SYSTEM SNAPSHOT ROW
+                dbc.Row(
                     [
-                        dbc.AccordionItem(
-                            [
-                                html.P(
-                                    "Reference for the main fields used across this dashboard.",
-                                    className="text-info",
-                                ),
-                                html.Div(
-                                    build_data_dictionary_table(),
-                                    className="mb-3",
-                                ),
-                                html.Hr(),
-                                html.Div(
+                        # Left: Volume Breakdown
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody(
                                     [
-                                        html.H5(
-                                            "Browse Case Types by Category",
-                                            className="text-info mb-2",
+                                        html.H4("Complaint Volume Breakdown", className="text-white mb-3"),
+                                        dbc.Tabs(
+                                            [
+                                                dbc.Tab(label="Category", tab_id="vol-cat", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Department", tab_id="vol-dept", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Neighborhood", tab_id="vol-nbh", labelClassName="text-info-emphasis"),
+                                            ],
+                                            id="vol-tabs",
+                                            active_tab="vol-cat",
+                                            className="mb-3 custom-tabs",
                                         ),
-                                        html.P(
-                                            "Use the browser below to see which case types belong to each category.",
-                                            className="text-white",
+                                        html.Div(
+                                            dcc.Graph(id="volume-treemap"),
+                                            style={"height": "400px"}
                                         ),
-                                        dbc.Button(
-                                            "Open Case Type Browser",
-                                            id="open-case-modal",
-                                            color="info",
-                                            className="mt-2",
+                                    ]
+                                ),
+                                className="bg-dark border-dark h-100",
+                            ),
+                            md=6,
+                            className="mb-4",
+                        ),
+
+                        # Right: 12-Month Volume Trend
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody(
+                                    [
+                                        html.H4("12-Month Volume Trend", className="text-white mb-3"),
+                                        html.Div(
+                                            dcc.Graph(id="volume-trend"),
+                                            style={"height": "420px"}
                                         ),
                                     ]
                                 ),
-                            ],
-                            title=html.Span("Data Dictionary", className="text-info"),
-                        )
-                    ],
-                    start_collapsed=True,
-                    flush=True,
+                                className="bg-dark border-dark h-100",
+                            ),
+                            md=6,
+                            className="mb-4",
+                        ),
+                    ]
                 ),
-            ]
-        ),
-        className="bg-dark border-dark mb-5",
-    ),
-
-        # Modal for Case Types
-        dbc.Modal(
-            [
-                dbc.ModalHeader(dbc.ModalTitle("Case Types by Category")),
-                dbc.ModalBody(
+
+                # TREND / RISK CARDS
+                dbc.Row(
                     [
-                        html.Div(
-                            [
-                                dbc.Label("Select Category:", className="mb-2"),
-                                dbc.Select(
-                                    id="modal-category-select",
-                                    options=category_options,
-                                    value=default_category_value,
-                                    style={"maxWidth": "400px"},
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody(
+                                    [
+                                        html.H4("Slowest Areas (Resolution Time)", className="text-white mb-3"),
+                                        dbc.Tabs(
+                                            [
+                                                dbc.Tab(label="Department", tab_id="slow-dept", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Category", tab_id="slow-cat", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Neighborhood", tab_id="slow-nbh", labelClassName="text-info-emphasis"),
+                                            ],
+                                            id="slow-tabs",
+                                            active_tab="slow-dept",
+                                            className="mb-3 custom-tabs",
+                                        ),
+                                        html.Div(id="slow-content"),
+                                    ]
                                 ),
-                            ],
-                            className="mb-3",
+                                className="bg-dark border-dark h-100",
+                            ),
+                            md=6,
+                            className="mb-4 d-flex",
+                        ),
+
+                        dbc.Col(
+                            dbc.Card(
+                                dbc.CardBody(
+                                    [
+                                        html.H4("SLA Risk Flags", className="text-white mb-3"),
+                                        dbc.Tabs(
+                                            [
+                                                dbc.Tab(label="Department", tab_id="sla-dept", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Category", tab_id="sla-cat", labelClassName="text-info-emphasis"),
+                                                dbc.Tab(label="Neighborhood", tab_id="sla-nbh", labelClassName="text-info-emphasis"),
+                                            ],
+                                            id="sla-tabs",
+                                            active_tab="sla-dept",
+                                            className="mb-3 custom-tabs",
+                                        ),
+                                        html.Div(id="sla-content"),
+                                    ]
+                                ),
+                                className="bg-dark border-dark h-100",
+                            ),
+                            md=6,
+                            className="mb-4 d-flex",
                         ),
-                        html.Div(id="modal-case-type-list"),
                     ]
-                ),
-                dbc.ModalFooter(
-                    dbc.Button(
-                        "Close",
-                        id="close-case-modal",
-                        color="info",
-                    )
-                ),
-            ],
-            id="case-types-modal",
-            is_open=False,
+                )
+
+            ]),
+            color="primary",
+            type="grow",
             size="lg",
-            scrollable=True,
-            backdrop="static",
         ),
-
-        # Home button
-        html.Div(
-            [
-                dbc.Button(
-                    "🏠 Home",
-                    href="/",
-                    color="primary",
-                    className="mt-4",
-                )
-            ],
-            style={"textAlign": "center", "marginBottom": "40px"},
+        # Data Dictionary Accordion + Modal Trigger
+        dbc.Card(
+            dbc.CardBody(
+                [
+                    html.H4(
+                        "Data Dictionary & Case Types",
+                        className="text-white mb-3",
+                    ),
+                    dbc.Accordion(
+                        [
+                            dbc.AccordionItem(
+                                [
+                                    html.P(
+                                        "Reference for the main fields used across this dashboard.",
+                                        className="text-info",
+                                    ),
+                                    html.Div(
+                                        build_data_dictionary_table(),
+                                        className="mb-3",
+                                    ),
+                                    html.Hr(),
+                                    html.Div(
+                                        [
+                                            html.H5(
+                                                "Browse Case Types by Category",
+                                                className="text-info mb-2",
+                                            ),
+                                            html.P(
+                                                "Use the browser below to see which case types belong to each category.",
+                                                className="text-white",
+                                            ),
+                                            dbc.Button(
+                                                "Open Case Type Browser",
+                                                id="open-case-modal",
+                                                color="info",
+                                                className="mt-2",
+                                            ),
+                                        ]
+                                    ),
+                                ],
+                                title=html.Span("Data Dictionary", className="text-info"),
+                            )
+                        ],
+                        start_collapsed=True,
+                        flush=True,
+                    ),
+                ]
+            ),
+            className="bg-dark border-dark mb-5",
         ),
-    ],
-    fluid=True,
-)
+
+            # Modal for Case Types
+            dbc.Modal(
+                [
+                    dbc.ModalHeader(dbc.ModalTitle("Case Types by Category")),
+                    dbc.ModalBody(
+                        [
+                            html.Div(
+                                [
+                                    dbc.Label("Select Category:", className="mb-2"),
+                                    dbc.Select(
+                                        id="modal-category-select",
+                                        options=category_options,
+                                        value=default_category_value,
+                                        style={"maxWidth": "400px"},
+                                    ),
+                                ],
+                                className="mb-3",
+                            ),
+                            html.Div(id="modal-case-type-list"),
+                        ]
+                    ),
+                    dbc.ModalFooter(
+                        dbc.Button(
+                            "Close",
+                            id="close-case-modal",
+                            color="info",
+                        )
+                    ),
+                ],
+                id="case-types-modal",
+                is_open=False,
+                size="lg",
+                scrollable=True,
+                backdrop="static",
+            ),
+
+            # Home button
+            html.Div(
+                [
+                    dbc.Button(
+                        "🏠 Home",
+                        href="/",
+                        color="primary",
+                        className="mt-4",
+                    )
+                ],
+                style={"textAlign": "center", "marginBottom": "40px"},
+            ),
+        ],
+        fluid=True,
+    )
 
 
 # KPI CALLBACK
@@ -484,7 +497,8 @@ layout = dbc.Container(
 )
 def update_summary_kpis(month):
 
-    row = KPI_MONTHLY[KPI_MONTHLY["MonthName"] == month]
+    kpi_monthly = TABLES.get()["KPI_MONTHLY"]
+    row = kpi_monthly[kpi_monthly["MonthName"] == month]
 
     if row.empty:
         return "0", "—", "—", "—"
@@ -507,10 +521,11 @@ def update_summary_kpis(month):
 )
 def update_slowest(active_tab, month):
 
+    tables = TABLES.get()
     table_map = {
-        "slow-dept": SLOW_DEPT,
-        "slow-cat": SLOW_CAT,
-        "slow-nbh": SLOW_NBH,
+        "slow-dept": tables["SLOW_DEPT"],
+        "slow-cat": tables["SLOW_CAT"],
+        "slow-nbh": tables["SLOW_NBH"],
     }
 
     df = table_map[active_tab]
@@ -532,10 +547,11 @@ def update_slowest(active_tab, month):
 )
 def update_sla_risk(active_tab, month):
 
+    tables = TABLES.get()
     table_map = {
-        "sla-dept": SLA_DEPT,
-        "sla-cat": SLA_CAT,
-        "sla-nbh": SLA_NBH,
+        "sla-dept": tables["SLA_DEPT"],
+        "sla-cat": tables["SLA_CAT"],
+        "sla-nbh": tables["SLA_NBH"],
     }
 
     df = table_map[active_tab]
@@ -565,7 +581,8 @@ def update_volume_treemap(tab, month):
     }
 
     col = group_map.get(tab)
-    df = VOLUME_COUNTS[(VOLUME_COUNTS["GroupColumn"] == col) & (VOLUME_COUNTS["MonthName"] == month)]
+    volume_counts = TABLES.get()["VOLUME_COUNTS"]
+    df = volume_counts[(volume_counts["GroupColumn"] == col) & (volume_counts["MonthName"] == month)]
 
     if df.empty:
         return empty_figure("No data available")
@@ -599,7 +616,7 @@ def update_volume_treemap(tab, month):
 )
 def update_volume_trend(_month):
 
-    df = VOLUME_TREND.copy()
+    df = TABLES.get()["VOLUME_TREND"].copy()
     df["Month"] = pd.to_datetime(df["YearMonth"])
 
     fig = px.line(
@@ -635,7 +652,7 @@ def update_case_type_list(category):
     if not category:
         return html.P("Select a category.", className="text-muted")
 
-    case_types = CATEGORY_TO_TYPES.get(category)
+    case_types = TABLES.get()["CATEGORY_TO_TYPES"].get(category)
     if len(case_types) == 0:
         return html.P("No case types found.", className="text-danger")
 
@@ -3,6 +3,7 @@ import pandas as pd
 import plotly.express as px
 import calendar
 import dash_bootstrap_components as dbc
+from app.utils.generation import Reloadable
 from app.utils.utils import empty_figure
 
 register_page(__name__, path="/complaint-trends", title="Complaints Over Time")
@@ -10,87 +11,96 @@ register_page(__name__, path="/complaint-trends", title="Complaints Over Time")
 # Load unified precomputed time series files
 BASE_PATH = "precomputed_data/trends/"
 
-MONTHLY_ALL = pd.read_parquet(f"{BASE_PATH}monthly_all.parquet")
-SEASONAL_ALL = pd.read_parquet(f"{BASE_PATH}seasonal_all.parquet")
 
-NEIGH_LIST = (
-    pd.read_parquet(f"{BASE_PATH}neighborhoods_cleaned.parquet")
-    .iloc[:, 0]
-    .tolist()
-)
+def load_tables():
+    return {
+        "MONTHLY_ALL": pd.read_parquet(f"{BASE_PATH}monthly_all.parquet"),
+        "SEASONAL_ALL": pd.read_parquet(f"{BASE_PATH}seasonal_all.parquet"),
+        "NEIGH_LIST": (
+            pd.read_parquet(f"{BASE_PATH}neighborhoods_cleaned.parquet")
+            .iloc[:, 0]
+            .tolist()
+        ),
+    }
+
+
+# Swapped for each new data generation; a callback reads it once per request
+TABLES = Reloadable(load_tables)
 
 month_order = list(calendar.month_name)[1:]
 
-layout = dbc.Container([
-    html.H2("Complaint Trends Over Time", className="text-center text-primary mb-4 mt-4"),
-
-    html.Div([
-        html.Label("Select Neighborhood:", className="text-white",style={"marginRight": "10px"}),
-        dbc.Select(
-            id="timeseries-neigh-dropdown",
-            options=[{"label": n, "value": n} for n in NEIGH_LIST],
-            value=None,
-            placeholder="All Neighborhoods",
-            style={"width": "300px"}
-        )
 
-    ], style={"display": "flex", "justifyContent": "center", "marginBottom": "20px"}),
-
-    dbc.Row(
-        [
-            dbc.Col(
-                dbc.RadioItems(
-                    id="timeseries-mode",
-                    options=[
-                        {"label": "Monthly", "value": "time"},
-                        {"label": "Seasonal", "value": "seasonal"},
-                    ],
-                    value="time",
-                    inline=True,
-                    className="mb-4",
-                    inputClassName="btn-check",
-                    labelClassName="btn btn-outline-primary",
-                    labelCheckedClassName="active",
-                ),
-                width="auto",  # shrink to fit content
-                style={"textAlign": "center"},
+def layout():
+    return dbc.Container([
+        html.H2("Complaint Trends Over Time", className="text-center text-primary mb-4 mt-4"),
+
+        html.Div([
+            html.Label("Select Neighborhood:", className="text-white",style={"marginRight": "10px"}),
+            dbc.Select(
+                id="timeseries-neigh-dropdown",
+                options=[{"label": n, "value": n} for n in TABLES.get()["NEIGH_LIST"]],
+                value=None,
+                placeholder="All Neighborhoods",
+                style={"width": "300px"}
             )
-        ],
-        justify="center",
-        style={"marginBottom": "20px"},
-    ),
-
-
-    html.Div(
-        dbc.Card(
-            dbc.CardBody([
-                dbc.Spinner(
-                    dcc.Graph(
-                        id="timeseries-graph",
-                        config={"displayModeBar": False},
-                        style={"height": "700px"}
+
+        ], style={"display": "flex", "justifyContent": "center", "marginBottom": "20px"}),
+
+        dbc.Row(
+            [
+                dbc.Col(
+                    dbc.RadioItems(
+                        id="timeseries-mode",
+                        options=[
+                            {"label": "Monthly", "value": "time"},
+                            {"label": "Seasonal", "value": "seasonal"},
+                        ],
+                        value="time",
+                        inline=True,
+                        className="mb-4",
+                        inputClassName="btn-check",
+                        labelClassName="btn btn-outline-primary",
+                        labelCheckedClassName="active",
                     ),
-                    type="grow", 
-                    color="primary",
-                    size="lg",
+                    width="auto",  # shrink to fit content
+                    style={"textAlign": "center"},
                 )
-            ]),
-            className="bg-dark border-dark mb-3",
-            style={
-                "overflowX": "auto",
-                "whiteSpace": "nowrap",
-                "width": "100%",
-                "scrollbarColor": "#444 #181818",
-                "scrollbarWidth": "thin"
-            }
-        )
-    ),
-    
-    # Home button at the bottom
-    html.Div([
-        dbc.Button("🏠 Home", href="/", color="primary", class_name="mt-5")
-    ], style={"textAlign": "center"})
-])
+            ],
+            justify="center",
+            style={"marginBottom": "20px"},
+        ),
+
+
+        html.Div(
+            dbc.Card(
+                dbc.CardBody([
+                    dbc.Spinner(
+                        dcc.Graph(
+                            id="timeseries-graph",
+                            config={"displayModeBar": False},
+                            style={"height": "700px"}
+                        ),
+                        type="grow", 
+                        color="primary",
+                        size="lg",
+                    )
+                ]),
+                className="bg-dark border-dark mb-3",
+                style={
+                    "overflowX": "auto",
+                    "whiteSpace": "nowrap",
+                    "width": "100%",
+                    "scrollbarColor": "#444 #181818",
+                    "scrollbarWidth": "thin"
+                }
+            )
+        ),
+
+        # Home button at the bottom
+        html.Div([
+            dbc.Button("🏠 Home", href="/", color="primary", class_name="mt-5")
+        ], style={"textAlign": "center"})
+    ])
 
 @callback(
     Output("timeseries-graph", "figure"),
@@ -98,14 +108,15 @@ layout = dbc.Container([
     Input("timeseries-mode", "value")
 )
 def update_timeseries(selected_neigh, mode):
+    tables = TABLES.get()
 
     # Select correct dataset
     if mode == "time":
-        dff = MONTHLY_ALL.copy()
+        dff = tables["MONTHLY_ALL"].copy()
         x_col = "Month_Year"
         title = "Monthly Complaint Trends"
     else:
-        dff = SEASONAL_ALL.copy()
+        dff = tables["SEASONAL_ALL"].copy()
         x_col = "Month"
         title = "Seasonal Complaint Trends"
 
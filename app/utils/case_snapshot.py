@@ -0,0 +1,127 @@
+"""
+Arrow IPC snapshot of the loader's case table, shared by every process on the host.
+
+The first process to load writes the compact table to one uncompressed Arrow IPC file;
+every process then memory-maps it and builds its DataFrame over the mapped buffers
+without copying, so the rows sit once in the page cache however many Dash workers read
+them. Columns are laid out so that pandas can use the buffers as they are:
+
+    categoricals       dictionary arrays (int8/int16 codes + labels)
+    Arrow strings      large_string arrays (what pandas holds them as)
+    datetimes          int64 nanoseconds, NaT included, viewed as datetime64[ns]
+    nullable integers  the values plus a uint8 mask column ("<column>.mask")
+    other numbers      plain arrays without nulls
+
+The mapped arrays are read-only, which also keeps any one worker from changing the shared rows.
+"""
+import fcntl
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+MASK_SUFFIX = ".mask"
+
+
+def to_arrow(df, metadata=None):
+    # DataFrame → Arrow table in the layout above; the column kinds go in the schema metadata
+    arrays, names, kinds = [], [], {}
+    for col, values in df.items():
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            kinds[col] = "category"
+            arrays.append(pa.array(values, from_pandas=True))
+        elif isinstance(dtype, pd.StringDtype):
+            kinds[col] = "string"
+            arrays.append(pa.array(values.array, type=pa.large_string()))
+        elif pd.api.types.is_datetime64_dtype(dtype):
+            kinds[col] = "datetime"
+            arrays.append(pa.array(values.to_numpy("datetime64[ns]").view("int64")))
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            # Nullable integers: data and mask as two plain columns
+            kinds[col] = f"masked:{dtype.name}"
+            arrays.append(pa.array(values.array._data))
+            names.append(col)
+            arrays.append(pa.array(values.array._mask.view("uint8")))
+            col = col + MASK_SUFFIX
+        else:
+            kinds[col] = "numpy"
+            arrays.append(pa.array(values.to_numpy()))
+        names.append(col)
+
+    schema_metadata = {"columns": json.dumps(kinds), "metadata": json.dumps(metadata or {})}
+    return pa.Table.from_arrays(arrays, names=names).replace_schema_metadata(schema_metadata)
+
+
+def column(table, name):
+    # The column as one array; written as one batch, so normally that chunk itself (combining copies)
+    chunks = table.column(name)
+    return chunks.chunk(0) if chunks.num_chunks == 1 else chunks.combine_chunks()
+
+
+def from_arrow(table):
+    # Arrow table written by to_arrow → (DataFrame over its buffers, metadata)
+    kinds = json.loads(table.schema.metadata[b"columns"])
+    metadata = json.loads(table.schema.metadata[b"metadata"])
+
+    columns = {}
+    for col, kind in kinds.items():
+        chunk = column(table, col)
+        if kind == "category":
+            columns[col] = pd.Series(chunk.to_pandas())
+        elif kind == "string":
+            columns[col] = pd.Series(pd.arrays.ArrowStringArray(pa.chunked_array([chunk])))
+        elif kind == "datetime":
+            columns[col] = pd.Series(chunk.to_numpy(zero_copy_only=True).view("datetime64[ns]"))
+        elif kind.startswith("masked:"):
+            data = chunk.to_numpy(zero_copy_only=True)
+            mask = column(table, col + MASK_SUFFIX).to_numpy(zero_copy_only=True).view(bool)
+            dtype = pd.api.types.pandas_dtype(kind.split(":", 1)[1])
+            columns[col] = pd.Series(dtype.construct_array_type()(data, mask))
+        else:
+            columns[col] = pd.Series(chunk.to_numpy(zero_copy_only=True))
+    return pd.DataFrame(columns, copy=False), metadata
+
+
+def write_snapshot(df, path, metadata=None):
+    # Written next to `path` and renamed into place, so a reader never maps half a file
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = to_arrow(df, metadata)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp_path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def map_snapshot(path):
+    # Memory-map the snapshot → (DataFrame over the mapped file, metadata)
+    source = pa.memory_map(str(path))
+    return from_arrow(ipc.open_file(source).read_all())
+
+
+def snapshot_metadata(path):
+    # Metadata of the snapshot at `path` without reading its rows, or None if there is none
+    try:
+        with pa.memory_map(str(path)) as source:
+            return json.loads(ipc.open_file(source).schema.metadata[b"metadata"])
+    except (FileNotFoundError, pa.ArrowInvalid, KeyError):
+        return None
+
+
+@contextmanager
+def build_lock(path):
+    # One process per host builds the snapshot; the others wait here, then map it
+    lock_path = Path(path).with_name(Path(path).name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
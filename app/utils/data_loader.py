@@ -1,38 +1,243 @@
-from dotenv import load_dotenv
+import calendar
 import os
+import threading
+
+from dotenv import load_dotenv
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine
+
+from app.utils.case_snapshot import build_lock, map_snapshot, snapshot_metadata, write_snapshot
+from ingest.changes import latest_manifest
+from ingest.dimensions import DIMENSIONS, UNKNOWN_CATEGORY
+from ingest.schema import COLUMNS, FACT_COLUMNS
+from ingest.storage import open_store
 
 load_dotenv()
-db_url = os.getenv("DATABASE_URL")
 
-# Connect to your Postgres database
-engine = create_engine(db_url)
+TABLE = "houston_311"
+
+# Fact column each loader column is read from: text dimensions are decoded from their keys,
+# CATEGORY from the case type, Year and MonthName from CREATED DATE
+SOURCES = {c: key_col for c, (_, key_col) in DIMENSIONS.items()}
+SOURCES["CATEGORY"] = "CASE_TYPE_ID"
+SOURCES["Year"] = SOURCES["MonthName"] = "CREATED DATE"
+
+ALL_COLUMNS = list(COLUMNS)
 
-# Load the table into a DataFrame
-df = pd.read_sql("SELECT * FROM houston_311", engine)
+# Derived from CREATED DATE, only loaded when asked for
+DERIVED_COLUMNS = ["Year", "MonthName"]
 
-cols = ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY", "CASE TYPE"]
+MONTHS = list(calendar.month_name)[1:]
 
-for c in cols:
-    df[c] = (
-        df[c]
+# Arrow IPC file the loader's columns are shared through by every process on the host
+# (Dash workers memory-map it instead of each reading the table); unset: every process reads its own
+CASES_SNAPSHOT = os.environ.get("CASES_SNAPSHOT")
+SNAPSHOT_COLUMNS = ALL_COLUMNS + DERIVED_COLUMNS
+
+# Rows per fetch when reading cases: the rows are streamed from a server-side cursor and
+# converted chunk by chunk; 0 reads them in one go
+READ_CHUNK_ROWS = int(os.environ.get("LOADER_CHUNK_ROWS", "20000"))
+
+
+def normalize(values):
+    return (
+        values
         .astype(str)
         .str.strip()
         .str.title()
-        .str.replace("\s+", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
     )
 
-# Convert date columns to datetime
-df[["CREATED DATE", "CLOSED DATE"]] = df[["CREATED DATE", "CLOSED DATE"]].apply(
-    pd.to_datetime, errors="coerce"
-)
 
-if "CREATED DATE" in df.columns:
-    df["Year"] = df["CREATED DATE"].dt.year.astype("Int64")
-else:
-    df["Year"] = pd.NA
+def decode(keys, labels, missing):
+    # Spread one label per dimension row over the fact rows by key, as a categorical: each
+    # distinct label is stored once and every row holds a small integer code
+    categories = pd.Index(sorted(set(labels) | {missing}))
+    # An empty dimension table (a store with no data yet) leaves only the missing label
+    size = int(labels.index.max()) + 1 if len(labels) else 1
+    codes = np.full(size, categories.get_loc(missing), dtype="int16")
+    codes[labels.index.to_numpy("int64")] = categories.get_indexer(labels.to_numpy())
+
+    ids = keys.fillna(0).to_numpy("int32") if len(keys) else np.zeros(0, dtype="int32")
+    ids[ids >= len(codes)] = 0
+    return pd.Series(pd.Categorical.from_codes(codes[ids], categories), index=keys.index)
+
+
+def plain(df):
+    # Categoricals back to object strings and compact numbers back to float64: the column
+    # types the precomputed parquet files are written with
+    df = df.copy()
+    for c, dtype in df.dtypes.items():
+        if isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            df[c] = df[c].astype(object)
+        elif c in ("LATITUDE", "LONGITUDE", "RESOLUTION_TIME_DAYS"):
+            df[c] = df[c].astype("float64")
+    return df
+
+
+class CaseData:
+    """
+    Lazy handle on houston_311, shared by everything in the process.
+
+    Nothing is opened or read until the first load: the store (STORAGE_BACKEND, read-only)
+    is opened then. Unfiltered loads are cached by column, so a later load of columns
+    already read reuses the same arrays. Safe to use from several threads; use() swaps in
+    another store (a fixture, say) and drops the cache.
+
+    With a snapshot path, unfiltered loads of the loader's columns come from one Arrow
+    snapshot shared by all processes on the host: the first process to need it reads every
+    column and writes it, the others memory-map it. It is rebuilt when the change feed has
+    a newer refresh run than the one it was built after.
+    """
+
+    def __init__(self, store=None, table=TABLE, snapshot=CASES_SNAPSHOT):
+        self.table = table
+        self._store = store
+        self.snapshot = snapshot
+        self.cached = {}
+        self.lock = threading.RLock()
+
+    @property
+    def store(self):
+        with self.lock:
+            if self._store is None:
+                self._store = open_store(read_only=True)
+            return self._store
+
+    def use(self, store, snapshot=None):
+        with self.lock:
+            self._store = store
+            self.snapshot = snapshot
+            self.cached = {}
+
+    def reload(self):
+        # Re-read the cached columns and swap them in at once. Loads keep being served from the
+        # old arrays meanwhile, and frames already handed out keep them
+        with self.lock:
+            columns = list(self.cached)
+        if not columns:
+            return
+        if self.snapshot and set(columns) <= set(SNAPSHOT_COLUMNS):
+            cached = self.map_snapshot()
+        else:
+            cached = dict(read_slice(self.store, self.table, columns).items())
+        with self.lock:
+            self.cached = cached
+
+    def map_snapshot(self):
+        # Columns of the shared snapshot, written first if it is missing or older than the last refresh
+        latest = latest_manifest()
+        run_id = latest["run_id"] if latest else None
+        with build_lock(self.snapshot):
+            metadata = snapshot_metadata(self.snapshot)
+            if metadata is None or metadata.get("table") != self.table or metadata.get("run_id") != run_id:
+                df = read_slice(self.store, self.table, SNAPSHOT_COLUMNS)
+                write_snapshot(df, self.snapshot, {"table": self.table, "run_id": run_id})
+                print(f"✓ Wrote {len(df):,} {self.table} rows to snapshot {self.snapshot}")
+            df, _ = map_snapshot(self.snapshot)
+        return dict(df.items())
+
+    def load(self, columns=None, start=None, end=None, neighborhoods=None):
+        columns = list(columns or ALL_COLUMNS)
+        unknown = set(columns) - set(ALL_COLUMNS) - set(DERIVED_COLUMNS) - set(FACT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown {self.table} columns: {sorted(unknown)}")
+
+        if start is not None or end is not None or neighborhoods is not None:
+            return read_slice(self.store, self.table, columns, start, end, neighborhoods)
+
+        # Held across the read, so concurrent first loads wait for one read instead of each doing it
+        with self.lock:
+            missing = [c for c in columns if c not in self.cached]
+            if missing and self.snapshot and set(missing) <= set(SNAPSHOT_COLUMNS):
+                # The snapshot replaces the whole cache: columns read from the store might not line up with it
+                self.cached = self.map_snapshot()
+            elif missing:
+                # Cached columns are re-read with the new ones, so they all come from one read
+                df = read_slice(self.store, self.table, list(self.cached) + missing)
+                self.cached = dict(df.items())
+            cached = self.cached
+        return pd.DataFrame({c: cached[c] for c in columns}, copy=False)
+
+
+# The process-wide handle; tests can point it at a fixture with cases.use(store)
+cases = CaseData()
+
+
+def load_cases(columns=None, start=None, end=None, neighborhoods=None):
+    """
+    Cases from houston_311 with only `columns` (default: all of them), optionally only
+    those created in [start, end) and in `neighborhoods` (labels as the app shows them).
+    The projection and both filters run in the storage engine, so unused columns and
+    rows are never read into memory.
+    """
+    return cases.load(columns, start, end, neighborhoods)
+
+
+def read_slice(store, table, columns, start=None, end=None, neighborhoods=None, chunksize=READ_CHUNK_ROWS):
+    lookups = store.read_lookups(table)
+
+    neighborhood_ids = None
+    if neighborhoods is not None:
+        labels = normalize(lookups["NEIGHBORHOOD"].set_index("id")["name"])
+        neighborhood_ids = labels.index[labels.isin(list(neighborhoods))].tolist()
+
+    # Labels are normalized once per dimension row instead of once per fact row
+    labels = {c: normalize(lookups[c].set_index("id")["name"]) for c in DIMENSIONS if c in columns}
+    if "CATEGORY" in columns:
+        labels["CATEGORY"] = normalize(lookups["CASE TYPE"].set_index("id")["category"])
+
+    fact_columns = list(dict.fromkeys(SOURCES.get(c, c) for c in columns))
+    if not chunksize:
+        df = store.read_cases(table, fact_columns, start, end, neighborhood_ids, lookups=lookups)
+        return to_loader_columns(df, columns, labels)
+
+    # Streamed: each chunk is converted to the compact types as it arrives, so only one chunk
+    # is ever held in the driver's and read_sql's wide representation
+    chunks = store.read_cases(table, fact_columns, start, end, neighborhood_ids, chunksize=chunksize, lookups=lookups)
+    return concat_chunks([to_loader_columns(chunk, columns, labels) for chunk in chunks])
+
+
+def concat_chunks(chunks):
+    # Column by column, each chunk's part dropped as it is copied: the peak is the final frame
+    # plus one column, not the chunks and the whole frame side by side
+    df = pd.DataFrame(index=pd.RangeIndex(sum(len(chunk) for chunk in chunks)))
+    for col in list(chunks[0].columns):
+        df[col] = pd.concat([chunk.pop(col) for chunk in chunks], ignore_index=True)
+    return df
+
+
+def to_loader_columns(df, columns, labels):
+    # Fact rows → the loader's columns in their final types
+    for c, (_, key_col) in DIMENSIONS.items():
+        if key_col not in df.columns:
+            continue
+        df[key_col] = df[key_col].astype("Int16")
+        if c in columns:
+            df[c] = decode(df[key_col], labels[c], "None")
+
+    if "CATEGORY" in columns:
+        df["CATEGORY"] = decode(df["CASE_TYPE_ID"], labels["CATEGORY"], UNKNOWN_CATEGORY)
+
+    # Convert date columns to datetime (both stores already return them as such, and
+    # to_datetime boxes values even then, a cost paid on every chunk)
+    for c in ["CREATED DATE", "CLOSED DATE"]:
+        if c in df.columns and not pd.api.types.is_datetime64_dtype(df[c]):
+            df[c] = pd.to_datetime(df[c], errors="coerce")
+
+    # Compact types: case numbers in one Arrow buffer, metre-level coordinates,
+    # days and years in 16 bits
+    if "CASE NUMBER" in df.columns:
+        df["CASE NUMBER"] = df["CASE NUMBER"].astype("string[pyarrow]")
+    for c in ["LATITUDE", "LONGITUDE"]:
+        if c in df.columns:
+            df[c] = df[c].astype("float32")
+    if "RESOLUTION_TIME_DAYS" in df.columns:
+        df["RESOLUTION_TIME_DAYS"] = df["RESOLUTION_TIME_DAYS"].astype("Int16")
 
-df["MonthName"] = df["CREATED DATE"].dt.month_name()
+    if "Year" in columns:
+        df["Year"] = df["CREATED DATE"].dt.year.astype("int16")
+    if "MonthName" in columns:
+        df["MonthName"] = pd.Categorical(df["CREATED DATE"].dt.month_name(), categories=MONTHS)
 
-df = df.infer_objects(copy=False)
\ No newline at end of file
+    return df[columns]
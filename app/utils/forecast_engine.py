@@ -1,6 +1,7 @@
 import pandas as pd
 from prophet import Prophet
-from app.utils.data_loader import df
+
+from app.utils.generation import Reloadable
 
 # CONFIG
 FORECAST_CONFIG = {
@@ -36,55 +37,6 @@ def _norm_str(s: pd.Series) -> pd.Series:
     )
 
 
-# VOLUME INPUTS
-VOLUME_FULL = pd.read_parquet(BASE + "monthly_volume_full.parquet")
-
-# Build invalid months based on citywide anomalies (no hard-coded dates)
-_citywide = (
-    VOLUME_FULL[VOLUME_FULL["LEVEL"] == "citywide"]
-    .groupby("ds")["Count"].sum()
-    .reset_index(name="y")
-    .sort_values("ds")
-)
-
-INVALID_VOLUME_MONTHS = set(_citywide.loc[_citywide["y"] < 1000, "ds"])
-
-# Add normalized helper columns (only once, cheap)
-for col in ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY"]:
-    if col in VOLUME_FULL.columns:
-        VOLUME_FULL[col + "_CLEAN"] = _norm_str(VOLUME_FULL[col]).str.title()
-
-# SEVERITY INPUTS (preloaded once)
-SEV_CITY = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_citywide.parquet")
-)
-
-SEV_NEIGH = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_neighborhood.parquet")
-)
-
-SEV_DEPT = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_department.parquet")
-)
-
-SEV_DIV = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_division.parquet")
-)
-
-SEV_CAT = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_category.parquet")
-)
-
-SEV_NEIGH_DEPT = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_neighborhood_department.parquet")
-)
-SEV_NEIGH_DIV = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_neighborhood_division.parquet")
-)
-SEV_NEIGH_CAT = _ensure_month_end(
-    pd.read_parquet(BASE + "monthly_severity_neighborhood_category.parquet")
-)
-
 def _add_clean_cols(sev: pd.DataFrame) -> pd.DataFrame:
     sev = sev.copy()
     for col in ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY"]:
@@ -92,26 +44,50 @@ def _add_clean_cols(sev: pd.DataFrame) -> pd.DataFrame:
             sev[col + "_CLEAN"] = _norm_str(sev[col]).str.title()
     return sev
 
-SEV_CITY = _add_clean_cols(SEV_CITY)
-SEV_NEIGH = _add_clean_cols(SEV_NEIGH)
-SEV_DEPT = _add_clean_cols(SEV_DEPT)
-SEV_DIV  = _add_clean_cols(SEV_DIV)
-SEV_CAT  = _add_clean_cols(SEV_CAT)
-
-SEV_NEIGH_DEPT = _add_clean_cols(SEV_NEIGH_DEPT)
-SEV_NEIGH_DIV  = _add_clean_cols(SEV_NEIGH_DIV)
-SEV_NEIGH_CAT  = _add_clean_cols(SEV_NEIGH_CAT)
-
-SEVERITY_MAP = {
-    "citywide": SEV_CITY,
-    "neighborhood": SEV_NEIGH,
-    "department": SEV_DEPT,
-    "division": SEV_DIV,
-    "category": SEV_CAT,
-    "neighborhood_department": SEV_NEIGH_DEPT,
-    "neighborhood_division": SEV_NEIGH_DIV,
-    "neighborhood_category": SEV_NEIGH_CAT,
-}
+
+def load_inputs():
+    # VOLUME INPUTS
+    volume_full = pd.read_parquet(BASE + "monthly_volume_full.parquet")
+
+    # Build invalid months based on citywide anomalies (no hard-coded dates)
+    citywide = (
+        volume_full[volume_full["LEVEL"] == "citywide"]
+        .groupby("ds")["Count"].sum()
+        .reset_index(name="y")
+        .sort_values("ds")
+    )
+
+    invalid_volume_months = set(citywide.loc[citywide["y"] < 1000, "ds"])
+
+    # Add normalized helper columns (only once, cheap)
+    for col in ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY"]:
+        if col in volume_full.columns:
+            volume_full[col + "_CLEAN"] = _norm_str(volume_full[col]).str.title()
+
+    # SEVERITY INPUTS (preloaded once)
+    severity_files = {
+        "citywide": "monthly_severity_citywide.parquet",
+        "neighborhood": "monthly_severity_neighborhood.parquet",
+        "department": "monthly_severity_department.parquet",
+        "division": "monthly_severity_division.parquet",
+        "category": "monthly_severity_category.parquet",
+        "neighborhood_department": "monthly_severity_neighborhood_department.parquet",
+        "neighborhood_division": "monthly_severity_neighborhood_division.parquet",
+        "neighborhood_category": "monthly_severity_neighborhood_category.parquet",
+    }
+
+    return {
+        "VOLUME_FULL": volume_full,
+        "INVALID_VOLUME_MONTHS": invalid_volume_months,
+        "SEVERITY_MAP": {
+            level: _add_clean_cols(_ensure_month_end(pd.read_parquet(BASE + name)))
+            for level, name in severity_files.items()
+        },
+    }
+
+
+# Swapped for each new data generation; a forecast reads it once when it starts
+INPUTS = Reloadable(load_inputs)
 
 # HELPERS
 def new_prophet():
@@ -237,13 +213,17 @@ def get_forecast(neigh, item, level, config, horizon=None):
     ]
     empty = pd.DataFrame(columns=empty_cols)
 
+    inputs = INPUTS.get()
+    volume_full = inputs["VOLUME_FULL"]
+    invalid_months = inputs["INVALID_VOLUME_MONTHS"]
+
     level_col = {
         "category": "CATEGORY",
         "department": "DEPARTMENT",
         "division": "DIVISION",
     }.get(level.lower(), "CATEGORY")
 
-    dff = VOLUME_FULL.copy()
+    dff = volume_full.copy()
     
     # Determine correct LEVEL (matches monthly_volume_full.parquet LEVEL values)
     if neigh == "CITYWIDE" and item == "ALL":
@@ -263,7 +243,7 @@ def get_forecast(neigh, item, level, config, horizon=None):
     else:
         return empty, empty, "Unreliable", None
 
-    dff = VOLUME_FULL[VOLUME_FULL["LEVEL"] == level_key].copy()
+    dff = volume_full[volume_full["LEVEL"] == level_key].copy()
 
     # Neighborhood filter
     if neigh != "CITYWIDE":
@@ -291,11 +271,11 @@ def get_forecast(neigh, item, level, config, horizon=None):
         .sort_values("ds")
     )
     
-    ts = ts[~ts["ds"].isin(INVALID_VOLUME_MONTHS)].copy()
+    ts = ts[~ts["ds"].isin(invalid_months)].copy()
 
     # Ensure continuous months (missing months → 0 complaints)
     full_range = pd.date_range(ts["ds"].min(), ts["ds"].max(), freq="ME")
-    full_range = full_range[~full_range.isin(INVALID_VOLUME_MONTHS)]  # key line
+    full_range = full_range[~full_range.isin(invalid_months)]  # key line
 
     ts = (
         ts.set_index("ds")
@@ -340,8 +320,14 @@ def get_severity_forecast(neigh, item, level, config, horizon=None):
 
     filter_col = level_base.upper()
 
+    inputs = INPUTS.get()
+    severity_map = inputs["SEVERITY_MAP"]
+    invalid_months = inputs["INVALID_VOLUME_MONTHS"]
+    sev_city = severity_map["citywide"]
+    sev_neigh = severity_map["neighborhood"]
+
 
-    if level_key not in SEVERITY_MAP:
+    if level_key not in severity_map:
         # Failsafe
         cols = ["ds", "y", "yhat", "yhat_lower", "yhat_upper",
                 "Rolling_Trend", "Rolling_%_Change"]
@@ -349,7 +335,7 @@ def get_severity_forecast(neigh, item, level, config, horizon=None):
         return empty, empty.copy(), "Unreliable", None
 
     # Base severity table for this level
-    severity = SEVERITY_MAP[level_key].copy()
+    severity = severity_map[level_key].copy()
 
     # Normalize user choices
     neigh_clean = _norm_str(pd.Series([neigh])).iloc[0].title()
@@ -359,10 +345,10 @@ def get_severity_forecast(neigh, item, level, config, horizon=None):
     if item == "ALL":
         if neigh != "CITYWIDE":
             # neighborhood-level severity
-            severity = SEV_NEIGH[SEV_NEIGH["NEIGHBORHOOD_CLEAN"] == neigh_clean][["ds", "Severity"]].copy()
+            severity = sev_neigh[sev_neigh["NEIGHBORHOOD_CLEAN"] == neigh_clean][["ds", "Severity"]].copy()
         else:
             # citywide severity
-            severity = SEV_CITY[["ds", "Severity"]].copy()
+            severity = sev_city[["ds", "Severity"]].copy()
     else:
         # Neighborhood filter
         if neigh != "CITYWIDE" and "NEIGHBORHOOD_CLEAN" in severity.columns:
@@ -389,11 +375,11 @@ def get_severity_forecast(neigh, item, level, config, horizon=None):
 
     # Only apply invalid-month skipping when there are filters
     if is_filtered:
-        ts = ts[~ts["ds"].isin(INVALID_VOLUME_MONTHS)].copy()
+        ts = ts[~ts["ds"].isin(invalid_months)].copy()
 
     full_range = pd.date_range(ts["ds"].min(), ts["ds"].max(), freq="ME")
     if is_filtered:
-        full_range = full_range[~full_range.isin(INVALID_VOLUME_MONTHS)]
+        full_range = full_range[~full_range.isin(invalid_months)]
 
     ts = (
         ts.set_index("ds")
@@ -7,10 +7,10 @@ forecast_df = None
 
 def build_master_volume_forecast():
     from app.utils.forecast_engine import get_forecast, FORECAST_CONFIG  # existing forecast function and config for volume forecasts
-    # Compute CITYWIDE / ALL volume forecast once and store it.
+    # Compute CITYWIDE / ALL volume forecast and store it. Also run for each new data
+    # generation: the previous forecast keeps serving until the refit replaces it.
     global forecast_df, forecast_ready
     with forecast_lock:
-        forecast_ready = False
         try:
             # Run get_forecast for CITYWIDE volume
             _, fc, _, _ = get_forecast("CITYWIDE", "ALL", "category", FORECAST_CONFIG["volume"])
@@ -18,8 +18,6 @@ def build_master_volume_forecast():
             forecast_ready = True
         except Exception as e:
             print("Error building master volume forecast:", e)
-            forecast_df = None
-            forecast_ready = False
 
 def start_forecast_thread():
     # Run forecast in background.
@@ -28,13 +26,13 @@ def start_forecast_thread():
 
 def get_home_forecast_summary():
     # Return text summary for homepage.
-    global forecast_df, forecast_ready
-    if not forecast_ready or forecast_df is None:
+    fc = forecast_df
+    if not forecast_ready or fc is None:
         return ""
 
     now = pd.Timestamp.now()
-    current_row = forecast_df[(forecast_df["ds"].dt.month == now.month) &
-                              (forecast_df["ds"].dt.year == now.year)]
+    current_row = fc[(fc["ds"].dt.month == now.month) &
+                     (fc["ds"].dt.year == now.year)]
 
     if current_row.empty:
         return "No forecast available for current month."
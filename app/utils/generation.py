@@ -0,0 +1,116 @@
+"""
+Data generations: the running app picks up a refresh without restarting.
+
+precompute.py ends by writing GENERATION_FILE, a small JSON marker with a new generation
+id, once every precomputed file of the run is in place. Everything the app builds from
+the data is held in a Reloadable: the case table (data_loader.cases), the pages'
+precomputed tables, forecast_engine's inputs and the home page stats. A watcher thread
+polls the marker every RELOAD_INTERVAL seconds. When a new generation appears it builds
+the new values in the background while the old ones keep serving, then swaps them in.
+A callback reads each Reloadable once (.get()) and works on that value, so a request in
+flight keeps the tables it started with.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.utils.data_loader import cases
+
+GENERATION_FILE = Path(os.environ.get("DATA_GENERATION_FILE", "precomputed_data/generation.json"))
+
+# Seconds between checks of the marker; 0 turns the watcher off
+RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", "30"))
+
+reloadables = []
+
+
+class Reloadable:
+    """
+    A value built from the data by `load()`, rebuilt for every new generation.
+    With lazy=True it is first built on the first get() rather than here.
+    """
+
+    def __init__(self, load, lazy=False):
+        self.load = load
+        self.lock = threading.Lock()
+        self.value = None
+        self.loaded = False
+        if not lazy:
+            self.value, self.loaded = load(), True
+        reloadables.append(self)
+
+    def get(self):
+        if not self.loaded:
+            with self.lock:
+                if not self.loaded:
+                    self.value, self.loaded = self.load(), True
+        return self.value
+
+
+def write_generation(**info):
+    # Marks the precomputed files (and the rows behind them) as one new generation
+    generation = {
+        "generation": f"{datetime.now():%Y%m%dT%H%M%S%f}",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **info,
+    }
+    GENERATION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = GENERATION_FILE.with_name(GENERATION_FILE.name + ".tmp")
+    tmp_path.write_text(json.dumps(generation, indent=2))
+    os.replace(tmp_path, GENERATION_FILE)
+    print(f"✓ Data generation {generation['generation']} → {GENERATION_FILE}")
+    return generation
+
+
+def read_generation():
+    # The current generation id, or None before the first precompute writes one
+    try:
+        return json.loads(GENERATION_FILE.read_text())["generation"]
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+# Read when the modules holding Reloadables import this one, i.e. before they load anything
+loaded_generation = read_generation()
+
+
+def reload_all():
+    # The case table goes first: the values built from it (the home stats) read the new rows
+    cases.reload()
+    staged = [(r, r.load()) for r in list(reloadables) if r.loaded]
+    for r, value in staged:
+        r.value = value
+
+
+def watch(interval=RELOAD_INTERVAL, after_reload=None):
+    global loaded_generation
+    failed = None
+    while True:
+        time.sleep(interval)
+        generation = read_generation()
+        if generation is None or generation in (loaded_generation, failed):
+            continue
+        try:
+            started = time.perf_counter()
+            reload_all()
+        except Exception as e:
+            # The old tables keep serving until a later generation loads
+            print(f"⚠ Could not load data generation {generation}: {e}")
+            failed = generation
+            continue
+        loaded_generation = generation
+        print(f"✓ Loaded data generation {generation} in {time.perf_counter() - started:.1f}s")
+        if after_reload is not None:
+            after_reload()
+
+
+def start_generation_watcher(after_reload=None):
+    # Background thread swapping in each new generation; `after_reload` runs after every swap
+    if RELOAD_INTERVAL <= 0:
+        return None
+    thread = threading.Thread(target=watch, kwargs={"after_reload": after_reload}, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,234 @@
+"""
+Historical backfill of houston_311 from archived yearly extracts.
+
+Usage:
+    python backfill.py data/raw/history/ [--workers 8] [--full] [--restart]
+
+Rebuilds the retention window after a schema or cleaning change without touching the
+live URLs. Every *.txt extract in the directory whose name ends in its year (e.g.
+311-CRIS-Public-Data-Extract-D365-YTD-compressed-2019.txt) is parsed and cleaned on a
+pool of worker processes, each writing its cleaned year to a Parquet file under
+data/raw/backfill/. The main process loads the staged years oldest first, in chunks of
+REFRESH_CHUNK_ROWS, while the workers keep parsing the later years. Because the loads run
+in order, a case that appears in two extracts keeps the newer extract's version.
+
+Progress is checkpointed in data/raw/backfill/checkpoint.json, keyed by file name and
+sha256. Re-running the same command after an interruption skips loaded years and reuses
+staged Parquet files. A year interrupted mid-load is loaded again; its chunks already in
+the table are skipped by the row-hash check. Use --restart after changing the cleaning
+code, so staged files from the old code are not reused.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import refresh_data as rd
+from ingest.changes import ChangeFeed
+from ingest.download import file_sha256
+from ingest.instrument import Run
+from ingest.schema import retention_cutoff
+
+# CONFIG
+BACKFILL_DIR = Path(os.environ.get("BACKFILL_DIR", "data/raw/history"))
+STAGING_DIR = Path("data/raw/backfill")
+CHECKPOINT_PATH = STAGING_DIR / "checkpoint.json"
+
+# Each worker holds one parsed year in memory
+WORKERS = int(os.environ.get("BACKFILL_WORKERS", str(min(os.cpu_count() or 1, 8))))
+
+TABLE = "houston_311"
+
+
+# EXTRACTS
+def extract_year(path):
+    years = re.findall(r"(?:19|20)\d{2}", Path(path).stem)
+    return int(years[-1]) if years else None
+
+def list_extracts(directory, cutoff_year):
+    extracts = []
+    for path in sorted(Path(directory).glob("*.txt")):
+        year = extract_year(path)
+        if year is None:
+            print(f"⚠ Skipping {path.name}: no year in the file name")
+        elif year < cutoff_year:
+            print(f"⚠ Skipping {path.name}: {year} is outside the retention window")
+        else:
+            extracts.append((year, path))
+    return sorted(extracts)
+
+
+# CHECKPOINT
+def load_checkpoint(path=CHECKPOINT_PATH):
+    if Path(path).exists():
+        return json.loads(Path(path).read_text())
+    return {}
+
+def save_checkpoint(checkpoint, path=CHECKPOINT_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+def staged_path(sha256):
+    return STAGING_DIR / f"{sha256[:16]}.parquet"
+
+
+# WORKER
+def stage_extract(path, out_path, reader=rd.READER):
+    # Worker: parse + clean one yearly extract and write the cleaned rows to Parquet
+    started, start = time.time(), time.perf_counter()
+    raw = rd.parse_extract(path, reader=reader)
+    df = rd.clean_extract(raw, reader=reader)
+
+    tmp_path = Path(out_path).with_suffix(".tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+
+    return {
+        "rows_read": len(raw),
+        "rows_clean": len(df),
+        "seconds": round(time.perf_counter() - start, 2),
+        "started": started,
+    }
+
+
+# LOAD
+def load_staged(path, table_name, store, stages, cutoff, full, chunksize=rd.CHUNK_ROWS, changes=None):
+    with stages.stage("clean") as stage:
+        df = pd.read_parquet(path)
+        stage["rows_in"] = len(df)
+        # Rows that retention would drop straight away are not loaded
+        df = df[pd.to_datetime(df["CREATED DATE"]) >= pd.Timestamp(cutoff)]
+        df = rd.prepare_for_load(df.reset_index(drop=True))
+        stage["rows_out"] = len(df)
+
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    step = chunksize or len(df) or 1
+    for start in range(0, len(df), step):
+        chunk = df.iloc[start:start + step]
+        with stages.stage("load", rows_in=len(chunk)) as stage:
+            written = store.load_changed_rows(chunk, table_name, full=full, changes=changes)
+            stage["rows_out"] = written["inserted"] + written["updated"]
+        for key, n in written.items():
+            counts[key] += n
+
+    return counts
+
+
+# MAIN BACKFILL
+def backfill(directory=BACKFILL_DIR, table_name=TABLE, workers=WORKERS, full=rd.FULL_RELOAD,
+             restart=False, export=True, run=None):
+    run = run or Run("backfill")
+    store = rd.get_store()
+    cutoff = retention_cutoff()
+    extracts = list_extracts(directory, cutoff.year)
+    if not extracts:
+        print(f"⚠ No yearly extracts found in {directory}")
+        return
+
+    if restart:
+        shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    checkpoint = load_checkpoint()
+    if checkpoint.get("table") != table_name:
+        checkpoint = {"table": table_name, "started_at": datetime.now().isoformat(timespec="seconds"), "extracts": {}}
+
+    print(f"\n=== Backfilling {table_name} from {len(extracts)} extracts in {directory} ===")
+    changes = ChangeFeed(run.run_id)
+    rd.retention_stage(table_name, store, run.scope("all"), changes)
+
+    # Work out what each extract still needs; a changed file starts over
+    pending = []
+    for year, path in extracts:
+        sha256 = file_sha256(path)
+        entry = checkpoint["extracts"].get(path.name, {})
+        if entry.get("sha256") != sha256:
+            entry = {"sha256": sha256, "year": year, "status": "pending"}
+            checkpoint["extracts"][path.name] = entry
+        if entry["status"] == "loaded":
+            print(f"✓ {path.name} already loaded — skipping")
+        else:
+            pending.append((year, path, entry))
+    save_checkpoint(checkpoint)
+
+    totals = {"inserted": 0, "updated": 0, "skipped": 0}
+    start = time.perf_counter()
+
+    # forkserver: workers must not inherit the store's open connections
+    context = multiprocessing.get_context("forkserver")
+    try:
+        with ProcessPoolExecutor(max_workers=max(min(workers, len(pending)), 1), mp_context=context) as pool:
+            futures = {}
+            for year, path, entry in pending:
+                # Staged files are renamed into place when complete, so one that exists is usable
+                out_path = staged_path(entry["sha256"])
+                if not out_path.exists():
+                    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+                    futures[path.name] = pool.submit(stage_extract, path, out_path)
+
+            # Load oldest first; later years are still being parsed meanwhile
+            for year, path, entry in pending:
+                stages = run.scope(str(year))
+                out_path = staged_path(entry["sha256"])
+
+                if path.name in futures:
+                    result = futures[path.name].result()
+                    # Parse + clean ran in a worker; record the worker's own time
+                    run.add(stages.scope, "parse", result["seconds"],
+                            {"rows_out": result["rows_clean"], "bytes": path.stat().st_size}, started=result["started"])
+                    entry.update(status="staged", rows_read=result["rows_read"], rows_clean=result["rows_clean"])
+                    save_checkpoint(checkpoint)
+
+                print(f"\n📦 {year}: loading {path.name}")
+                counts = load_staged(out_path, table_name, store, stages, cutoff, full, changes=changes)
+                rd.report_counts(counts)
+                for key, n in counts.items():
+                    totals[key] += n
+
+                entry.update(status="loaded", counts=counts, loaded_at=datetime.now().isoformat(timespec="seconds"))
+                save_checkpoint(checkpoint)
+                out_path.unlink(missing_ok=True)
+    finally:
+        # Covers what this invocation wrote; a resumed backfill reports only the years it loaded
+        changes.write()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ Backfilled {len(pending)} extracts in {elapsed:.1f}s")
+    rd.report_counts(totals)
+
+    if export:
+        rd.export_stage(store, run.scope("all"))
+
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", nargs="?", default=BACKFILL_DIR, help="Directory of yearly *.txt extracts")
+    parser.add_argument("--table", default=TABLE)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--full", action="store_true", default=rd.FULL_RELOAD,
+                        help="Send every row, not just those whose hash changed")
+    parser.add_argument("--restart", action="store_true", help="Discard the checkpoint and staged files")
+    parser.add_argument("--no-export", action="store_true", help="Skip the CSV/Parquet export")
+    parser.add_argument("--precompute", action="store_true", help="Run the precompute pipeline afterwards")
+    args = parser.parse_args()
+
+    run = Run("backfill")
+    try:
+        backfill(args.directory, args.table, args.workers, args.full, args.restart, not args.no_export, run)
+
+        if args.precompute:
+            print("\n⚙️  Running precompute pipeline...")
+            rd.run_precompute(run)
+            print("✅ Precompute complete.")
+    finally:
+        run.finish()
@@ -0,0 +1,160 @@
+"""
+Memory of the data loader's case table, per column, before and after compaction.
+
+Usage:
+    python -m benchmarks.memory [--columns "CREATED DATE" NEIGHBORHOOD ...]
+    python -m benchmarks.memory --workers 4 [--snapshot data/cache/houston_311.arrow]
+    python -m benchmarks.memory --peak [--chunk-rows 0 10000 20000]
+
+"after" is what app.utils.data_loader.load_cases returns (all columns by default);
+"before" is the same rows and columns as plain object strings and float64 numbers, the
+loader's previous representation, so the total ratio compares like with like. Sizes are resident bytes: each column's own arrays plus every
+distinct Python object it points to, counted once (decoded labels share their strings,
+so pandas' deep memory usage would count them once per row).
+
+--workers loads every column in that many processes at once, as Dash workers would, each
+reading its own copy and then each mapping the shared snapshot (CASES_SNAPSHOT, or
+--snapshot). Per process it prints the private (anonymous) and file-backed memory the load
+added: file pages of the snapshot sit once in the page cache, shared by all the processes.
+
+--peak reads every column once per chunk size (0: one read, no cursor) in a fresh process
+each, and prints the peak RSS the read added (Linux VmHWM) next to the size of the frame
+it returned.
+"""
+import argparse
+import multiprocessing
+import sys
+
+import pandas as pd
+
+from app.utils.data_loader import (
+    CASES_SNAPSHOT, READ_CHUNK_ROWS, SNAPSHOT_COLUMNS, TABLE, CaseData, load_cases, plain, read_slice,
+)
+from ingest.storage import open_store
+
+
+def resident_bytes(series):
+    size = series.memory_usage(index=False, deep=not pd.api.types.is_object_dtype(series))
+    if pd.api.types.is_object_dtype(series):
+        objects = {id(v): v for v in series.to_numpy()}
+        size += sum(sys.getsizeof(v) for v in objects.values())
+    return size
+
+
+def memory_report(before, after):
+    # Bytes per column of two representations of the same rows, and the overall ratio
+    rows = []
+    for col in after.columns:
+        rows.append({
+            "column": col,
+            "before": str(before[col].dtype),
+            "after": str(after[col].dtype) if not isinstance(after[col].dtype, pd.CategoricalDtype) else "category",
+            "before_bytes": resident_bytes(before[col]),
+            "after_bytes": resident_bytes(after[col]),
+        })
+    report = pd.DataFrame(rows)
+
+    print(f"{len(after):,} rows")
+    print(f"{'column':<22} {'before':<16} {'after':<16} {'before MB':>10} {'after MB':>10} {'ratio':>7}")
+    for r in report.itertuples():
+        print(
+            f"{r.column:<22} {r.before:<16} {r.after:<16} {r.before_bytes / 2**20:>10.1f} "
+            f"{r.after_bytes / 2**20:>10.1f} {r.before_bytes / max(r.after_bytes, 1):>6.1f}x"
+        )
+    before_total, after_total = report["before_bytes"].sum(), report["after_bytes"].sum()
+    print(
+        f"{'total':<56} {before_total / 2**20:>10.1f} {after_total / 2**20:>10.1f} "
+        f"{before_total / max(after_total, 1):>6.1f}x"
+    )
+    return report
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        rss = dict(line.split(":", 1) for line in f if line.startswith("Rss"))
+    return {k: int(v.split()[0]) / 1024 for k, v in rss.items()}
+
+
+def worker_load(snapshot, ready, done, results):
+    before = rss_mb()
+    ready.wait()
+    df = CaseData(snapshot=snapshot).load(SNAPSHOT_COLUMNS)
+    after = rss_mb()
+    results.put((len(df), after["RssAnon"] - before["RssAnon"], after["RssFile"] - before["RssFile"]))
+    done.wait()
+
+
+def worker_report(workers, snapshot):
+    # Each process holds its rows until all have loaded, so their memory is measured side by side
+    context = multiprocessing.get_context("spawn")
+    for label, path in [("private copies", None), (f"snapshot {snapshot}", snapshot)]:
+        ready, done, queue = context.Barrier(workers), context.Barrier(workers), context.Queue()
+        processes = [context.Process(target=worker_load, args=(path, ready, done, queue)) for _ in range(workers)]
+        for p in processes:
+            p.start()
+        results = [queue.get() for _ in processes]
+        for p in processes:
+            p.join()
+        private = sum(r[1] for r in results)
+        print(
+            f"{label}: {workers} workers × {results[0][0]:,} rows → {private:.1f} MB private "
+            f"({private / workers:.1f} MB each), {max(r[2] for r in results):.1f} MB file-backed"
+        )
+
+
+def vm_mb(*fields):
+    with open("/proc/self/status") as f:
+        status = dict(line.split(":", 1) for line in f)
+    return [int(status[field].split()[0]) / 1024 for field in fields]
+
+
+def peak_load(chunksize, results):
+    store = open_store(read_only=True)
+    # A read of no rows first, so imports and connection setup are not counted
+    read_slice(store, TABLE, SNAPSHOT_COLUMNS, start="2100-01-01", chunksize=chunksize)
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")  # resets the peak (VmHWM) to the current RSS
+    before, = vm_mb("VmRSS")
+    df = read_slice(store, TABLE, SNAPSHOT_COLUMNS, chunksize=chunksize)
+    peak, = vm_mb("VmHWM")
+    results.put((len(df), peak - before, df.memory_usage(index=False, deep=True).sum() / 2**20))
+
+
+def peak_report(chunk_rows):
+    # Peak memory of reading the table, one fresh process per chunk size
+    context = multiprocessing.get_context("spawn")
+    print(f"{'chunk rows':>10} {'rows':>10} {'peak MB':>9} {'frame MB':>9} {'peak/frame':>11}")
+    for chunksize in chunk_rows:
+        queue = context.Queue()
+        process = context.Process(target=peak_load, args=(chunksize, queue))
+        process.start()
+        rows, peak, frame = queue.get()
+        process.join()
+        print(f"{chunksize or 'one read':>10} {rows:>10,} {peak:>9.1f} {frame:>9.1f} {peak / frame:>10.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--columns", nargs="+", help="loader columns (default: all)")
+    parser.add_argument("--workers", type=int, help="compare private copies and the shared snapshot in N processes")
+    parser.add_argument("--snapshot", default=CASES_SNAPSHOT or "data/cache/houston_311.arrow",
+                        help="snapshot path for --workers (default: CASES_SNAPSHOT)")
+    parser.add_argument("--peak", action="store_true", help="peak memory of reading the table, per chunk size")
+    parser.add_argument("--chunk-rows", nargs="+", type=int, default=[0, READ_CHUNK_ROWS],
+                        help="chunk sizes for --peak (default: one read and LOADER_CHUNK_ROWS)")
+    args = parser.parse_args()
+
+    if args.peak:
+        peak_report(args.chunk_rows)
+        return
+
+    if args.workers:
+        worker_report(args.workers, args.snapshot)
+        return
+
+    after = load_cases(args.columns)
+    memory_report(plain(after), after)
+
+
+if __name__ == "__main__":
+    main()
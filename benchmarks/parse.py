@@ -0,0 +1,102 @@
+"""
+Side-by-side parse + clean benchmark for the 311 extract readers.
+
+Usage:
+    python -m benchmarks.parse path/to/extract.txt
+
+Variants:
+    pandas-python  pd.read_csv(engine="python", dtype=str) + clean_and_prepare (the original path)
+    pandas-c       pd.read_csv(engine="c", dtype=str) + clean_and_prepare
+    arrow          ingest.arrow_reader typed reader + clean_typed
+    parallel-N     refresh_data.parse_parallel on N worker processes (--workers N ...)
+
+Each variant runs in a fresh process so peak RSS is measured per variant.
+"""
+import argparse
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import refresh_data as rd
+from ingest.arrow_reader import read_extract_arrow
+
+VARIANTS = {
+    "pandas-python": (
+        lambda path: pd.read_csv(path, **{**rd.READ_KWARGS, "engine": "python"}),
+        rd.clean_and_prepare,
+    ),
+    "pandas-c": (
+        lambda path: pd.read_csv(path, **rd.READ_KWARGS),
+        rd.clean_and_prepare,
+    ),
+    "arrow": (
+        read_extract_arrow,
+        rd.clean_typed,
+    ),
+}
+
+
+def run_variant(name, path):
+    if name.startswith("parallel-"):
+        # Parse and clean both happen inside the workers
+        workers = int(name.split("-")[1])
+        read, clean = (lambda p: rd.parse_parallel(p, workers)), (lambda df: df)
+    else:
+        read, clean = VARIANTS[name]
+
+    start = time.perf_counter()
+    raw = read(path)
+    parse_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    df = clean(raw)
+    clean_s = time.perf_counter() - start
+
+    return {
+        "reader": name,
+        "rows_in": None if name.startswith("parallel-") else len(raw),
+        "rows_out": len(df),
+        "parse_s": round(parse_s, 2),
+        "clean_s": round(clean_s, 2),
+        "rows_per_s": round(len(df) / (parse_s + clean_s)),  # cleaned rows, comparable across variants
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 1e6, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cases": sorted(df["CASE NUMBER"]),
+    }
+
+
+def run_benchmark(path, variants):
+    print(f"📦 Benchmarking readers on {path} ({os.path.getsize(path) / 1e6:,.1f} MB)\n")
+
+    results = []
+    for name in variants:
+        # Fresh process per variant so peak RSS isn't shared between them
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results.append(pool.submit(run_variant, name, path).result())
+        print(f"✓ {name}")
+
+    # Every reader must produce the same cleaned cases
+    reference = results[0].pop("cases")
+    for result in results[1:]:
+        result["same_output"] = result.pop("cases") == reference
+    results[0]["same_output"] = True
+
+    out = pd.DataFrame(results)
+    out["speedup"] = (out["rows_per_s"] / out["rows_per_s"].iloc[0]).round(1)
+
+    print()
+    print(out.to_string(index=False))
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Raw pipe-delimited 311 extract")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--workers", nargs="*", type=int, default=[], help="Also run parse_parallel with these worker counts")
+    args = parser.parse_args()
+
+    run_benchmark(args.path, args.variants + [f"parallel-{n}" for n in args.workers])
@@ -0,0 +1,217 @@
+"""
+End-to-end ingestion benchmark on synthetic extracts.
+
+Usage:
+    python -m benchmarks.suite --sizes 100000 1000000 10000000 --out benchmarks/results.json
+
+For each size a synthetic extract is generated (cached under data/bench/) and timed:
+
+    parse           parse_extract, pandas and arrow readers
+    clean           clean_extract + prepare_for_load
+    hash            row_hashes (the PostgreSQL change check)
+
+Then every storage backend (--backends, default postgres and duckdb) loads the same
+cleaned rows into its own scratch table, each stage prefixed with the backend name:
+
+    load_insert     load_changed_rows into an empty table (all inserts)
+    load_unchanged  the same rows again (all skipped by the change check)
+    load_full       the same rows with full=True (sent, but no-op updates are skipped)
+    export          export_snapshot of the scratch table (CSV + Parquet)
+    read            read_cases, the data loader's full-table read
+    aggregate       monthly counts and mean resolution time per category, run in the engine
+    stream_load     chunked parse → clean → load of the whole file into a fresh table
+    pipeline_load   the same, with read, parse, clean and load overlapping (asyncio pipeline)
+
+PostgreSQL is DATABASE_URL (or --database-url). Without either, an embedded PostgreSQL
+is started with the optional `pgserver` package (pip install pgserver). DuckDB uses a
+scratch file under data/bench/. Results are printed and written as JSON.
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+from sqlalchemy import create_engine, text
+
+import refresh_data as rd
+from benchmarks.synthetic import generate_extract
+from ingest.download import read_blocks
+from ingest.postgres_store import PostgresStore, row_hashes
+from ingest.schema import MIGRATIONS_TABLE, hash_table_name
+from ingest.storage import BACKENDS
+
+BENCH_DIR = Path("data/bench")
+SCRATCH_TABLE = "bench_311"
+
+AGGREGATE_SQL = """
+    SELECT DATE_TRUNC('month', "CREATED DATE") AS month, "CATEGORY",
+           COUNT(*) AS cases, AVG("RESOLUTION_TIME_DAYS") AS mean_days
+    FROM {relation}
+    GROUP BY 1, 2
+"""
+
+
+def database_url(url=None):
+    url = url or os.environ.get("DATABASE_URL")
+    if url:
+        return url, "postgres"
+
+    try:
+        import pgserver
+    except ImportError:
+        raise SystemExit("⚠ Set DATABASE_URL, or `pip install pgserver` for an embedded PostgreSQL")
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    server = pgserver.get_server(BENCH_DIR / "pgdata")
+    return server.get_uri(), "pgserver"
+
+
+def open_backend(backend, url=None):
+    if backend == "duckdb":
+        from ingest.duckdb_store import DuckDBStore
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        return DuckDBStore(BENCH_DIR / "bench.duckdb")
+
+    url, _ = database_url(url)
+    return PostgresStore(create_engine(url, pool_size=4, pool_pre_ping=True))
+
+
+def drop_table(table_name, store):
+    if store.name == "duckdb":
+        store.con.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+        return
+
+    with store.engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name} CASCADE"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {hash_table_name(table_name)}"))
+        if conn.execute(text(f"SELECT to_regclass('{MIGRATIONS_TABLE}')")).scalar():
+            conn.execute(text(f"DELETE FROM {MIGRATIONS_TABLE} WHERE table_name = :table"), {"table": table_name})
+
+
+def reset_table(table_name, store):
+    drop_table(table_name, store)
+    store.ensure_table(table_name)
+
+
+def timed_stage(stages, name, rows, func, *args, **kwargs):
+    # rows=None counts the rows of the stage's result
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    rows = len(result) if rows is None else rows
+    stages[name] = {
+        "seconds": round(seconds, 3),
+        "rows": rows,
+        "rows_per_s": round(rows / max(seconds, 1e-9)),
+    }
+    print(f"  {name:<24} {seconds:8.2f}s  {stages[name]['rows_per_s']:>12,} rows/s")
+    return result
+
+
+def extract_path(rows, seed):
+    path = BENCH_DIR / f"synthetic-{rows}-{seed}.txt"
+    if not path.exists():
+        generate_extract(str(path), rows, seed=seed)
+    return path
+
+
+def run_backend(store, path, df, stages, chunksize):
+    # Same rows, same stages, one backend; stage names are prefixed with the backend
+    print(f"  — {store.name}")
+    name = lambda stage: f"{store.name}:{stage}"
+
+    reset_table(SCRATCH_TABLE, store)
+    timed_stage(stages, name("load_insert"), len(df), store.load_changed_rows, df, SCRATCH_TABLE, full=False)
+    timed_stage(stages, name("load_unchanged"), len(df), store.load_changed_rows, df, SCRATCH_TABLE, full=False)
+    timed_stage(stages, name("load_full"), len(df), store.load_changed_rows, df, SCRATCH_TABLE, full=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timed_stage(
+            stages, name("export"), len(df), store.export_snapshot, SCRATCH_TABLE,
+            csv_path=Path(tmp) / "export.csv.gz", snapshot_dir=Path(tmp) / "parquet",
+        )
+
+    timed_stage(stages, name("read"), len(df), store.read_cases, SCRATCH_TABLE)
+    sql = AGGREGATE_SQL.format(relation=store.cases_relation(SCRATCH_TABLE))
+    timed_stage(stages, name("aggregate"), len(df), store.query, sql)
+
+    reset_table(SCRATCH_TABLE, store)
+    timed_stage(stages, name("stream_load"), len(df), rd.stream_load, path, SCRATCH_TABLE, store, chunksize)
+
+    reset_table(SCRATCH_TABLE, store)
+    timed_stage(
+        stages, name("pipeline_load"), len(df), rd.pipeline_load, read_blocks(path), SCRATCH_TABLE, store, chunksize,
+    )
+    drop_table(SCRATCH_TABLE, store)
+
+
+def run_size(rows, stores, seed, chunksize):
+    path = extract_path(rows, seed)
+    print(f"\n📦 {rows:,} rows ({path.stat().st_size / 1e6:,.1f} MB) — {path}")
+    stages = {}
+
+    raw = timed_stage(stages, "parse_pandas", None, rd.parse_extract, path, reader="pandas")
+    timed_stage(stages, "parse_arrow", None, rd.parse_extract, path, reader="arrow")
+
+    df = timed_stage(stages, "clean", len(raw), lambda: rd.prepare_for_load(rd.clean_extract(raw, reader="pandas")))
+    del raw
+    timed_stage(stages, "hash", len(df), row_hashes, df)
+
+    for store in stores:
+        run_backend(store, path, df, stages, chunksize)
+
+    return {
+        "rows": rows,
+        "file_mb": round(path.stat().st_size / 1e6, 1),
+        "cleaned_rows": len(df),
+        "stages": stages,
+    }
+
+
+def run_suite(sizes, url=None, out=None, seed=0, chunksize=rd.CHUNK_ROWS, backends=BACKENDS):
+    stores = [open_backend(backend, url) for backend in backends]
+
+    results = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "backends": {store.name: store.query("SELECT version() AS version")["version"].iloc[0] for store in stores},
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "pyarrow": pa.__version__,
+        "cpu_count": os.cpu_count(),
+        "chunk_rows": chunksize,
+        "runs": [run_size(rows, stores, seed, chunksize) for rows in sizes],
+    }
+
+    # rows/sec per stage, one column per extract size
+    summary = pd.DataFrame({
+        f"{run['rows']:,}": {stage: timing["rows_per_s"] for stage, timing in run["stages"].items()}
+        for run in results["runs"]
+    })
+    print()
+    print(summary.to_string())
+
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(json.dumps(results, indent=2))
+        print(f"\n✓ Results written to {out}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100_000, 1_000_000])
+    parser.add_argument("--out", default="benchmarks/results.json")
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=rd.CHUNK_ROWS)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=BACKENDS)
+    args = parser.parse_args()
+
+    run_suite(args.sizes, args.database_url, args.out, args.seed, args.chunk_rows, args.backends)
@@ -0,0 +1,217 @@
+"""
+Synthetic Houston 311 extract generator.
+
+Usage:
+    python -m benchmarks.synthetic data/bench/synthetic-1000000.txt --rows 1000000
+
+Writes a pipe-delimited, latin-1 file shaped like the city's YTD extract: a 5-line
+preamble, the header with the real source column names (every RENAME_MAP key plus a few
+columns the pipeline drops), and one row per case. Rows are in created-date order.
+The data includes the mess the cleaner has to handle:
+
+    - case types drawn from category_mapping (skewed, like the real feed) plus unmapped ones
+    - neighborhood spellings that NEIGHBORHOOD_FIXES rewrites, and stray whitespace
+    - duplicate case numbers (a case re-exported later in the file)
+    - coordinates outside the Houston bounds, and blank coordinates
+    - rows with a case number and nothing else
+    - bad lines with an extra field, which the readers skip
+    - open cases with no closed date, and non-ASCII latin-1 text
+
+Output is written in blocks, so 10M-row files don't need 10M rows in memory.
+"""
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.utils.utils import category_mapping
+
+PREAMBLE = [
+    "City of Houston 311 Service Requests",
+    "CRIS Public Data Extract (D365)",
+    "Synthetic extract generated by benchmarks.synthetic",
+    "Report generated: {generated}",
+    "-" * 40,
+]
+
+# Source column order of the extract; the RENAME_MAP columns are spread among ones the pipeline drops
+COLUMNS = [
+    "365 Case Number",
+    "Case Number",
+    "Incident Address",
+    "Latitude",
+    "Longitude",
+    "Status",
+    "Created Date Local",
+    "Closed Date",
+    "Customer SuperNeighborhood",
+    "Department",
+    "Division",
+    "Incident Case Type",
+    "Channel Type",
+]
+
+NEIGHBORHOODS = [
+    "ACRES HOME", "ALIEF", "BRAESWOOD PLACE", "BRIARFOREST AREA", "CENTRAL SOUTHWEST",
+    "CLEAR LAKE", "DOWNTOWN", "EAST HOUSTON", "EASTEX - JENSEN AREA", "FOURTH WARD",
+    "GREATER FIFTH WARD", "GREATER GREENSPOINT", "GREATER HEIGHTS", "GREATER HOBBY AREA",
+    "GREATER UPTOWN", "GULFTON", "HARRISBURG / MANCHESTER / SMITH ADDITION", "INDEPENDENCE HEIGHTS",
+    "KASHMERE GARDENS", "KINGWOOD AREA", "LAKEWOOD", "MAGNOLIA PARK", "MEMORIAL", "MEYERLAND AREA",
+    "MID WEST", "MIDTOWN", "MONTROSE", "NEAR NORTHWEST", "NORTHSIDE VILLAGE", "OST / SOUTH UNION",
+    "PLEASANTVILLE AREA", "SECOND WARD", "SHARPSTOWN", "SOUTH MAIN", "SPRING BRANCH EAST",
+    "SUNNYSIDE", "THIRD WARD", "WASHINGTON AVENUE COALITION / MEMORIAL P", "WESTCHASE",
+    "WILLOW MEADOWS / WILLOWBEND AREA",
+]
+
+DEPARTMENTS = {
+    "PWE Public Works Engineering": ["PU Public Utilities", "TS Transportation & Drainage", "PWE Water Operations"],
+    "SWM Solid Waste Management": ["SWM Collections", "SWM Heavy Trash", "SWM Recycling"],
+    "DON Department Of Neighborhoods": ["DON Inspections & Public Service", "DON Code Enforcement"],
+    "PRD Parks and Recreation": ["PRD Urban Forestry", "PRD Greenspace Management"],
+    "ARA Administration & Regulatory Affairs": ["ARA Parking Management", "ARA BARC Animal Services"],
+}
+
+STREETS = ["MAIN ST", "WESTHEIMER RD", "BELLAIRE BLVD", "RICHMOND AVE", "MONTROSE BLVD", "TELEPHONE RD", "CAFÉ DR"]
+CHANNELS = ["Phone", "Web", "Mobile App", "E-Mail", "Walk-In"]
+
+# Share of rows carrying each kind of mess
+RATES = {
+    "duplicate": 0.01,
+    "out_of_bounds": 0.02,
+    "blank_coords": 0.01,
+    "empty_case": 0.001,
+    "bad_line": 0.001,
+    "unmapped_type": 0.005,
+    "padded": 0.05,
+    "open": 0.25,
+}
+
+BLOCK_ROWS = 500_000
+
+
+def weights(n, rng):
+    # Zipf-like popularity over a shuffled list, so a few types/areas dominate like in the real feed
+    w = 1 / np.arange(1, n + 1) ** 0.9
+    rng.shuffle(w)
+    return w / w.sum()
+
+
+def make_block(start, rows, year, rng, pickers):
+    case_ids = np.arange(start, start + rows)
+
+    # Duplicates re-export a case seen up to ~50k rows earlier
+    dup = rng.random(rows) < RATES["duplicate"]
+    case_ids[dup] = np.maximum(case_ids[dup] - rng.integers(1, 50_000, dup.sum()), 0)
+    # Prefixed by the year, as the city's case numbers are, so every year's extract has its own cases
+    case_numbers = pd.Series((year % 100) * 10**9 + case_ids).astype(str)
+
+    # Created dates in file order across the year; closed a few days later or still open
+    offsets = (case_ids + rng.random(rows)) * (365 * 86_400) / pickers["total_rows"]
+    created = np.datetime64(f"{year}-01-01T00:00:00") + offsets.astype("timedelta64[s]")
+    closed = created + (rng.exponential(6, rows) * 86_400).astype("timedelta64[s]")
+    created_s = pd.Series(created).dt.strftime("%Y-%m-%d %H:%M:%S")
+    closed_s = pd.Series(closed).dt.strftime("%Y-%m-%d %H:%M:%S")
+    closed_s = closed_s.where(rng.random(rows) >= RATES["open"], "")
+
+    lat = rng.uniform(*pickers["lat"], rows)
+    lon = rng.uniform(*pickers["lon"], rows)
+    oob = rng.random(rows) < RATES["out_of_bounds"]
+    lat[oob] += rng.choice([-1.0, 1.0], oob.sum())
+    lat_s = pd.Series(np.round(lat, 6)).astype(str)
+    lon_s = pd.Series(np.round(lon, 6)).astype(str)
+    blank = rng.random(rows) < RATES["blank_coords"]
+    lat_s[blank] = ""
+    lon_s[blank] = ""
+
+    case_types = pd.Series(pickers["case_types"][rng.choice(len(pickers["case_types"]), rows, p=pickers["type_p"])])
+    case_types[rng.random(rows) < RATES["unmapped_type"]] = "Legacy Request Type"
+
+    neighborhoods = pd.Series(pickers["neighborhoods"][rng.choice(len(pickers["neighborhoods"]), rows, p=pickers["area_p"])])
+    padded = rng.random(rows) < RATES["padded"]
+    neighborhoods[padded] = neighborhoods[padded] + " "
+
+    # Division is picked within the row's department
+    dept_idx = rng.integers(0, len(pickers["departments"]), rows)
+    div_idx = pickers["division_start"][dept_idx] + rng.integers(0, 1 << 16, rows) % pickers["division_count"][dept_idx]
+
+    block = pd.DataFrame({
+        "365 Case Number": case_numbers,
+        "Case Number": case_numbers,
+        "Incident Address": pd.Series(rng.integers(100, 20_000, rows)).astype(str) + " "
+            + pd.Series(np.array(STREETS, dtype=object)[rng.integers(0, len(STREETS), rows)]),
+        "Latitude": lat_s,
+        "Longitude": lon_s,
+        "Status": np.where(closed_s == "", "Open", "Closed"),
+        "Created Date Local": created_s,
+        "Closed Date": closed_s,
+        "Customer SuperNeighborhood": neighborhoods,
+        "Department": pickers["departments"][dept_idx],
+        "Division": pickers["divisions"][div_idx],
+        "Incident Case Type": case_types,
+        "Channel Type": np.array(CHANNELS, dtype=object)[rng.integers(0, len(CHANNELS), rows)],
+    })
+
+    # Case number and nothing else
+    empty = rng.random(rows) < RATES["empty_case"]
+    block.loc[empty, COLUMNS[2:]] = ""
+
+    # One field too many; both readers skip these lines
+    bad = rng.random(rows) < RATES["bad_line"]
+    block.loc[bad, "Channel Type"] = block.loc[bad, "Channel Type"] + "|EXTRA"
+
+    # Joined by hand: to_csv would escape the extra delimiter on the bad lines
+    lines = block[COLUMNS[0]]
+    for col in COLUMNS[1:]:
+        lines = lines + "|" + block[col]
+    return lines
+
+
+def generate_extract(path, rows, year=None, seed=0):
+    year = year or datetime.now().year
+    rng = np.random.default_rng(seed)
+    case_types = np.array(list(category_mapping), dtype=object)
+    neighborhoods = np.array(NEIGHBORHOODS, dtype=object)
+    division_count = np.array([len(divs) for divs in DEPARTMENTS.values()])
+    pickers = {
+        "total_rows": rows,
+        "case_types": case_types,
+        "type_p": weights(len(case_types), rng),
+        "neighborhoods": neighborhoods,
+        "area_p": weights(len(neighborhoods), rng),
+        "departments": np.array(list(DEPARTMENTS), dtype=object),
+        "divisions": np.array([div for divs in DEPARTMENTS.values() for div in divs], dtype=object),
+        "division_start": np.cumsum(division_count) - division_count,
+        "division_count": division_count,
+        "lat": (29.55, 30.05),
+        "lon": (-95.85, -94.95),
+    }
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    start = time.perf_counter()
+    with open(path, "w", encoding="latin-1", newline="") as f:
+        generated = datetime.now().strftime("%m/%d/%Y %I:%M:%S %p")
+        for line in PREAMBLE:
+            f.write(line.format(generated=generated) + "\n")
+        f.write("|".join(COLUMNS) + "\n")
+
+        for block_start in range(0, rows, BLOCK_ROWS):
+            lines = make_block(block_start, min(BLOCK_ROWS, rows - block_start), year, rng, pickers)
+            f.write("\n".join(lines) + "\n")
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Wrote {rows:,} rows to {path} ({os.path.getsize(path) / 1e6:,.1f} MB) in {elapsed:.1f}s")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Output .txt path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--year", type=int, default=None, help="Year of the created dates (default: this year)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_extract(args.path, args.rows, args.year, args.seed)
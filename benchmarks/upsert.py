@@ -0,0 +1,90 @@
+"""
+Row-by-row vs COPY bulk upsert on a local PostgreSQL instance.
+
+Usage:
+    DATABASE_URL=postgresql://localhost/bench python -m benchmarks.upsert path/to/extract.txt --rows 50000
+
+Both paths load the same cleaned rows into their own scratch table twice:
+once into an empty table (all inserts) and once more on top (all conflicts; rows are
+identical, so the change-aware upsert skips the write).
+"""
+import argparse
+import time
+import pandas as pd
+from sqlalchemy import text
+
+import refresh_data as rd
+from ingest.postgres_store import bulk_upsert
+
+SCRATCH_TABLES = {
+    "row-by-row": "bench_upsert_rows",
+    "copy": "bench_upsert_copy",
+}
+
+UPSERT_FUNCS = {
+    "row-by-row": rd.upsert,
+    "copy": bulk_upsert,
+}
+
+
+def load_sample(path, rows):
+    df = pd.read_csv(path, nrows=rows, **rd.READ_KWARGS)
+    df = rd.clean_and_prepare(df)
+    return rd.prepare_for_load(df)
+
+
+def reset_table(df, table_name, engine):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+    df.head(0).to_sql(table_name, engine, index=False)
+    with engine.begin() as conn:
+        key = ", ".join(f'"{col}"' for col in rd.PRIMARY_KEY)
+        conn.execute(text(f"CREATE UNIQUE INDEX ON {table_name} ({key})"))
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def run_benchmark(path, rows):
+    engine = rd.get_engine()
+    df = load_sample(path, rows)
+    print(f"📦 Benchmarking {len(df):,} cleaned rows from {path}\n")
+
+    results = []
+    for name, table_name in SCRATCH_TABLES.items():
+        func = UPSERT_FUNCS[name]
+        reset_table(df, table_name, engine)
+
+        insert_s = time_call(func, df, table_name, engine)
+        update_s = time_call(func, df, table_name, engine)
+
+        results.append({
+            "path": name,
+            "rows": len(df),
+            "insert_s": round(insert_s, 2),
+            "update_s": round(update_s, 2),
+            "rows_per_s": round(2 * len(df) / (insert_s + update_s)),
+        })
+
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {table_name}"))
+
+    out = pd.DataFrame(results)
+    base = out.loc[out["path"] == "row-by-row", "rows_per_s"].iloc[0]
+    out["speedup"] = (out["rows_per_s"] / base).round(1)
+
+    print()
+    print(out.to_string(index=False))
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Raw pipe-delimited 311 extract")
+    parser.add_argument("--rows", type=int, default=50_000, help="Raw rows to read from the extract")
+    args = parser.parse_args()
+
+    run_benchmark(args.path, args.rows)
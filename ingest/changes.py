@@ -0,0 +1,128 @@
+"""
+Change feed of a refresh run.
+
+Stores report every row they actually insert or update, and the feed keeps its case
+number plus the analytical keys it touches: created month × neighborhood × department ×
+division × category × case type. An update touches the keys of the stored row as well as
+the new one, since a case can move to another month or category. Rows found identical
+are not recorded. At the end of the run the feed is written under CHANGES_DIR/<run_id>/:
+
+    cases.parquet    table, CASE NUMBER, change ("inserted" / "updated"), first_change
+    keys.parquet     distinct (table, month, NEIGHBORHOOD, DEPARTMENT, DIVISION, CATEGORY, CASE TYPE)
+    manifest.json    run id, counts, affected months, retention cutoffs
+
+A case written more than once in a run (two chunks, both years, overlapping extracts)
+has one row: `change` is its latest change and `first_change` its first, so a case
+inserted and then updated in the same run counts as updated and as new ("new" in the
+manifest). Months dropped by retention are listed under "expired_before" rather than as keys.
+A run that changed nothing still writes an (empty) manifest.
+"""
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CHANGES_DIR = Path(os.environ.get("REFRESH_CHANGES_DIR", "data/changes"))
+
+KEY_COLUMNS = ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY", "CASE TYPE"]
+
+
+def affected_keys(table_name, rows):
+    # Distinct (month, dimensions) of `rows`; categoricals and strings end up as plain values
+    created = pd.to_datetime(rows["CREATED DATE"])
+    keys = pd.DataFrame({
+        "table": table_name,
+        "month": created.dt.to_period("M").dt.to_timestamp().to_numpy(),
+    })
+    for col in KEY_COLUMNS:
+        keys[col] = rows[col].astype(object).where(rows[col].notna(), None).to_numpy()
+    return keys.drop_duplicates()
+
+
+class ChangeFeed:
+    def __init__(self, run_id, out_dir=CHANGES_DIR):
+        self.run_id = run_id
+        self.out_dir = Path(out_dir) / run_id
+        self.cases = []
+        self.keys = []
+        self.expired = {}
+        self.lock = threading.Lock()
+
+    def add(self, table_name, after, before=None):
+        # `after`: rows as written (text columns); `before`: the stored rows they replaced
+        if after.empty:
+            return
+        cases = after["CASE NUMBER"].astype(str).to_numpy()
+        replaced = before["CASE NUMBER"].astype(str) if before is not None else pd.Series(dtype=str)
+        changed = pd.DataFrame({
+            "table": table_name,
+            "CASE NUMBER": cases,
+            "change": np.where(pd.Series(cases).isin(replaced), "updated", "inserted"),
+        })
+
+        keys = [affected_keys(table_name, after)]
+        if before is not None and not before.empty:
+            keys.append(affected_keys(table_name, before))
+
+        with self.lock:
+            self.cases.append(changed)
+            self.keys.extend(keys)
+
+    def expire(self, table_name, cutoff):
+        # Retention dropped everything in `table_name` created before `cutoff`
+        with self.lock:
+            self.expired[table_name] = cutoff.isoformat()
+
+    def write(self):
+        cases = pd.concat(self.cases, ignore_index=True) if self.cases else pd.DataFrame(
+            {"table": pd.Series(dtype=str), "CASE NUMBER": pd.Series(dtype=str), "change": pd.Series(dtype=str)}
+        )
+        # One row per case written in this run, in the order the loads happened: its latest and first change
+        first = cases.drop_duplicates(subset=["table", "CASE NUMBER"])
+        cases = cases.drop_duplicates(subset=["table", "CASE NUMBER"], keep="last", ignore_index=True)
+        cases["first_change"] = cases.merge(first, on=["table", "CASE NUMBER"], how="left")["change_y"].to_numpy()
+
+        keys = pd.concat(self.keys, ignore_index=True) if self.keys else affected_keys("", pd.DataFrame(
+            {col: pd.Series(dtype=object) for col in ["CREATED DATE"] + KEY_COLUMNS}
+        ))
+        keys = keys.drop_duplicates(ignore_index=True).sort_values(["table", "month"] + KEY_COLUMNS, ignore_index=True)
+
+        manifest = {
+            "run_id": self.run_id,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "inserted": int((cases["change"] == "inserted").sum()),
+            "updated": int((cases["change"] == "updated").sum()),
+            "new": int((cases["first_change"] == "inserted").sum()),
+            "keys": len(keys),
+            "months": sorted(keys["month"].dt.strftime("%Y-%m").unique().tolist()),
+            "expired_before": self.expired,
+            "files": ["cases.parquet", "keys.parquet"],
+        }
+
+        # Built next to the final directory and renamed into place, so readers never see half a feed
+        tmp_dir = self.out_dir.with_name(self.out_dir.name + ".tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        cases.to_parquet(tmp_dir / "cases.parquet", index=False)
+        keys.to_parquet(tmp_dir / "keys.parquet", index=False)
+        (tmp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        shutil.rmtree(self.out_dir, ignore_errors=True)
+        os.replace(tmp_dir, self.out_dir)
+
+        print(
+            f"✓ Change feed: {manifest['inserted']:,} inserted and {manifest['updated']:,} updated cases "
+            f"({manifest['new']:,} new), "
+            f"{manifest['keys']:,} affected keys in {len(manifest['months'])} months → {self.out_dir}"
+        )
+        return manifest
+
+
+def latest_manifest(changes_dir=CHANGES_DIR):
+    # Manifest of the most recent run (run ids start with their timestamp), or None
+    manifests = sorted(p for p in Path(changes_dir).glob("*/manifest.json") if not p.parent.name.endswith(".tmp"))
+    return json.loads(manifests[-1].read_text()) if manifests else None
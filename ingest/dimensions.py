@@ -0,0 +1,97 @@
+"""
+Dimension tables of the houston_311 star schema.
+
+The fact table stores a SMALLINT key for each classification column instead of repeating
+its text on every row. Each dimension maps key → value as cleaned by the refresh. The
+case-type dimension also carries the case type's category from category_mapping, so
+CATEGORY is not stored in the fact table at all. Dimensions are shared by every fact
+table and only grow: a new value gets the next key, and existing keys never change.
+"""
+import pandas as pd
+from sqlalchemy import text
+
+from app.utils.utils import category_mapping
+
+# Text column → (dimension table, key column in the fact table)
+DIMENSIONS = {
+    "NEIGHBORHOOD": ("dim_neighborhood", "NEIGHBORHOOD_ID"),
+    "DEPARTMENT": ("dim_department", "DEPARTMENT_ID"),
+    "DIVISION": ("dim_division", "DIVISION_ID"),
+    "CASE TYPE": ("dim_case_type", "CASE_TYPE_ID"),
+}
+
+UNKNOWN_CATEGORY = "Unknown"
+
+
+def create_dimension_tables(conn):
+    for column, (dim_table, _) in DIMENSIONS.items():
+        extra = ',\n"category" TEXT NOT NULL' if column == "CASE TYPE" else ""
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {dim_table} (
+                "id" SMALLINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                "name" TEXT NOT NULL UNIQUE{extra}
+            )
+        """))
+
+
+def case_type_category(name):
+    return category_mapping.get(name, UNKNOWN_CATEGORY)
+
+
+def sync_dimension(conn, column, values):
+    # Add the values the dimension hasn't seen yet; returns {value: key} for `values`
+    dim_table, _ = DIMENSIONS[column]
+    names = sorted({value for value in values if isinstance(value, str)})
+    if not names:
+        return {}
+
+    # NOT EXISTS keeps known values away from the identity sequence, which ON CONFLICT
+    # alone would advance on every load
+    if column == "CASE TYPE":
+        params = {"names": names, "categories": [case_type_category(name) for name in names]}
+        conn.execute(text(f"""
+            INSERT INTO {dim_table} ("name", "category")
+            SELECT v.name, v.category
+            FROM UNNEST(CAST(:names AS TEXT[]), CAST(:categories AS TEXT[])) AS v(name, category)
+            WHERE NOT EXISTS (SELECT 1 FROM {dim_table} d WHERE d."name" = v.name)
+            ON CONFLICT ("name") DO NOTHING
+        """), params)
+
+        # Edits to category_mapping reach case types that are already known
+        conn.execute(text(f"""
+            UPDATE {dim_table} d SET "category" = v.category
+            FROM UNNEST(CAST(:names AS TEXT[]), CAST(:categories AS TEXT[])) AS v(name, category)
+            WHERE d."name" = v.name AND d."category" IS DISTINCT FROM v.category
+        """), params)
+    else:
+        conn.execute(text(f"""
+            INSERT INTO {dim_table} ("name")
+            SELECT v.name FROM UNNEST(CAST(:names AS TEXT[])) AS v(name)
+            WHERE NOT EXISTS (SELECT 1 FROM {dim_table} d WHERE d."name" = v.name)
+            ON CONFLICT ("name") DO NOTHING
+        """), {"names": names})
+
+    rows = conn.execute(
+        text(f'SELECT "name", "id" FROM {dim_table} WHERE "name" = ANY(:names)'),
+        {"names": names},
+    )
+    return dict(rows.all())
+
+
+def to_fact(df, conn):
+    # Cleaned rows → fact rows: each text dimension becomes its key, CATEGORY is dropped
+    fact = df.drop(columns=["CATEGORY"])
+    for column, (_, key_col) in DIMENSIONS.items():
+        values = df[column].astype(object)
+        keys = sync_dimension(conn, column, values.unique())
+        fact[column] = values.map(keys).astype("Int16")
+        fact = fact.rename(columns={column: key_col})
+    return fact
+
+
+def read_dimensions(con):
+    # {text column: DataFrame of its dimension}, for decoding fact keys
+    return {
+        column: pd.read_sql(text(f'SELECT * FROM {dim_table} ORDER BY "id"'), con)
+        for column, (dim_table, _) in DIMENSIONS.items()
+    }
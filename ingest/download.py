@@ -0,0 +1,325 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+RAW_DIR = Path("data/raw")
+ARCHIVE_DIR = RAW_DIR / "archive"
+ARCHIVE_INDEX = ARCHIVE_DIR / "index.jsonl"
+STATE_PATH = RAW_DIR / "download_state.json"
+
+# Case numbers of each ingested prefix, one gzip text file per prefix, named in the tail state
+TAIL_CASES_DIR = RAW_DIR / "tail_cases"
+
+# Number of archived extracts kept on disk (extracts still referenced by the state file are never pruned)
+ARCHIVE_KEEP = int(os.environ.get("RAW_ARCHIVE_KEEP", "14"))
+
+CHUNK_BYTES = 1_000_000  # 1 MB, also the most a dropped connection can lose before a resume
+
+# Bytes just before the ingested offset that must still match before a tail is trusted
+TAIL_CHECK_BYTES = 64 * 1024
+
+
+# STATE
+def load_state():
+    if STATE_PATH.exists():
+        return json.loads(STATE_PATH.read_text())
+    return {}
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state, indent=2, sort_keys=True))
+    os.replace(tmp_path, STATE_PATH)
+
+def update_state(url, **fields):
+    state = load_state()
+    state[url] = {**state.get(url, {}), **fields}
+    save_state(state)
+    return state[url]
+
+
+# ARCHIVE
+def archive_path(sha256):
+    return ARCHIVE_DIR / f"{sha256}.txt"
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def archive_file(url, part_path):
+    # Content-addressed: identical downloads collapse onto one archived file
+    sha256 = file_sha256(part_path)
+    dest = archive_path(sha256)
+    ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+
+    if dest.exists():
+        part_path.unlink()
+    else:
+        os.replace(part_path, dest)
+        with open(ARCHIVE_INDEX, "a") as f:
+            f.write(json.dumps({
+                "url": url,
+                "sha256": sha256,
+                "bytes": dest.stat().st_size,
+                "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            }) + "\n")
+
+    return dest, sha256
+
+def prune_archive(keep=ARCHIVE_KEEP):
+    referenced = {entry.get("sha256") for entry in load_state().values()}
+    archived = sorted(ARCHIVE_DIR.glob("*.txt"), key=lambda p: p.stat().st_mtime, reverse=True)
+
+    for path in archived[keep:]:
+        if path.stem not in referenced:
+            path.unlink()
+
+
+# DOWNLOAD
+class RestartedDownload(Exception):
+    """Upstream sent the whole file again after part of it had already been streamed."""
+
+
+def read_blocks(path, start=0, end=None, block_size=CHUNK_BYTES):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = (os.fstat(f.fileno()).st_size if end is None else end) - start
+        while remaining > 0:
+            block = f.read(min(block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def fetch_extract(url, max_retries=5, timeout=60):
+    """
+    Download the extract at `url` into the raw archive.
+
+    Sends If-None-Match / If-Modified-Since from the last successful download, so an
+    unchanged upstream file costs one bodiless 304 response. Interrupted transfers
+    resume from the partial file with an HTTP Range request.
+
+    Returns (path, changed): the archived copy of the current extract, and whether its
+    content differs from the last extract marked as loaded with mark_loaded().
+    """
+    blocks = stream_extract(url, max_retries=max_retries, timeout=timeout, replay=False)
+    while True:
+        try:
+            next(blocks)
+        except StopIteration as done:
+            return done.value
+
+
+def stream_extract(url, max_retries=5, timeout=60, replay=True):
+    """
+    fetch_extract as a generator: yields the extract's bytes in order as they arrive,
+    and returns (path, changed) when the archived copy is complete.
+
+    A resumed download first replays the bytes already in the partial file, so the
+    consumer always sees the file from byte 0 (replay=False skips that). A 304 yields
+    nothing. If a retry gets the whole file back instead of the rest of it, the bytes
+    already yielded may belong to another version, so RestartedDownload is raised and
+    the caller starts over (fetch_extract then downloads the new version as usual).
+    """
+    print(f"Downloading: {url}")
+    entry = load_state().get(url, {})
+    part_path = RAW_DIR / f"{Path(urlparse(url).path).name}.part"
+    part_path.parent.mkdir(parents=True, exist_ok=True)
+
+    cached = archive_path(entry["sha256"]) if entry.get("sha256") else None
+    conditional = {}
+    if cached and cached.exists():
+        if entry.get("etag"):
+            conditional["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditional["If-Modified-Since"] = entry["last_modified"]
+
+    yielded = 0
+    for attempt in range(1, max_retries + 1):
+        headers = dict(conditional)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        partial = entry.get("partial") or {}
+        if offset and (partial.get("etag") or partial.get("last_modified")):
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = partial.get("etag") or partial["last_modified"]
+
+        try:
+            with requests.get(url, headers=headers, stream=True, timeout=timeout) as r:
+                if r.status_code == 304:
+                    print("✓ Extract not modified since last download")
+                    part_path.unlink(missing_ok=True)
+                    update_state(url, partial=None)
+                    return cached, entry.get("sha256") != entry.get("loaded_sha256")
+
+                r.raise_for_status()
+
+                if r.status_code == 206:
+                    print(f"↻ Resuming download at byte {offset:,}")
+                    mode = "ab"
+                    if replay and yielded < offset:
+                        yield from read_blocks(part_path, yielded, offset)
+                        yielded = offset
+                elif yielded:
+                    raise RestartedDownload(f"{url} restarted from byte 0 after {yielded:,} bytes were streamed")
+                else:
+                    offset, mode = 0, "wb"
+
+                # Remember which upstream version the partial file belongs to, so a resume can use If-Range
+                entry = update_state(url, partial={
+                    "etag": r.headers.get("ETag"),
+                    "last_modified": r.headers.get("Last-Modified"),
+                })
+
+                with open(part_path, mode) as f:
+                    for chunk in r.iter_content(chunk_size=CHUNK_BYTES):
+                        if chunk:
+                            f.write(chunk)
+                            if replay:
+                                yield chunk
+                                yielded += len(chunk)
+
+                expected = r.headers.get("Content-Length")
+                if expected is not None and part_path.stat().st_size != offset + int(expected):
+                    raise IOError(
+                        f"Incomplete download: {part_path.stat().st_size:,} of {offset + int(expected):,} bytes"
+                    )
+
+            # If we reach here, download succeeded → break out of retry loop
+            break
+
+        except (requests.RequestException, IOError) as e:
+            print(f"⚠ Download attempt {attempt} failed: {e}")
+
+            # Last attempt → give up (the partial file is kept for the next run to resume)
+            if attempt == max_retries:
+                raise RuntimeError(
+                    f"Failed to download file after {max_retries} attempts\nURL: {url}"
+                )
+
+            time.sleep(min(2 ** attempt, 60))  # exponential backoff before retrying
+
+    path, sha256 = archive_file(url, part_path)
+    entry = update_state(
+        url,
+        sha256=sha256,
+        etag=entry["partial"].get("etag"),
+        last_modified=entry["partial"].get("last_modified"),
+        partial=None,
+    )
+    prune_archive()
+
+    return path, sha256 != entry.get("loaded_sha256")
+
+def tail_state(data, offset, header):
+    # Where the ingested prefix ends, plus a checksum of the bytes just before that point
+    return {
+        "offset": offset,
+        "check_sha256": hashlib.sha256(data[-TAIL_CHECK_BYTES:]).hexdigest(),
+        "header": header,
+    }
+
+def write_prefix_cases(url, offset, cases):
+    # Written under a name of its own, before the state points at it, so a crash leaves the old prefix intact
+    TAIL_CASES_DIR.mkdir(parents=True, exist_ok=True)
+    path = TAIL_CASES_DIR / f"{Path(urlparse(url).path).stem}-{offset}.txt.gz"
+    tmp_path = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp_path, "wt", encoding="latin-1") as f:
+        f.writelines(f"{case}\n" for case in cases)
+    os.replace(tmp_path, path)
+    return path.name
+
+def set_tail(url, tail):
+    # Point the state at the new prefix, then drop the previous prefix's case numbers
+    previous = (load_state().get(url, {}).get("tail") or {}).get("cases")
+    entry = update_state(url, tail=tail)
+    if previous and previous != tail["cases"]:
+        (TAIL_CASES_DIR / previous).unlink(missing_ok=True)
+    return entry
+
+def prefix_cases(url):
+    # Every case number in the ingested prefix of `url`, kept or filtered out when it was loaded
+    tail = load_state().get(url, {}).get("tail") or {}
+    with gzip.open(TAIL_CASES_DIR / tail["cases"], "rt", encoding="latin-1") as f:
+        return {line.rstrip("\n") for line in f}
+
+def mark_loaded(url, path, cases, skip_lines=5):
+    # Record that the archived extract at `path` made it into the database; `cases` are the raw
+    # case numbers of its complete lines, which later tail fetches must not load again
+    path = Path(path)
+    size = path.stat().st_size
+
+    with open(path, "rb") as f:
+        header = b"".join(f.readline() for _ in range(skip_lines + 1)).splitlines()[-1]
+
+        # Only complete lines count as ingested; an unterminated last line is re-read by the next tail fetch
+        f.seek(max(size - TAIL_CHECK_BYTES, 0))
+        end = f.read()
+        offset = size - (len(end) - end.rfind(b"\n") - 1)
+
+        f.seek(max(offset - TAIL_CHECK_BYTES, 0))
+        prefix_end = f.read(offset - max(offset - TAIL_CHECK_BYTES, 0))
+
+    tail = tail_state(prefix_end, offset, header.decode("latin-1"))
+    tail["cases"] = write_prefix_cases(url, offset, cases)
+    update_state(url, loaded_sha256=path.stem)
+    set_tail(url, tail)
+
+def fetch_tail(url, timeout=60):
+    """
+    Fetch only the rows appended to the extract since the last ingested prefix.
+
+    Requests the new bytes with an HTTP Range that starts TAIL_CHECK_BYTES before the
+    stored offset, and checks those bytes against the stored checksum first. Edits made
+    in place earlier in the file are not detected here; the full refresh picks them up.
+
+    Returns (data, state) where `data` is the header line plus every complete new line,
+    and `state` goes to mark_tail_loaded() once those rows are in the database.
+    Returns None when a full download is needed instead.
+    """
+    tail = load_state().get(url, {}).get("tail")
+    if not tail or not (TAIL_CASES_DIR / tail.get("cases", "")).is_file():
+        print("↻ No ingested prefix recorded — full download needed")
+        return None
+
+    offset = tail["offset"]
+    window = min(TAIL_CHECK_BYTES, offset)
+    print(f"Fetching tail: {url} (from byte {offset:,})")
+
+    try:
+        r = requests.get(url, headers={"Range": f"bytes={offset - window}-"}, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"⚠ Tail fetch failed: {e}")
+        return None
+
+    if r.status_code != 206:
+        # 200 = server ignored the Range, 416 = the file shrank
+        print(f"↻ Server answered {r.status_code} to a Range request — full download needed")
+        return None
+
+    body = r.content
+    if hashlib.sha256(body[:window]).hexdigest() != tail["check_sha256"]:
+        print("↻ Ingested prefix no longer matches upstream — full download needed")
+        return None
+
+    new = body[window:]
+    new = new[: new.rfind(b"\n") + 1]
+    print(f"✓ {len(new):,} new bytes appended since last ingest")
+
+    data = tail["header"].encode("latin-1") + b"\n" + new
+    return data, tail_state(body[: window + len(new)], offset + len(new), tail["header"])
+
+def mark_tail_loaded(url, state, cases):
+    # The prefix now ends after the tail; its case numbers gain the tail's raw `cases`
+    cases = prefix_cases(url) | set(cases)
+    set_tail(url, {**state, "cases": write_prefix_cases(url, state["offset"], sorted(cases))})
@@ -0,0 +1,272 @@
+"""
+Embedded DuckDB storage backend.
+
+Same interface as PostgresStore, over one local file (DUCKDB_PATH), so development and
+test runs need no PostgreSQL server. houston_311 is a single wide table with the
+original columns, keyed by CASE NUMBER alone. DuckDB's columnar storage already
+dictionary-compresses the repeated text and keeps min/max zone maps per row group, so
+there are no dimension tables, partitions or indexes. A case whose CREATED DATE changes
+is updated in place, and retention is a DELETE.
+
+Changes are found in the engine by comparing incoming rows with the stored ones, so
+there is no row-hash side table, and full=True sends nothing extra.
+DuckDB locks the file for the process that opens it, and a writer excludes every other
+process. The writer (the refresh, the backfill) keeps one connection until close(). A
+read-only store (the app, precompute) opens the file for each read and closes it after,
+so it holds no lock between reads and a refresh can write the file while the app runs.
+Opening a file another process holds is retried for up to LOCK_WAIT seconds.
+"""
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from ingest.dimensions import DIMENSIONS, case_type_category
+from ingest.export import EXPORT_CSV, SNAPSHOT_DIR, export_snapshot
+from ingest.schema import COLUMNS, FACT_COLUMNS, retention_cutoff
+
+DUCKDB_PATH = Path(os.environ.get("DUCKDB_PATH", "data/houston_311.duckdb"))
+
+KEY = "CASE NUMBER"
+
+# Seconds to keep retrying a file locked by another process before giving up
+LOCK_WAIT = float(os.environ.get("DUCKDB_LOCK_WAIT", "30"))
+
+
+def connect(path, read_only=False, wait=LOCK_WAIT):
+    # duckdb.connect, retried while another process holds the file's lock
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            return duckdb.connect(str(path), read_only=read_only)
+        except duckdb.IOException as e:
+            if "lock" not in str(e).lower() or time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+
+def column_types():
+    # COLUMNS without the NOT NULLs; the key is declared separately
+    return {col: sql_type.replace(" NOT NULL", "") for col, sql_type in COLUMNS.items()}
+
+
+def copy_table_to_csv(table_name, con, output_path=EXPORT_CSV):
+    # Same file as the PostgreSQL COPY: gzip CSV with a header, nulls as empty fields
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    compression = "gzip" if output_path.suffix == ".gz" else "none"
+
+    con.execute(f"""
+        COPY (SELECT * FROM "{table_name}" ORDER BY "CREATED DATE")
+        TO '{tmp_path}' (FORMAT csv, HEADER, COMPRESSION {compression})
+    """)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def postgres_dtypes(df):
+    # Same dtypes as pd.read_sql gives for the PostgreSQL fact table
+    for col in ["CREATED DATE", "CLOSED DATE"]:
+        if col in df:
+            df[col] = df[col].astype("datetime64[ns]")
+    if "RESOLUTION_TIME_DAYS" in df:
+        df["RESOLUTION_TIME_DAYS"] = df["RESOLUTION_TIME_DAYS"].astype("float64")
+    return df
+
+
+class DuckDBStore:
+    name = "duckdb"
+
+    def __init__(self, path=DUCKDB_PATH, read_only=False):
+        self.path = Path(path)
+        self.read_only = read_only
+        self.con = None
+        if not read_only:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.con = connect(self.path)
+        self.lock = threading.Lock()
+
+    def reader(self):
+        # A connection for one read, closed by the caller: a cursor on the writer's connection,
+        # or for a read-only store a connection of its own, so no lock is held between reads
+        if self.read_only:
+            return connect(self.path, read_only=True)
+        with self.lock:
+            return self.con.cursor()
+
+    def ensure_table(self, table_name, today=None):
+        cols = ",\n".join(f'"{col}" {sql_type}' for col, sql_type in column_types().items())
+        with self.lock:
+            self.con.execute(f"""
+                CREATE TABLE IF NOT EXISTS "{table_name}" (
+                    {cols},
+                    PRIMARY KEY ("{KEY}")
+                )
+            """)
+        print(f"Schema up to date: {table_name} ({self.path})")
+
+    def drop_expired(self, table_name, today=None):
+        cutoff = retention_cutoff(today or date.today())
+        with self.lock:
+            dropped = self.con.execute(
+                f'DELETE FROM "{table_name}" WHERE "CREATED DATE" < ?', [cutoff]
+            ).fetchone()[0]
+        print(f"✓ Dropped {dropped:,} rows of {table_name} older than {cutoff:%Y-%m}")
+        return dropped
+
+    def load_changed_rows(self, df, table_name, full=False, changes=None):
+        types = column_types()
+        casts = ", ".join(f'CAST(i."{col}" AS {sql_type}) AS "{col}"' for col, sql_type in types.items())
+        value_cols = [col for col in types if col != KEY]
+        incoming = ", ".join(f'i."{col}"' for col in value_cols)
+        stored = ", ".join(f't."{col}"' for col in value_cols)
+
+        with self.lock:
+            con = self.con
+            con.register("incoming_frame", df[list(types)])
+            try:
+                con.execute("BEGIN TRANSACTION")
+                con.execute(f"""
+                    CREATE OR REPLACE TEMP TABLE incoming AS
+                    SELECT {casts} FROM incoming_frame i
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY i."{KEY}") = 1
+                """)
+                # New cases and cases whose stored row differs; identical rows are never rewritten
+                con.execute(f"""
+                    CREATE OR REPLACE TEMP TABLE changed AS
+                    SELECT i.*, t."{KEY}" IS NULL AS is_new
+                    FROM incoming i LEFT JOIN "{table_name}" t USING ("{KEY}")
+                    WHERE t."{KEY}" IS NULL OR ({incoming}) IS DISTINCT FROM ({stored})
+                """)
+                inserted, updated, staged = con.execute("""
+                    SELECT COUNT(*) FILTER (WHERE is_new), COUNT(*) FILTER (WHERE NOT is_new),
+                           (SELECT COUNT(*) FROM incoming)
+                    FROM changed
+                """).fetchone()
+                cols = ", ".join(f'"{col}"' for col in types)
+                if changes is not None:
+                    after = con.execute(f"SELECT {cols} FROM changed").df()
+                    before = con.execute(f"""
+                        SELECT t.* FROM "{table_name}" t JOIN changed c USING ("{KEY}") WHERE NOT c.is_new
+                    """).df()
+                con.execute(f'INSERT OR REPLACE INTO "{table_name}" ({cols}) SELECT {cols} FROM changed')
+                con.execute("DROP TABLE incoming")
+                con.execute("DROP TABLE changed")
+                con.execute("COMMIT")
+            except Exception:
+                con.execute("ROLLBACK")
+                raise
+            finally:
+                con.unregister("incoming_frame")
+
+        if changes is not None:
+            changes.add(table_name, after, before)
+        print(f"Merged {staged:,} rows into {table_name} ({self.path.name})")
+        return {"inserted": inserted, "updated": updated, "skipped": len(df) - inserted - updated}
+
+    def export_snapshot(self, table_name, csv_path=EXPORT_CSV, snapshot_dir=SNAPSHOT_DIR):
+        with self.lock:
+            return export_snapshot(table_name, self.con, csv_path, snapshot_dir, copy_csv=copy_table_to_csv)
+
+    def read_lookups(self, table_name):
+        # Same shape as PostgresStore: one lookup per dimension, numbered in name order.
+        # The numbering follows the rows at the time of the read; read_cases takes the lookups
+        # it should number keys by, so a write in between can't shift them.
+        con = self.reader()
+        try:
+            lookups = {}
+            for dim in DIMENSIONS:
+                lookup = con.execute(f"""
+                    SELECT DISTINCT "{dim}" AS "name" FROM "{table_name}"
+                    WHERE "{dim}" IS NOT NULL ORDER BY 1
+                """).df()
+                lookup.insert(0, "id", np.arange(1, len(lookup) + 1, dtype="int16"))
+                if dim == "CASE TYPE":
+                    lookup["category"] = lookup["name"].map(case_type_category)
+                lookups[dim] = lookup
+        finally:
+            con.close()
+        return lookups
+
+    def read_cases(self, table_name, columns=None, start=None, end=None, neighborhood_ids=None, chunksize=None,
+                   lookups=None):
+        # Fact rows with integer keys from `lookups` (default: read_lookups now), same filters as
+        # PostgresStore. Only the columns asked for are scanned, and dates skip row groups by zone map.
+        # With `chunksize`, an iterator of frames of up to that many rows, fetched as Arrow batches.
+        columns = list(columns or FACT_COLUMNS)
+        lookups = lookups or self.read_lookups(table_name)
+        dims = {key_col: dim for dim, (_, key_col) in DIMENSIONS.items()}
+
+        con = self.reader()
+        streamed = False
+        try:
+            select = []
+            joins = []
+            for col in columns:
+                if col not in dims:
+                    select.append(f'f."{col}"')
+                    continue
+                alias = f"d{len(joins)}"
+                con.register(f"lookup_{alias}", lookups[dims[col]])
+                select.append(f'CAST({alias}."id" AS SMALLINT) AS "{col}"')
+                joins.append(f'LEFT JOIN lookup_{alias} {alias} ON {alias}."name" = f."{dims[col]}"')
+
+            where = []
+            params = {}
+            if start is not None:
+                where.append('f."CREATED DATE" >= $start')
+                params["start"] = pd.Timestamp(start).to_pydatetime()
+            if end is not None:
+                where.append('f."CREATED DATE" < $end')
+                params["end"] = pd.Timestamp(end).to_pydatetime()
+            if neighborhood_ids is not None:
+                # Filtered by name, which is what the table stores
+                names = lookups["NEIGHBORHOOD"]
+                where.append('list_contains($neighborhoods, f."NEIGHBORHOOD")')
+                params["neighborhoods"] = names.loc[names["id"].isin(neighborhood_ids), "name"].tolist()
+
+            sql = f'SELECT {", ".join(select)} FROM "{table_name}" f {" ".join(joins)}'
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            if chunksize:
+                # The stream closes the connection once its batches are read
+                batches = con.execute(sql, params).fetch_record_batch(chunksize)
+                streamed = True
+                return self.stream_cases(con, batches)
+            return postgres_dtypes(con.execute(sql, params).df())
+        finally:
+            if not streamed:
+                con.close()
+
+    def stream_cases(self, con, batches):
+        # The connection is this read's alone, so batches are fetched outside the store's lock
+        try:
+            empty = True
+            for batch in batches:
+                empty = False
+                yield postgres_dtypes(batch.to_pandas())
+            if empty:
+                yield postgres_dtypes(batches.schema.empty_table().to_pandas())
+        finally:
+            con.close()
+
+    def cases_relation(self, table_name):
+        return f'"{table_name}"'
+
+    def query(self, sql):
+        con = self.reader()
+        try:
+            return con.execute(sql).df()
+        finally:
+            con.close()
+
+    def close(self):
+        if self.con is not None:
+            self.con.close()
+            self.con = None
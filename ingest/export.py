@@ -0,0 +1,155 @@
+"""
+Snapshot export of houston_311.
+
+The table is streamed out of PostgreSQL with COPY ... TO STDOUT into a gzip CSV, then
+re-read batch by batch into a Parquet dataset partitioned by year/month of CREATED DATE.
+It is read through houston_311_wide, which joins the dimension keys back to text, so
+the files keep the original column layout.
+A _manifest.json describes the files; the underscore keeps dataset discovery from
+reading it as data. Neither step holds the table in memory. The new dataset is written
+next to the old one and swapped in when complete, so readers never see a half-written
+snapshot.
+"""
+import gzip
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+
+EXPORT_CSV = Path("data/clean/Houston_311_Export.csv.gz")
+SNAPSHOT_DIR = Path("data/clean/houston_311_parquet")
+
+# Types for reading the COPY output back; anything not listed is inferred
+EXPORT_TYPES = {
+    "CASE NUMBER": pa.string(),
+    "NEIGHBORHOOD": pa.string(),
+    "DEPARTMENT": pa.string(),
+    "DIVISION": pa.string(),
+    "CASE TYPE": pa.string(),
+    "CATEGORY": pa.string(),
+    "CREATED DATE": pa.timestamp("us"),
+    "CLOSED DATE": pa.timestamp("us"),
+    "LATITUDE": pa.float64(),
+    "LONGITUDE": pa.float64(),
+    "RESOLUTION_TIME_DAYS": pa.int64(),
+}
+
+PARTITIONING = ds.partitioning(
+    pa.schema([("year", pa.int16()), ("month", pa.int8())]),
+    flavor="hive",
+)
+
+BLOCK_BYTES = 16 << 20  # 16 MB per record batch
+
+
+def copy_table_to_csv(table_name, engine, output_path=EXPORT_CSV):
+    # COPY streams rows straight from the server into the (optionally gzipped) file
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    opener = gzip.open if output_path.suffix == ".gz" else open
+
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        with opener(tmp_path, "wb") as f:
+            # The query form is required for partitioned tables and views
+            cursor.copy_expert(f'COPY (SELECT * FROM "{table_name}") TO STDOUT WITH (FORMAT csv, HEADER)', f)
+
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def with_partition_columns(batch):
+    created = batch.column("CREATED DATE")
+    return (
+        batch
+        .append_column("year", pc.cast(pc.year(created), pa.int16()))
+        .append_column("month", pc.cast(pc.month(created), pa.int8()))
+    )
+
+
+def write_parquet_snapshot(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    csv_path, snapshot_dir = Path(csv_path), Path(snapshot_dir)
+    tmp_dir = snapshot_dir.with_name(snapshot_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    reader = pv.open_csv(
+        pa.input_stream(str(csv_path)),  # gzip is detected from the extension
+        read_options=pv.ReadOptions(block_size=BLOCK_BYTES),
+        convert_options=pv.ConvertOptions(column_types=EXPORT_TYPES, strings_can_be_null=True),
+    )
+    schema = reader.schema.append(pa.field("year", pa.int16())).append(pa.field("month", pa.int8()))
+
+    written = []
+    ds.write_dataset(
+        (with_partition_columns(batch) for batch in reader),
+        tmp_dir,
+        schema=schema,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template="part-{i}.parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        file_visitor=lambda f: written.append(f),
+    )
+
+    files = []
+    for f in written:
+        rel = Path(f.path).relative_to(tmp_dir)
+        parts = dict(p.split("=", 1) for p in rel.parts[:-1])
+        files.append({
+            "path": rel.as_posix(),
+            "year": None if parts["year"] == "__HIVE_DEFAULT_PARTITION__" else int(parts["year"]),
+            "month": None if parts["month"] == "__HIVE_DEFAULT_PARTITION__" else int(parts["month"]),
+            "rows": f.metadata.num_rows,
+            "bytes": Path(f.path).stat().st_size,
+        })
+    files.sort(key=lambda f: (f["year"] or 0, f["month"] or 0, f["path"]))
+
+    manifest = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source_csv": csv_path.name,
+        "source_sha256": file_sha256(csv_path),
+        "rows": sum(f["rows"] for f in files),
+        "partitioning": ["year", "month"],
+        "schema": {field.name: str(field.type) for field in schema},
+        "files": files,
+    }
+    (tmp_dir / "_manifest.json").write_text(json.dumps(manifest, indent=2))
+
+    # Swap the finished snapshot into place
+    old_dir = snapshot_dir.with_name(snapshot_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if snapshot_dir.exists():
+        os.replace(snapshot_dir, old_dir)
+    os.replace(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return manifest
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_snapshot(table_name, engine, csv_path=EXPORT_CSV, snapshot_dir=SNAPSHOT_DIR, copy_csv=copy_table_to_csv):
+    # `copy_csv` writes the table to csv_path; the DuckDB backend passes its own
+    print(f"Exporting {table_name} → {csv_path}")
+    copy_csv(table_name, engine, csv_path)
+    print("✓ CSV export complete")
+
+    print(f"Writing Parquet snapshot → {snapshot_dir}")
+    manifest = write_parquet_snapshot(csv_path, snapshot_dir)
+    print(f"✓ Parquet snapshot complete ({manifest['rows']:,} rows in {len(manifest['files'])} files)")
+
+    return manifest
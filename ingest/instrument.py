@@ -0,0 +1,159 @@
+"""
+Per-stage instrumentation for a refresh run.
+
+A Run collects one record per (scope, stage): wall time, number of calls, rows in/out,
+bytes read or written, rows/sec, and peak RSS. A scope is a year being refreshed, or "all"
+for work done once per run. A streamed load adds to the same record once per chunk.
+When the run finishes, the records are appended to a JSON-lines log (REFRESH_RUN_LOG)
+and printed as a summary table, so slow nightly runs can be compared stage by stage.
+
+Peak RSS is the process high-water mark when the stage ends (ru_maxrss), or the largest
+child process for stages that run subprocesses (precompute).
+
+Each scope also keeps its span, from the start of its first stage to the end of its last.
+Years refreshed concurrently have overlapping spans; the summary reports how much
+shorter their union is than running them back to back.
+"""
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+RUN_LOG = Path(os.environ.get("REFRESH_RUN_LOG", "data/logs/refresh_runs.jsonl"))
+
+STAGE_ORDER = [
+    "download", "parse", "clean", "db_wait", "retention", "load", "export", "precompute",
+]
+
+
+def peak_rss_mb(children=False):
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    kb = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return round(kb / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Run:
+    def __init__(self, name="refresh", log_path=RUN_LOG):
+        self.name = name
+        self.log_path = Path(log_path)
+        self.run_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.start = time.perf_counter()
+        self.records = {}
+        self.spans = {}
+        self.lock = threading.Lock()
+
+    def scope(self, scope):
+        return Scope(self, scope)
+
+    def record(self, scope, stage):
+        with self.lock:
+            return self.records.setdefault((scope, stage), {
+                "scope": scope,
+                "stage": stage,
+                "calls": 0,
+                "wall_s": 0.0,
+                "rows_in": None,
+                "rows_out": None,
+                "bytes": None,
+                "peak_rss_mb": None,
+            })
+
+    def add(self, scope, stage, wall, counts, children=False, started=None):
+        # `started` is the stage's epoch start time (time.time()); without it the span is not extended
+        rec = self.record(scope, stage)
+        with self.lock:
+            if started is not None:
+                first, last = self.spans.get(scope, (started, started + wall))
+                self.spans[scope] = (min(first, started), max(last, started + wall))
+            rec["calls"] += 1
+            rec["wall_s"] += wall
+            for key in ["rows_in", "rows_out", "bytes"]:
+                if counts.get(key) is not None:
+                    rec[key] = (rec[key] or 0) + int(counts[key])
+            rec["peak_rss_mb"] = max(rec["peak_rss_mb"] or 0, peak_rss_mb(children))
+
+    def summary(self):
+        # One dict per (scope, stage), in pipeline order, with rows/sec filled in
+        order = {stage: i for i, stage in enumerate(STAGE_ORDER)}
+        out = []
+        for rec in self.records.values():
+            rows_done = rec["rows_in"] if rec["rows_in"] is not None else rec["rows_out"]
+            out.append({
+                **rec,
+                "wall_s": round(rec["wall_s"], 2),
+                "rows_per_s": round(rows_done / rec["wall_s"]) if rows_done and rec["wall_s"] > 0 else None,
+            })
+        return sorted(out, key=lambda rec: (rec["scope"], order.get(rec["stage"], len(order))))
+
+    def overlap(self):
+        # (back to back, concurrent) seconds over the per-year scopes, or None with fewer than two
+        spans = sorted(span for scope, span in self.spans.items() if scope != "all")
+        if len(spans) < 2:
+            return None
+        sequential = sum(last - first for first, last in spans)
+        union, end = 0.0, float("-inf")
+        for first, last in spans:
+            union += max(last - max(first, end), 0)
+            end = max(end, last)
+        return sequential, union
+
+    def table(self):
+        table = pd.DataFrame(self.summary())
+        for col in ["rows_in", "rows_out", "bytes", "rows_per_s"]:
+            if col in table:
+                table[col] = table[col].astype("Int64")
+        return table
+
+    def finish(self):
+        # Append this run's records to the JSON-lines log and print the summary
+        wall = time.perf_counter() - self.start
+        table = self.table()
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, "a") as f:
+            for rec in self.summary():
+                line = {"run_id": self.run_id, "run": self.name, "started_at": self.started_at, **rec}
+                f.write(json.dumps(line) + "\n")
+            f.write(json.dumps({
+                "run_id": self.run_id, "run": self.name, "started_at": self.started_at,
+                "scope": "all", "stage": "total", "wall_s": round(wall, 2), "peak_rss_mb": peak_rss_mb(),
+            }) + "\n")
+
+        print(f"\n⏱  Stage summary for run {self.run_id}")
+        if not table.empty:
+            print(table.astype(object).where(table.notna(), "").to_string(index=False))
+
+        print(f"Wall time {wall:.1f}s")
+        overlap = self.overlap()
+        if overlap is not None:
+            # Years refreshed concurrently; compare against running them back to back
+            sequential, union = overlap
+            print(f"Years took {union:.1f}s vs {sequential:.1f}s back to back → overlap saved {sequential - union:.1f}s")
+        print(f"✓ Run log appended to {self.log_path}")
+        return table
+
+
+class Scope:
+    def __init__(self, run, scope):
+        self.run = run
+        self.scope = scope
+
+    @contextmanager
+    def stage(self, stage, children=False, **counts):
+        # Yields a dict; set rows_in / rows_out / bytes on it inside the block
+        counts = dict(counts)
+        started, start = time.time(), time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self.run.add(self.scope, stage, time.perf_counter() - start, counts, children, started)
@@ -0,0 +1,271 @@
+"""
+PostgreSQL storage backend.
+
+houston_311 is the partitioned star-schema fact table from ingest.schema. Each cleaned
+row's content hash is kept in a side table, so a refresh only sends new or changed cases,
+and they are merged with a COPY into a staging table plus a set-based upsert.
+"""
+import io
+from contextlib import nullcontext
+
+import pandas as pd
+from sqlalchemy import text
+
+from ingest.dimensions import read_dimensions, to_fact
+from ingest.export import EXPORT_CSV, SNAPSHOT_DIR, export_snapshot
+from ingest.schema import (
+    COLUMNS, PRIMARY_KEY, drop_expired_partitions, ensure_partitions, ensure_table, hash_table_name,
+    months_in, wide_view_name,
+)
+
+# Columns that make up a row's content hash (everything except the key)
+HASH_COLS = [col for col in COLUMNS if col != "CASE NUMBER"]
+
+
+def bulk_upsert(df, table_name, engine, key=PRIMARY_KEY, returning=False, conn=None):
+    # COPY the frame into a temp staging table, then merge it with one set-based upsert on `key`.
+    # Conflicting rows are only rewritten when a column actually differs, so unchanged rows
+    # cost no dead tuples or WAL. Returns {"inserted", "updated", "unchanged"} row counts, plus
+    # "written" (the keys actually inserted or updated, as a DataFrame) when `returning` is set.
+    # Runs in its own transaction, or in the caller's when given `conn`.
+    print(f"Bulk upserting {len(df):,} rows into {table_name}...")
+    if df.empty:
+        written = {"written": pd.DataFrame(columns=list(key))} if returning else {}
+        return {"inserted": 0, "updated": 0, "unchanged": 0, **written}
+
+    cols = ", ".join(f'"{col}"' for col in df.columns)
+    key_cols = ", ".join(f'"{col}"' for col in key)
+    value_cols = [col for col in df.columns if col not in key]
+    update_set = ", ".join(f'"{col}" = EXCLUDED."{col}"' for col in value_cols)
+    stored = ", ".join(f't."{col}"' for col in value_cols)
+    excluded = ", ".join(f'EXCLUDED."{col}"' for col in value_cols)
+    stage_table = f"{table_name}_stage"
+    returned = f"RETURNING {key_cols}" if returning else ""
+    rows = []
+
+    # Nulls are written as empty unquoted fields, which COPY reads back as NULL
+    buf = io.StringIO()
+    df.to_csv(buf, index=False, header=False)
+    buf.seek(0)
+
+    with nullcontext(conn) if conn is not None else engine.begin() as conn:
+        cursor = conn.connection.cursor()
+        cursor.execute(f"""
+            CREATE TEMP TABLE {stage_table}
+            (LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP
+        """)
+        cursor.copy_expert(f"COPY {stage_table} ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+        # New keys first, then changed rows. The rows just inserted match exactly and are left
+        # alone by the second pass. (RETURNING xmax can't tell the two apart on a partitioned table.)
+        cursor.execute(f"""
+            INSERT INTO {table_name} ({cols})
+            SELECT DISTINCT ON ({key_cols}) {cols} FROM {stage_table}
+            ON CONFLICT ({key_cols}) DO NOTHING
+            {returned}
+        """)
+        inserted = cursor.rowcount
+        if returning:
+            rows += cursor.fetchall()
+        cursor.execute(f"""
+            INSERT INTO {table_name} AS t ({cols})
+            SELECT DISTINCT ON ({key_cols}) {cols} FROM {stage_table}
+            ON CONFLICT ({key_cols}) DO UPDATE SET {update_set}
+            WHERE ({stored}) IS DISTINCT FROM ({excluded})
+            {returned}
+        """)
+        updated = cursor.rowcount
+        if returning:
+            rows += cursor.fetchall()
+
+    staged = len(df.drop_duplicates(subset=list(key)))
+    counts = {"inserted": inserted, "updated": updated, "unchanged": staged - inserted - updated}
+    if returning:
+        counts["written"] = pd.DataFrame(rows, columns=list(key))
+    return counts
+
+
+def row_hashes(df) -> pd.Series:
+    # Stable 64-bit hash of each row's business columns; expects a frame from prepare_for_load
+    parts = {}
+    for col in HASH_COLS:
+        values = df[col]
+        if col in ["CREATED DATE", "CLOSED DATE"]:
+            values = pd.to_datetime(values, errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+        parts[col] = values.astype("string").fillna("")
+
+    hashed = pd.util.hash_pandas_object(pd.DataFrame(parts, index=df.index), index=False)
+    return pd.Series(hashed.to_numpy().view("int64"), index=df.index)
+
+
+def read_stored_rows(table_name, engine, keys):
+    # The stored rows (text columns, from the wide view) at these CASE NUMBER / CREATED DATE keys
+    with engine.connect() as conn:
+        return pd.read_sql(
+            text(f"""
+                SELECT w.* FROM UNNEST(CAST(:cases AS TEXT[]), CAST(:created AS TIMESTAMP[])) AS k(c, d)
+                JOIN {wide_view_name(table_name)} w ON w."CASE NUMBER" = k.c AND w."CREATED DATE" = k.d
+            """),
+            conn,
+            params={
+                "cases": keys.index.tolist(),
+                "created": [ts.to_pydatetime() for ts in pd.to_datetime(keys["CREATED DATE"])],
+            },
+        )
+
+
+def load_changed_rows(df, table_name, engine, full=False, changes=None):
+    # Only send rows that are new or whose content hash moved since the last refresh.
+    # With a ChangeFeed, the rows actually written are recorded with the stored rows they replaced.
+    hashes = row_hashes(df)
+    cases = df["CASE NUMBER"]
+
+    with engine.connect() as conn:
+        stored = pd.read_sql(
+            text(f"""
+                SELECT "CASE NUMBER", "ROW_HASH", "CREATED DATE" FROM {hash_table_name(table_name)}
+                WHERE "CASE NUMBER" = ANY(:cases)
+            """),
+            conn,
+            params={"cases": cases.tolist()},
+        ).set_index("CASE NUMBER")
+
+    # A case whose CREATED DATE changed lives under a different primary key (and partition);
+    # its old row is removed before the new one is written
+    known_created = pd.to_datetime(stored["CREATED DATE"]).reindex(cases)
+    new_created = pd.to_datetime(df["CREATED DATE"])
+    moved = known_created.notna().to_numpy() & (known_created.to_numpy() != new_created.to_numpy())
+    moved = pd.DataFrame({"case": cases[moved], "created": known_created[moved].to_numpy()})
+
+    known = stored
+    if full:
+        stored = stored.iloc[0:0]
+
+    is_known = cases.isin(stored.index)
+    is_changed = pd.Series(False, index=df.index)
+    is_changed[is_known] = stored["ROW_HASH"].reindex(cases[is_known]).to_numpy() != hashes[is_known].to_numpy()
+
+    send = ~is_known | is_changed
+
+    # Inserted/updated are what the database actually wrote; rows sent but found identical
+    # (e.g. on a full reload) count as skipped along with the hash matches
+    counts = {"inserted": 0, "updated": 0, "skipped": int((~send).sum())}
+
+    if send.any():
+        if changes is not None:
+            # Read before anything is written: the old row of a moved case is deleted below
+            before = read_stored_rows(table_name, engine, known[known.index.isin(cases[send])])
+
+        # One transaction: a moved case's old row is only gone once its new row is written
+        with engine.begin() as conn:
+            # New dimension values get their keys before the fact rows that use them
+            fact = to_fact(df[send], conn)
+            ensure_partitions(conn, table_name, months_in(df.loc[send, "CREATED DATE"]))
+            removed = 0
+            if not moved.empty:
+                removed = conn.execute(
+                    text(f"""
+                        DELETE FROM {table_name} t
+                        USING UNNEST(CAST(:cases AS TEXT[]), CAST(:created AS TIMESTAMP[])) AS m(c, d)
+                        WHERE t."CASE NUMBER" = m.c AND t."CREATED DATE" = m.d
+                    """),
+                    {"cases": moved["case"].tolist(), "created": [ts.to_pydatetime() for ts in moved["created"]]},
+                ).rowcount
+
+            written = bulk_upsert(fact, table_name, engine, returning=changes is not None, conn=conn)
+
+            bulk_upsert(
+                pd.DataFrame({
+                    "CASE NUMBER": cases[send],
+                    "ROW_HASH": hashes[send],
+                    "CREATED DATE": df.loc[send, "CREATED DATE"],
+                }),
+                hash_table_name(table_name),
+                engine,
+                key=["CASE NUMBER"],
+                conn=conn,
+            )
+
+        # A moved case is written under a new key, but it is the same case edited: an update,
+        # as the DuckDB store and the change feed count it
+        counts["inserted"] = written["inserted"] - removed
+        counts["updated"] = written["updated"] + removed
+        counts["skipped"] += written["unchanged"]
+
+        if changes is not None:
+            written_cases = written["written"]["CASE NUMBER"]
+            changes.add(
+                table_name,
+                df[send & cases.isin(written_cases)],
+                before[before["CASE NUMBER"].isin(written_cases)],
+            )
+
+    return counts
+
+
+class PostgresStore:
+    name = "postgres"
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def ensure_table(self, table_name, today=None):
+        ensure_table(table_name, self.engine, today)
+
+    def drop_expired(self, table_name, today=None):
+        return drop_expired_partitions(table_name, self.engine, today)
+
+    def load_changed_rows(self, df, table_name, full=False, changes=None):
+        return load_changed_rows(df, table_name, self.engine, full, changes)
+
+    def export_snapshot(self, table_name, csv_path=EXPORT_CSV, snapshot_dir=SNAPSHOT_DIR):
+        return export_snapshot(wide_view_name(table_name), self.engine, csv_path, snapshot_dir)
+
+    def read_cases(self, table_name, columns=None, start=None, end=None, neighborhood_ids=None, chunksize=None,
+                   lookups=None):
+        # Fact rows with their dimension keys: only `columns`, only cases created in [start, end)
+        # and in `neighborhood_ids`. The filters prune partitions and use the fact table indexes.
+        # With `chunksize`, an iterator of frames of that many rows read through a server-side cursor.
+        # The keys are stored ones, so `lookups` is not needed here.
+        select = ", ".join(f'"{col}"' for col in columns) if columns else "*"
+        where = []
+        params = {}
+        if start is not None:
+            where.append('"CREATED DATE" >= :start')
+            params["start"] = pd.Timestamp(start).to_pydatetime()
+        if end is not None:
+            where.append('"CREATED DATE" < :end')
+            params["end"] = pd.Timestamp(end).to_pydatetime()
+        if neighborhood_ids is not None:
+            where.append('"NEIGHBORHOOD_ID" = ANY(:neighborhood_ids)')
+            params["neighborhood_ids"] = [int(i) for i in neighborhood_ids]
+
+        sql = f"SELECT {select} FROM {table_name}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if chunksize:
+            return self.stream_cases(text(sql), params, chunksize)
+        with self.engine.connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+    def stream_cases(self, sql, params, chunksize):
+        # stream_results: the server keeps the result and the driver holds one chunk at a time,
+        # instead of every row as Python objects before the first frame is built
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+            yield from pd.read_sql(sql, conn, params=params, chunksize=chunksize)
+
+    def read_lookups(self, table_name):
+        # {text column: dimension lookup}; the dimensions are shared by every fact table
+        with self.engine.connect() as conn:
+            return read_dimensions(conn)
+
+    def cases_relation(self, table_name):
+        # Relation with the text columns, for aggregations run in the database
+        return wide_view_name(table_name)
+
+    def query(self, sql):
+        with self.engine.connect() as conn:
+            return pd.read_sql(text(sql), conn)
+
+    def close(self):
+        self.engine.dispose()
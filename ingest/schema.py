@@ -0,0 +1,483 @@
+"""
+DDL for houston_311.
+
+houston_311 is range-partitioned by month on CREATED DATE, one child table per month
+(houston_311_YYYY_MM). Partitions are created for every month a load touches and for
+FUTURE_MONTHS months ahead. The rolling retention window is enforced by detaching and
+dropping whole partitions instead of deleting rows. Queries bounded on CREATED DATE only
+scan the partitions they need.
+
+The classification columns are stored as SMALLINT keys into shared dimension tables
+(ingest.dimensions); {table}_wide joins them back to text in the original column order.
+
+PostgreSQL requires the partition key in every unique constraint, so the primary key is
+("CASE NUMBER", "CREATED DATE") and upserts conflict on that pair.
+
+Schema changes are numbered MIGRATIONS. Each one runs once per table and is recorded in
+schema_migrations, so ensure_table() is cheap to call on every refresh.
+`python -m ingest.schema` EXPLAINs the queries the loaders run and reports whether each
+one uses the index meant for it.
+"""
+import argparse
+import json
+import os
+from datetime import date
+
+import pandas as pd
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+from ingest.dimensions import DIMENSIONS, UNKNOWN_CATEGORY, create_dimension_tables, sync_dimension
+
+# Layout created by 001; the export still reads it back through {table}_wide
+COLUMNS = {
+    "CASE NUMBER": "TEXT NOT NULL",
+    "NEIGHBORHOOD": "TEXT",
+    "DEPARTMENT": "TEXT",
+    "DIVISION": "TEXT",
+    "CASE TYPE": "TEXT",
+    "CREATED DATE": "TIMESTAMP NOT NULL",
+    "CLOSED DATE": "TIMESTAMP",
+    "LATITUDE": "DOUBLE PRECISION",
+    "LONGITUDE": "DOUBLE PRECISION",
+    "CATEGORY": "TEXT",
+    "RESOLUTION_TIME_DAYS": "BIGINT",
+}
+
+# Layout of the fact table since 004: the text dimensions are SMALLINT keys into ingest.dimensions
+FACT_COLUMNS = {
+    "CASE NUMBER": "TEXT NOT NULL",
+    "NEIGHBORHOOD_ID": "SMALLINT",
+    "DEPARTMENT_ID": "SMALLINT",
+    "DIVISION_ID": "SMALLINT",
+    "CASE_TYPE_ID": "SMALLINT",
+    "CREATED DATE": "TIMESTAMP NOT NULL",
+    "CLOSED DATE": "TIMESTAMP",
+    "LATITUDE": "DOUBLE PRECISION",
+    "LONGITUDE": "DOUBLE PRECISION",
+    "RESOLUTION_TIME_DAYS": "BIGINT",
+}
+
+PRIMARY_KEY = ["CASE NUMBER", "CREATED DATE"]
+PARTITION_COL = "CREATED DATE"
+
+RETENTION_YEARS = 9
+
+# Months of empty partitions kept ready past the current month
+FUTURE_MONTHS = int(os.environ.get("SCHEMA_FUTURE_MONTHS", "3"))
+
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+def hash_table_name(table_name):
+    return f"{table_name}_row_hashes"
+
+
+def wide_view_name(table_name):
+    return f"{table_name}_wide"
+
+
+def partition_name(table_name, month):
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def add_months(month, n):
+    total = month.year * 12 + month.month - 1 + n
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def retention_cutoff(today=None):
+    # Same boundary as DATE_TRUNC('month', NOW() - INTERVAL '9 years')
+    today = today or date.today()
+    return date(today.year - RETENTION_YEARS, today.month, 1)
+
+
+def months_in(dates):
+    periods = pd.to_datetime(pd.Series(dates), errors="coerce").dropna().dt.to_period("M").unique()
+    return sorted(date(p.year, p.month, 1) for p in periods)
+
+
+def relkind(conn, table_name):
+    # 'p' = partitioned table, 'r' = plain table, None = missing
+    return conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table_name},
+    ).scalar()
+
+
+def list_partitions(conn, table_name):
+    rows = conn.execute(text("""
+        SELECT c.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(:table)
+    """), {"table": table_name})
+    return sorted(row[0] for row in rows)
+
+
+def create_partitioned_table(conn, table_name, columns=COLUMNS):
+    cols = ",\n".join(f'"{col}" {sql_type}' for col, sql_type in columns.items())
+    key = ", ".join(f'"{col}"' for col in PRIMARY_KEY)
+    conn.execute(text(f"""
+        CREATE TABLE {table_name} (
+            {cols},
+            PRIMARY KEY ({key})
+        ) PARTITION BY RANGE ("{PARTITION_COL}")
+    """))
+
+
+def ensure_partitions(conn, table_name, months):
+    existing = set(list_partitions(conn, table_name))
+    created = 0
+    for month in sorted(set(months)):
+        name = partition_name(table_name, month)
+        if name in existing:
+            continue
+        conn.execute(text(f"""
+            CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table_name}
+            FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')
+        """))
+        created += 1
+    return created
+
+
+def migrate_heap_table(conn, table_name):
+    # One-time move of a plain (pre-partitioning) houston_311 into the partitioned layout
+    legacy = f"{table_name}_legacy"
+    print(f"Migrating {table_name} to a month-partitioned table...")
+    conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+    create_partitioned_table(conn, table_name)
+
+    months = conn.execute(text(f"""
+        SELECT DISTINCT DATE_TRUNC('month', "{PARTITION_COL}")::date FROM {legacy}
+        WHERE "{PARTITION_COL}" IS NOT NULL
+    """)).scalars().all()
+    ensure_partitions(conn, table_name, months)
+
+    cols = ", ".join(f'"{col}"' for col in COLUMNS)
+    moved = conn.execute(text(f"""
+        INSERT INTO {table_name} ({cols})
+        SELECT DISTINCT ON ("CASE NUMBER") {cols} FROM {legacy}
+        WHERE "{PARTITION_COL}" IS NOT NULL
+        ORDER BY "CASE NUMBER", "{PARTITION_COL}" DESC
+    """)).rowcount
+    dropped = conn.execute(text(f"SELECT COUNT(*) FROM {legacy}")).scalar() - moved
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    print(f"✓ Moved {moved:,} rows into {len(months)} monthly partitions ({dropped:,} without a created date or duplicated dropped)")
+
+
+def create_table(conn, table_name):
+    kind = relkind(conn, table_name)
+    if kind is None:
+        print(f"Creating partitioned table: {table_name}")
+        create_partitioned_table(conn, table_name)
+    elif kind == "r":
+        migrate_heap_table(conn, table_name)
+
+
+def create_hash_table(conn, table_name):
+    # Content hash of each loaded row, keyed by case number alone
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {hash_table_name(table_name)} (
+            "CASE NUMBER" TEXT PRIMARY KEY,
+            "ROW_HASH" BIGINT NOT NULL,
+            "CREATED DATE" TIMESTAMP
+        )
+    """))
+    conn.execute(text(f"""
+        CREATE INDEX IF NOT EXISTS {hash_table_name(table_name)}_created_idx
+        ON {hash_table_name(table_name)} ("CREATED DATE")
+    """))
+
+
+def create_indexes(conn, table_name, definitions=None):
+    # Created on the parent, so every existing and future partition gets its own copy.
+    # Monthly partitions are small, so BRIN summarizes 16 pages per range instead of 128.
+    definitions = definitions or index_definitions(table_name)
+    for name, definition in definitions.items():
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} {definition}"))
+
+
+def index_definitions(table_name):
+    return {
+        f"{table_name}_created_brin": 'USING BRIN ("CREATED DATE") WITH (pages_per_range = 16)',
+        f"{table_name}_neighborhood_created_idx": '("NEIGHBORHOOD", "CREATED DATE")',
+        f"{table_name}_category_created_idx": '("CATEGORY", "CREATED DATE")',
+    }
+
+
+def fact_index_definitions(table_name):
+    # Category filters become CASE_TYPE_ID = ANY(the category's case types)
+    return {
+        f"{table_name}_created_brin": 'USING BRIN ("CREATED DATE") WITH (pages_per_range = 16)',
+        f"{table_name}_neighborhood_id_created_idx": '("NEIGHBORHOOD_ID", "CREATED DATE")',
+        f"{table_name}_case_type_id_created_idx": '("CASE_TYPE_ID", "CREATED DATE")',
+    }
+
+
+def create_wide_view(conn, table_name):
+    # The fact table with its keys joined back to text, in the original column order
+    aliases = {column: f"d{i}" for i, column in enumerate(DIMENSIONS)}
+    select = []
+    for col in COLUMNS:
+        if col in DIMENSIONS:
+            select.append(f'{aliases[col]}."name" AS "{col}"')
+        elif col == "CATEGORY":
+            select.append(f'COALESCE({aliases["CASE TYPE"]}."category", \'{UNKNOWN_CATEGORY}\') AS "CATEGORY"')
+        else:
+            select.append(f'f."{col}"')
+    joins = "\n".join(
+        f'LEFT JOIN {dim_table} {aliases[col]} ON {aliases[col]}."id" = f."{key_col}"'
+        for col, (dim_table, key_col) in DIMENSIONS.items()
+    )
+    conn.execute(text(f"""
+        CREATE OR REPLACE VIEW {wide_view_name(table_name)} AS
+        SELECT {", ".join(select)}
+        FROM {table_name} f
+        {joins}
+    """))
+
+
+def create_star_schema(conn, table_name):
+    # Rebuild the fact table with SMALLINT dimension keys in place of the repeated text.
+    # The old table and its partitions are parked in a scratch schema, which frees their
+    # table, index and partition names, and are copied over in one pass, in created-date
+    # order so the BRIN ranges stay tight.
+    create_dimension_tables(conn)
+    for column in DIMENSIONS:
+        values = conn.execute(text(f'SELECT DISTINCT "{column}" FROM {table_name}')).scalars().all()
+        sync_dimension(conn, column, values)
+
+    old_schema = f"{table_name}_prestar"
+    conn.execute(text(f"CREATE SCHEMA {old_schema}"))
+    for name in list_partitions(conn, table_name) + [table_name]:
+        conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {old_schema}"))
+
+    create_partitioned_table(conn, table_name, FACT_COLUMNS)
+    months = conn.execute(text(f"""
+        SELECT DISTINCT DATE_TRUNC('month', "{PARTITION_COL}")::date FROM {old_schema}.{table_name}
+    """)).scalars().all()
+    ensure_partitions(conn, table_name, months)
+
+    keys = {key_col: (col, dim_table) for col, (dim_table, key_col) in DIMENSIONS.items()}
+    select = []
+    joins = []
+    for col in FACT_COLUMNS:
+        if col in keys:
+            column, dim_table = keys[col]
+            alias = f"d{len(joins)}"
+            select.append(f'{alias}."id"')
+            joins.append(f'LEFT JOIN {dim_table} {alias} ON {alias}."name" = f."{column}"')
+        else:
+            select.append(f'f."{col}"')
+    cols = ", ".join(f'"{col}"' for col in FACT_COLUMNS)
+    moved = conn.execute(text(f"""
+        INSERT INTO {table_name} ({cols})
+        SELECT {", ".join(select)} FROM {old_schema}.{table_name} f
+        {" ".join(joins)}
+        ORDER BY f."{PARTITION_COL}"
+    """)).rowcount
+    conn.execute(text(f"DROP SCHEMA {old_schema} CASCADE"))
+
+    create_indexes(conn, table_name, fact_index_definitions(table_name))
+    create_wide_view(conn, table_name)
+    print(f"✓ Rewrote {moved:,} rows of {table_name} with integer dimension keys")
+
+
+# Applied in order, once per table; append new steps, never edit or renumber applied ones
+MIGRATIONS = [
+    ("001_partitioned_table", create_table),
+    ("002_row_hashes", create_hash_table),
+    ("003_indexes", create_indexes),
+    ("004_star_schema", create_star_schema),
+]
+
+
+def applied_migrations(conn, table_name):
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} (
+            "table_name" TEXT NOT NULL,
+            "version" TEXT NOT NULL,
+            "applied_at" TIMESTAMP NOT NULL DEFAULT NOW(),
+            PRIMARY KEY ("table_name", "version")
+        )
+    """))
+    return set(conn.execute(
+        text(f'SELECT "version" FROM {MIGRATIONS_TABLE} WHERE "table_name" = :table'),
+        {"table": table_name},
+    ).scalars())
+
+
+def ensure_table(table_name, engine, today=None):
+    # Idempotent: apply pending migrations and keep partitions ready ahead of time
+    today = today or date.today()
+    with engine.begin() as conn:
+        # Concurrent refreshes wait here instead of racing through the same DDL
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": table_name})
+
+        done = applied_migrations(conn, table_name)
+        pending = [(version, step) for version, step in MIGRATIONS if version not in done]
+        for version, step in pending:
+            print(f"Applying migration {version} to {table_name}")
+            step(conn, table_name)
+            conn.execute(
+                text(f'INSERT INTO {MIGRATIONS_TABLE} ("table_name", "version") VALUES (:table, :version)'),
+                {"table": table_name, "version": version},
+            )
+        if not pending:
+            print(f"Schema up to date: {table_name}")
+
+        this_month = date(today.year, today.month, 1)
+        ensure_partitions(conn, table_name, [add_months(this_month, n) for n in range(FUTURE_MONTHS + 1)])
+
+
+def drop_expired_partitions(table_name, engine, today=None):
+    cutoff = retention_cutoff(today)
+    prefix = f"{table_name}_"
+    with engine.begin() as conn:
+        expired = []
+        for name in list_partitions(conn, table_name):
+            suffix = name[len(prefix):]
+            year, _, month = suffix.partition("_")
+            if name.startswith(prefix) and year.isdigit() and month.isdigit() \
+                    and date(int(year), int(month), 1) < cutoff:
+                expired.append(name)
+
+        for name in expired:
+            conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+            conn.execute(text(f"DROP TABLE {name}"))
+
+        # The hash side table is keyed by case number only, so it keeps an indexed delete
+        result = conn.execute(text(f"""
+            DELETE FROM {hash_table_name(table_name)}
+            WHERE "CREATED DATE" < :cutoff
+        """), {"cutoff": cutoff})
+
+    print(
+        f"✓ Dropped {len(expired)} monthly partitions of {table_name} older than {cutoff:%Y-%m} "
+        f"and {result.rowcount} matching rows from {hash_table_name(table_name)}"
+    )
+    return expired
+
+
+# QUERY PLAN CHECK
+
+def loader_queries(table_name):
+    # Representative loader/precompute queries and the indexes that may serve each one.
+    # A bare date range is fine on any index that covers CREATED DATE: BRIN wins on large,
+    # date-ordered partitions, while the planner often prefers a btree on small ones.
+    return [
+        (
+            "upsert conflict / moved-case lookup",
+            f'SELECT * FROM {table_name} WHERE "CASE NUMBER" = :case AND "CREATED DATE" = :created',
+            [f"{table_name}_pkey"],
+        ),
+        (
+            "date range",
+            f'SELECT * FROM {table_name} WHERE "CREATED DATE" >= :created AND "CREATED DATE" < :created + INTERVAL \'1 day\'',
+            [
+                f"{table_name}_created_brin",
+                f"{table_name}_pkey",
+                f"{table_name}_neighborhood_id_created_idx",
+                f"{table_name}_case_type_id_created_idx",
+            ],
+        ),
+        (
+            "neighborhood over a date range",
+            f'SELECT * FROM {table_name} WHERE "NEIGHBORHOOD_ID" = :neighborhood_id AND "CREATED DATE" >= :created',
+            [f"{table_name}_neighborhood_id_created_idx"],
+        ),
+        (
+            "category over a date range",
+            f'SELECT * FROM {table_name} WHERE "CASE_TYPE_ID" = ANY(:case_type_ids) AND "CREATED DATE" >= :created',
+            [f"{table_name}_case_type_id_created_idx"],
+        ),
+    ]
+
+
+def plan_indexes(plan):
+    # Every "Index Name" in an EXPLAIN (FORMAT JSON) plan tree
+    found = [plan["Index Name"]] if "Index Name" in plan else []
+    for child in plan.get("Plans", []):
+        found += plan_indexes(child)
+    return found
+
+
+def parent_indexes(conn, names):
+    # Map partition-level index names back to the index created on the parent table
+    rows = conn.execute(text("""
+        SELECT c.relname, p.relname FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE c.relname = ANY(:names)
+    """), {"names": list(names)})
+    parents = dict(rows.all())
+    return {parents.get(name, name) for name in names}
+
+
+def check_indexes(table_name, engine):
+    # EXPLAIN each loader query with values sampled from the table; False if any skips its index
+    with engine.connect() as conn:
+        conn.execute(text(f"ANALYZE {table_name}"))
+        # Sampled from the fullest partition: the newest month may hold only a few days of rows,
+        # and the planner rightly scans such a partition, whatever the day of the month
+        fullest = conn.execute(text("""
+            SELECT c.oid::regclass::text FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            ORDER BY c.reltuples DESC LIMIT 1
+        """), {"table": table_name}).scalar() or table_name
+        sample = conn.execute(text(f"""
+            SELECT "CASE NUMBER", "CREATED DATE", "NEIGHBORHOOD_ID", "CASE_TYPE_ID" FROM {fullest}
+            WHERE "NEIGHBORHOOD_ID" IS NOT NULL AND "CASE_TYPE_ID" IS NOT NULL
+            ORDER BY "CREATED DATE" DESC LIMIT 1
+        """)).first()
+        if sample is None:
+            print(f"⚠ {table_name} is empty — nothing to check")
+            return False
+
+        # A category filter is resolved to its case-type keys first, as the loaders do
+        case_type_table = DIMENSIONS["CASE TYPE"][0]
+        case_type_ids = conn.execute(text(f"""
+            SELECT "id" FROM {case_type_table}
+            WHERE "category" = (SELECT "category" FROM {case_type_table} WHERE "id" = :id)
+        """), {"id": sample[3]}).scalars().all()
+
+        params = {
+            "case": sample[0],
+            "created": sample[1],
+            "neighborhood_id": sample[2],
+            "case_type_ids": case_type_ids,
+        }
+
+        results = []
+        for label, query, expected in loader_queries(table_name):
+            plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), params).scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            used = parent_indexes(conn, plan_indexes(plan[0]["Plan"]))
+            results.append({
+                "query": label,
+                "expected": " | ".join(expected),
+                "used": ", ".join(sorted(used)) or "(sequential scan)",
+                "ok": bool(used & set(expected)),
+            })
+
+    out = pd.DataFrame(results)
+    print(out.to_string(index=False))
+    if out["ok"].all():
+        print("✓ Every loader query uses its index")
+    else:
+        print("⚠ Some loader queries do not use their index")
+    return bool(out["ok"].all())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", default="houston_311")
+    parser.add_argument("--migrate", action="store_true", help="Apply pending migrations before checking")
+    args = parser.parse_args()
+
+    load_dotenv()
+    engine = create_engine(os.environ["DATABASE_URL"])
+    if args.migrate:
+        ensure_table(args.table, engine)
+    raise SystemExit(0 if check_indexes(args.table, engine) else 1)
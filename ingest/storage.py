@@ -0,0 +1,52 @@
+"""
+Storage backends for houston_311.
+
+The refresh, the backfill and the app's data loader talk to storage through one
+interface, implemented by PostgresStore (ingest.postgres_store) and DuckDBStore
+(ingest.duckdb_store):
+
+    ensure_table(table_name)                  create / migrate the table
+    drop_expired(table_name)                  enforce the 9-year retention window
+    load_changed_rows(df, table_name, full, changes)
+                                              upsert cleaned rows → {"inserted", "updated", "skipped"};
+                                              rows actually written go to `changes` (a ChangeFeed)
+    export_snapshot(table_name)               CSV + Parquet snapshot under data/clean/
+    read_cases(table_name, columns, start, end, neighborhood_ids, chunksize, lookups)
+                                              fact rows with integer dimension keys; only `columns`,
+                                              only cases created in [start, end) and in the given
+                                              neighborhoods, filtered in the engine; with `chunksize`,
+                                              streamed as an iterator of frames of up to that many rows;
+                                              keys numbered as in `lookups` (from read_lookups) if given
+    read_lookups(table_name)                  {text column: lookup of its keys}
+    cases_relation(table_name)                relation with the text columns, for SQL aggregations
+    query(sql)                                run SQL in the engine and return a DataFrame
+    close()                                   release the connections (and DuckDB's file lock)
+
+STORAGE_BACKEND picks the backend: "postgres" (default, DATABASE_URL) or "duckdb"
+(a local file at DUCKDB_PATH, no server needed). A DuckDB file is locked by the process
+that opens it for writing, so a writer closes its store before other processes read it;
+a read-only DuckDB store opens the file only for the length of each read.
+"""
+import os
+
+from sqlalchemy import create_engine
+
+BACKENDS = ["postgres", "duckdb"]
+
+
+def open_store(backend=None, read_only=False):
+    backend = backend or os.environ.get("STORAGE_BACKEND", "postgres")
+
+    if backend == "postgres":
+        from ingest.postgres_store import PostgresStore
+
+        url = os.environ.get("DATABASE_URL")
+        if not url:
+            raise ValueError("DATABASE_URL is not set in your environment or .env file")
+        return PostgresStore(create_engine(url, pool_size=4, pool_pre_ping=True))
+
+    if backend == "duckdb":
+        from ingest.duckdb_store import DuckDBStore
+        return DuckDBStore(read_only=read_only)
+
+    raise ValueError(f"Unknown STORAGE_BACKEND {backend!r}; expected one of {BACKENDS}")
@@ -2,6 +2,10 @@ import subprocess
 import sys
 from pathlib import Path
 
+from app.utils.generation import write_generation
+from ingest.changes import latest_manifest
+from ingest.instrument import Run
+
 # Precompute scripts as Python modules
 PRECOMPUTE_MODULES = [
     "precompute.trends",
@@ -28,7 +32,13 @@ def run_module(module_name):
     print(f"✅ Finished: {module_name}")
 
 
-def main():
+def main(stages=None):
+    # `stages` is the refresh run's scope when called from refresh_data; standalone runs log their own
+    run = None
+    if stages is None:
+        run = Run("precompute")
+        stages = run.scope("all")
+
     print("🚀 Starting full precompute pipeline...\n")
 
     # Ensure precomputed directories exist
@@ -45,10 +55,18 @@ def main():
 
     # Run each precompute script
     for module in PRECOMPUTE_MODULES:
-        run_module(module)
+        with stages.stage(f"precompute:{module.split('.')[-1]}", children=True):
+            run_module(module)
+
+    # Only once every module has written its files: a running app reloads when this changes
+    latest = latest_manifest()
+    write_generation(changes_run_id=latest["run_id"] if latest else None)
 
     print("\n🎉 ALL PRECOMPUTATIONS COMPLETED SUCCESSFULLY!\n")
 
+    if run is not None:
+        run.finish()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,13 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases, plain
+
+# The houston_311 columns this module reads
+CASE_COLUMNS = [
+    "CREATED DATE", "NEIGHBORHOOD", "DEPARTMENT", "DIVISION",
+    "CATEGORY", "CASE TYPE", "RESOLUTION_TIME_DAYS",
+]
 
 OUTPUT = Path("precomputed_data/forecast")
 OUTPUT.mkdir(parents=True, exist_ok=True)
@@ -185,6 +191,8 @@ def compute_severity(df2):
 # MAIN RUNNER
 def run_precompute_forecast_inputs():
     print("🔧 Precomputing Forecast Inputs...")
+    # Plain object / float64 columns, so the parquet outputs keep their types
+    df = plain(load_cases(CASE_COLUMNS))
     df2 = prepare_base(df)
 
     compute_monthly_volume(df2)
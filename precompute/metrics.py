@@ -1,6 +1,9 @@
 import pandas as pd
 from pathlib import Path
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases, plain
+
+# The houston_311 columns this module reads
+CASE_COLUMNS = ["CREATED DATE", "NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CATEGORY"]
 
 OUTPUT = Path("precomputed_data/metrics")
 OUTPUT.mkdir(parents=True, exist_ok=True)
@@ -89,6 +92,8 @@ def compute_month_filter(df_in):
 def run_precompute_neighborhood_metrics():
     print("🔧 Precomputing: Neighborhood Metrics...")
 
+    # Plain object / float64 columns, so the parquet outputs keep their types
+    df = plain(load_cases(CASE_COLUMNS))
     df2 = prepare_base(df)
 
     compute_neighborhood_list(df2)
@@ -1,6 +1,9 @@
 import pandas as pd
 from pathlib import Path
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases, plain
+
+# The houston_311 columns this module reads
+CASE_COLUMNS = ["CREATED DATE", "NEIGHBORHOOD", "DEPARTMENT", "CATEGORY", "RESOLUTION_TIME_DAYS"]
 
 OUTPUT = Path("precomputed_data/resolution")
 OUTPUT.mkdir(parents=True, exist_ok=True)
@@ -188,6 +191,8 @@ def compute_lists(df2):
 def run_precompute_resolution():
     print("🔧 Precomputing: Resolution Insights…")
 
+    # Plain object / float64 columns, so the parquet outputs keep their types
+    df = plain(load_cases(CASE_COLUMNS))
     df2 = prepare_base(df)
 
     compute_lists(df2)
@@ -1,6 +1,9 @@
 import pandas as pd
 from pathlib import Path
-from app.utils.data_loader import df
+from app.utils.data_loader import load_cases, plain
+
+# The houston_311 columns this module reads
+CASE_COLUMNS = ["CREATED DATE", "NEIGHBORHOOD"]
 
 OUTPUT_DIR = Path("precomputed_data/trends")
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -85,6 +88,8 @@ def precompute_seasonal(df_in):
 def run_precompute_timeseries():
     print("🧮 Precomputing unified complaint trends…")
 
+    # Plain object / float64 columns, so the parquet outputs keep their types
+    df = plain(load_cases(CASE_COLUMNS))
     df2 = compute_base_fields(df)
 
     compute_cleaned_neighborhood_list(df2)
@@ -1,20 +1,33 @@
 import os
 import io
+import asyncio
+import itertools
+import multiprocessing
+import numpy as np
 import pandas as pd
-import requests
 import time
-from collections import defaultdict
-from sqlalchemy import create_engine, text, Table, MetaData, insert
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from sqlalchemy import Table, MetaData, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 from app.utils.utils import category_mapping
+from ingest.download import (
+    RestartedDownload, fetch_extract, fetch_tail, mark_loaded, mark_tail_loaded, prefix_cases, read_blocks,
+    stream_extract,
+)
+from ingest.arrow_reader import read_extract_arrow, read_extract_arrow_chunks
+from ingest.changes import ChangeFeed
+from ingest.export import EXPORT_CSV
+from ingest.instrument import Run
+from ingest.schema import PRIMARY_KEY, retention_cutoff
+from ingest.storage import open_store
 
 # CONFIG
 load_dotenv()
-DATABASE_URL = os.environ.get("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set in your environment or .env file")
 
 YEAR_CURRENT = datetime.now().year
 YEAR_PREVIOUS = YEAR_CURRENT - 1
@@ -39,52 +52,212 @@ RENAME_MAP = {
 
 KEEP_COLS = list(RENAME_MAP.values()) + ["CATEGORY", "RESOLUTION_TIME_DAYS"]
 
-# HELPERS
-def download_file(url: str, max_retries=5) -> pd.DataFrame:
-    print(f"Downloading: {url}")
-    tmp_path = "tmp_311.txt"
-    skip_lines = 5
+NEIGHBORHOOD_FIXES = {
+    'HARRISBURG / MANCHESTER / SMITH ADDITION': 'HARRISBURG / MANCHESTER',
+    'BRIARFOREST AREA': 'BRIAR FOREST',
+    'BRAESWOOD PLACE': 'BRAESWOOD',
+    'NORTHSIDE VILLAGE': 'NEAR NORTHSIDE',
+    'OST / SOUTH UNION': 'GREATER OST / SOUTH UNION',
+    'WASHINGTON AVENUE COALITION / MEMORIAL P': 'WASHINGTON AVENUE COALITION / MEMORIAL PARK',
+    'WILLOW MEADOWS / WILLOWBEND AREA': 'NEAR SOUTHWEST'
+}
 
-    for attempt in range(1, max_retries + 1):
-        try:
-            # Stream download (with retry)
-            with requests.get(url, stream=True, timeout=60) as r:
-                r.raise_for_status()
+# Houston boundaries (inclusive)
+LAT_BOUNDS = (29.5, 30.1)
+LON_BOUNDS = (-95.9, -94.9)
 
-                with open(tmp_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=10_000_000):  # 10 MB
-                        if chunk:
-                            f.write(chunk)
+# Rows with a case number but none of these are dropped
+FIELDS_TO_CHECK = [
+    "NEIGHBORHOOD", "DEPARTMENT", "DIVISION",
+    "CASE TYPE", "CREATED DATE", "LATITUDE", "LONGITUDE"
+]
 
-            # If we reach here, download succeeded → break out of retry loop
-            break
+# Set REFRESH_FULL=1 to ignore stored row hashes and re-send every row
+FULL_RELOAD = os.environ.get("REFRESH_FULL") == "1"
 
-        except Exception as e:
-            print(f"⚠ Download attempt {attempt} failed: {e}")
+# Set REFRESH_INCREMENTAL=1 to fetch only rows appended since the last ingest (e.g. hourly runs)
+INCREMENTAL = os.environ.get("REFRESH_INCREMENTAL") == "1"
 
-            # Last attempt → give up
-            if attempt == max_retries:
-                raise RuntimeError(
-                    f"Failed to download file after {max_retries} attempts\nURL: {url}"
-                )
+# Years refreshing concurrently share one store and take turns on the database
+DB_LOCK = threading.Lock()
+_store = None
 
-            time.sleep(3)  # wait before retrying
-            continue
+# Rows per chunk for streaming ingest (0 = parse the whole extract in memory)
+CHUNK_ROWS = int(os.environ.get("REFRESH_CHUNK_ROWS", "250000"))
 
-    # Parse pipe-delimited data safely
-    df = pd.read_csv(
-        tmp_path,
-        sep="|",
-        dtype=str,
-        engine="python",
-        on_bad_lines="skip",
-        skiprows=skip_lines,
-        encoding="latin-1"
-    )
+# Processes used to parse one extract in parallel byte ranges (0 = off)
+PARSE_WORKERS = int(os.environ.get("REFRESH_PARSE_WORKERS", "0"))
+
+# Set REFRESH_PIPELINE=1 to download, parse, clean and load one extract as overlapping stages
+PIPELINE = os.environ.get("REFRESH_PIPELINE") == "1"
+
+# Chunks (or download blocks) allowed to wait between two pipeline stages; bounds its memory
+PIPELINE_QUEUE = int(os.environ.get("REFRESH_PIPELINE_QUEUE", "2"))
 
-    os.remove(tmp_path)
+# Where the pipeline parses and cleans: "thread" or "process"
+PIPELINE_EXECUTOR = os.environ.get("REFRESH_PIPELINE_EXECUTOR", "thread")
+
+# Extract parser: "pandas" (string columns) or "arrow" (typed columns, see ingest.arrow_reader)
+READER = os.environ.get("REFRESH_READER", "pandas")
+
+# Pipe-delimited, latin-1 extract with a 5-line preamble before the header
+READ_KWARGS = dict(
+    sep="|",
+    dtype=str,
+    engine="c",
+    on_bad_lines="skip",
+    skiprows=5,
+    encoding="latin-1",
+)
+
+# HELPERS
+def get_store():
+    # One store per process (STORAGE_BACKEND), shared by every year being refreshed
+    global _store
+    if _store is None:
+        _store = open_store()
+    return _store
+
+def close_store():
+    # Release the shared store; with DuckDB this also frees the file for other processes
+    global _store
+    if _store is not None:
+        _store.close()
+        _store = None
+
+def get_engine():
+    # The PostgreSQL engine behind the store, for the row-by-row upsert
+    return get_store().engine
+
+@contextmanager
+def db_turn(stages):
+    # Only one year writes to the database at a time; downloads and parsing of the others keep going
+    with stages.stage("db_wait"):
+        DB_LOCK.acquire()
+    try:
+        yield
+    finally:
+        DB_LOCK.release()
+
+def load_stage(df, table_name, store, stages, changes=None):
+    with stages.stage("load", rows_in=len(df)) as stage:
+        counts = store.load_changed_rows(df, table_name, full=FULL_RELOAD, changes=changes)
+        stage["rows_out"] = counts["inserted"] + counts["updated"]
+    return counts
+
+def retention_stage(table_name, store, stages, changes=None):
+    with stages.stage("retention"):
+        store.ensure_table(table_name)
+        dropped = store.drop_expired(table_name)
+    if dropped and changes is not None:
+        changes.expire(table_name, retention_cutoff())
+
+def download_file(url: str, max_retries=5) -> pd.DataFrame:
+    path, _ = fetch_extract(url, max_retries=max_retries)
+
+    # Parse pipe-delimited data safely
+    return parse_extract(path)
+
+
+def read_extract_chunks(path, chunksize=CHUNK_ROWS):
+    # Yield the raw extract in bounded chunks so only one chunk is held as strings at a time
+    with pd.read_csv(path, chunksize=chunksize, **READ_KWARGS) as reader:
+        for chunk in reader:
+            yield chunk
+
+def parse_extract(source, reader=READER, skip_lines=5):
+    # Whole-extract parse with the configured reader
+    if reader == "arrow":
+        return read_extract_arrow(source, skip_rows=skip_lines)
+    return pd.read_csv(source, **{**READ_KWARGS, "skiprows": skip_lines})
+
+def parse_extract_chunks(path, chunksize=CHUNK_ROWS, reader=READER):
+    if reader == "arrow":
+        return read_extract_arrow_chunks(path, chunksize)
+    return read_extract_chunks(path, chunksize)
+
+def clean_extract(df, reader=READER):
+    # Typed frames from the arrow reader go through clean_typed, string frames through clean_and_prepare
+    if reader == "arrow":
+        return clean_typed(df)
+    return clean_and_prepare(df)
+
+def raw_cases(df):
+    return df["Case Number"].dropna().str.strip()
+
+def extract_cases(path):
+    # Raw case numbers of every complete line of the extract at `path`; an unterminated last line is
+    # left to the next tail fetch, which reads it again
+    cases = pd.read_csv(path, usecols=["Case Number"], **READ_KWARGS)["Case Number"]
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                cases = cases.iloc[:-1]
+    return cases.dropna().str.strip().unique()
+
+def drop_seen_cases(df, seen_cases, part_cases):
+    # Drop cases that appeared in an earlier part of the file, then remember every case in this part
+    # (kept or filtered out), so the result matches drop_duplicates over the whole file
+    df = df[~df["CASE NUMBER"].isin(seen_cases)]
+    seen_cases.update(part_cases)
     return df
 
+def split_line_ranges(path, parts, skip_lines=5):
+    # Byte ranges over the data rows that start and end on line boundaries; the header is read once
+    with open(path, "rb") as f:
+        for _ in range(skip_lines):
+            f.readline()
+        header = f.readline()
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        bounds = [start]
+        step = max((size - start) // parts, 1)
+        for i in range(1, parts):
+            f.seek(max(start + i * step, bounds[-1]))
+            f.readline()  # move to the start of the next line
+            if bounds[-1] < f.tell() < size:
+                bounds.append(f.tell())
+        bounds.append(size)
+
+    return header, list(zip(bounds[:-1], bounds[1:]))
+
+def parse_line_range(path, header, start, end, reader=READER):
+    # Worker: parse and clean one byte range; also return its raw case numbers for cross-range dedup
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = header + f.read(end - start)
+
+    raw = parse_extract(io.BytesIO(data), reader=reader, skip_lines=0)
+    return clean_extract(raw, reader=reader), raw_cases(raw).unique()
+
+def concat_parts(parts):
+    # Concatenate in order, unifying categories so dictionary-encoded columns stay categorical
+    for col in parts[0].columns:
+        if isinstance(parts[0][col].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals([p[col] for p in parts]).categories
+            parts = [p.assign(**{col: p[col].cat.set_categories(categories)}) for p in parts]
+    return pd.concat(parts, ignore_index=True)
+
+def parse_parallel(path, workers=PARSE_WORKERS, reader=READER):
+    # Parse + clean one extract on `workers` processes, one line-aligned byte range each
+    header, ranges = split_line_ranges(path, workers)
+
+    # forkserver: refresh_years calls this from a thread, and forking a threaded process is unsafe
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver")) as pool:
+        results = list(pool.map(
+            parse_line_range,
+            itertools.repeat(path), itertools.repeat(header),
+            [start for start, _ in ranges], [end for _, end in ranges],
+            itertools.repeat(reader),
+        ))
+
+    seen_cases = set()
+    parts = [drop_seen_cases(df, seen_cases, cases) for df, cases in results]
+    return concat_parts(parts)
+
 
 def clean_and_prepare(df: pd.DataFrame) -> pd.DataFrame:
     # Rename columns
@@ -92,15 +265,7 @@ def clean_and_prepare(df: pd.DataFrame) -> pd.DataFrame:
     df = df[list(RENAME_MAP.values())]
 
     # Neighborhood standardization
-    df["NEIGHBORHOOD"] = df["NEIGHBORHOOD"].replace({
-        'HARRISBURG / MANCHESTER / SMITH ADDITION': 'HARRISBURG / MANCHESTER',
-        'BRIARFOREST AREA': 'BRIAR FOREST',
-        'BRAESWOOD PLACE': 'BRAESWOOD',
-        'NORTHSIDE VILLAGE': 'NEAR NORTHSIDE',
-        'OST / SOUTH UNION': 'GREATER OST / SOUTH UNION',
-        'WASHINGTON AVENUE COALITION / MEMORIAL P': 'WASHINGTON AVENUE COALITION / MEMORIAL PARK',
-        'WILLOW MEADOWS / WILLOWBEND AREA': 'NEAR SOUTHWEST'
-    })
+    df["NEIGHBORHOOD"] = df["NEIGHBORHOOD"].replace(NEIGHBORHOOD_FIXES)
 
     # Category mapping
     df["CATEGORY"] = df["CASE TYPE"].map(category_mapping).fillna("Unknown")
@@ -128,49 +293,71 @@ def clean_and_prepare(df: pd.DataFrame) -> pd.DataFrame:
     df["LONGITUDE"] = pd.to_numeric(df["LONGITUDE"], errors="coerce")
 
     df = df[
-        df["LATITUDE"].between(29.5, 30.1, inclusive="both") &
-        df["LONGITUDE"].between(-95.9, -94.9, inclusive="both")
+        df["LATITUDE"].between(*LAT_BOUNDS, inclusive="both") &
+        df["LONGITUDE"].between(*LON_BOUNDS, inclusive="both")
     ]
 
     # Remove cases that have case number but no other info
-    fields_to_check = [
-        "NEIGHBORHOOD", "DEPARTMENT", "DIVISION",
-        "CASE TYPE", "CREATED DATE", "LATITUDE", "LONGITUDE"
-    ]
+    df = df.dropna(subset=FIELDS_TO_CHECK, how="all")
 
-    df = df.dropna(subset=fields_to_check, how="all")
+    # Remove cases without a created date (the partition key of houston_311)
+    df = df.dropna(subset=["CREATED DATE"])
 
     # Strip whitespace
     df = df.apply(lambda col: col.str.strip() if col.dtype == "object" else col)
 
     return df
 
-def table_exists(engine, table_name):
-    with engine.connect() as conn:
-        result = conn.execute(text("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_name = :table
-            );
-        """), {"table": table_name})
-        return result.scalar()
-
-def create_table_if_missing(df, table_name, engine):
-    if not table_exists(engine, table_name):
-        print(f"Creating table: {table_name}")
-        df.head(0).to_sql(table_name, engine, if_exists="replace", index=False)
-    else:
-        print(f"Table exists: {table_name}")
+def recode(values, mapper):
+    # Apply `mapper` to a categorical's categories instead of to every row; values it merges share one code
+    categories = values.cat.categories.to_series(index=None)
+    inverse, uniques = pd.factorize(mapper(categories))
+    inverse = np.append(inverse, -1)  # code -1 (missing) stays missing
+    codes = inverse[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=uniques), index=values.index)
 
-def delete_old_rows(table_name, engine):
-    delete_sql = text(f"""
-        DELETE FROM {table_name}
-        WHERE "CREATED DATE" < DATE_TRUNC('month', NOW() - INTERVAL '9 years')
-    """)
+def clean_typed(df: pd.DataFrame) -> pd.DataFrame:
+    # Same rules as clean_and_prepare, applied to the typed frame from ingest.arrow_reader
+    df = df.rename(columns=RENAME_MAP)
+    df = df[list(RENAME_MAP.values())]
 
-    with engine.begin() as conn:
-        result = conn.execute(delete_sql)
-        print(f"✓ Removed {result.rowcount} rows that are older than the current rolling 9-year window in {table_name}")
+    # Neighborhood standardization
+    df["NEIGHBORHOOD"] = recode(df["NEIGHBORHOOD"], lambda c: c.replace(NEIGHBORHOOD_FIXES))
+
+    # Category mapping
+    category = recode(df["CASE TYPE"], lambda c: c.map(category_mapping).fillna("Unknown"))
+    if "Unknown" not in category.cat.categories:
+        category = category.cat.add_categories("Unknown")
+    df["CATEGORY"] = category.fillna("Unknown")
+
+    # Compute resolution time (dates are already datetime64)
+    df["RESOLUTION_TIME_DAYS"] = (
+        (df["CLOSED DATE"] - df["CREATED DATE"]).dt.total_seconds() / 86400
+    )
+    df["RESOLUTION_TIME_DAYS"] = df["RESOLUTION_TIME_DAYS"].round().astype("Int64")
+
+    # Drop duplicates by case number
+    df = df.drop_duplicates(subset=["CASE NUMBER"])
+
+    # Remove cases outside Houston boundaries (coordinates are already float64)
+    df = df[
+        df["LATITUDE"].between(*LAT_BOUNDS, inclusive="both") &
+        df["LONGITUDE"].between(*LON_BOUNDS, inclusive="both")
+    ]
+
+    # Remove cases that have case number but no other info
+    df = df.dropna(subset=FIELDS_TO_CHECK, how="all")
+
+    # Remove cases without a created date (the partition key of houston_311)
+    df = df.dropna(subset=["CREATED DATE"])
+
+    # Strip whitespace (per category for the dictionary-encoded columns)
+    df = df.copy()
+    df["CASE NUMBER"] = df["CASE NUMBER"].str.strip()
+    for col in ["NEIGHBORHOOD", "DEPARTMENT", "DIVISION", "CASE TYPE", "CATEGORY"]:
+        df[col] = recode(df[col], lambda c: c.str.strip())
+
+    return df
 
 def upsert(df, table_name, engine):
     print(f"Upserting into {table_name}...")
@@ -191,7 +378,7 @@ def upsert(df, table_name, engine):
     metadata = MetaData()
     table = Table(table_name, metadata, autoload_with=engine)
     
-    update_cols = [col for col in df.columns if col != "CASE NUMBER"]
+    update_cols = [col for col in df.columns if col not in PRIMARY_KEY]
     update_dict = {
         table.c[col]: table.c[col]  # This will be replaced via on_conflict_do_update
         for col in update_cols
@@ -211,36 +398,30 @@ def upsert(df, table_name, engine):
             
             insert_stmt = pg_insert(table).values(**row_dict)
             
-            # Build update set: col = EXCLUDED.col for each column except CASE NUMBER
+            # Build update set: col = EXCLUDED.col for each column outside the primary key
             update_set = {
                 table.c[col]: insert_stmt.excluded[col]
                 for col in update_cols
             }
             
+            # Skip the write when nothing changed
             upsert_stmt = insert_stmt.on_conflict_do_update(
-                index_elements=["CASE NUMBER"],
-                set_=update_set
+                index_elements=PRIMARY_KEY,
+                set_=update_set,
+                where=tuple_(*[table.c[col] for col in update_cols]).is_distinct_from(
+                    tuple_(*[insert_stmt.excluded[col] for col in update_cols])
+                ),
             )
             
             conn.execute(upsert_stmt)
             
-def export_table_to_csv(table_name, engine, output_path):
-    print(f"Exporting {table_name} → {output_path}")
-    query = f'SELECT * FROM "{table_name}"'
-    df = pd.read_sql(query, engine)
-    df.to_csv(output_path, index=False)
-    print("✓ CSV export complete")
-
-# MAIN REFRESH
-def refresh_year(url, table_name):
-    print(f"\n=== Refreshing {table_name} ===")
-    df_raw = download_file(url)
-    df = clean_and_prepare(df_raw)
-
-    engine = create_engine(DATABASE_URL)
-
-    create_table_if_missing(df, table_name, engine)
+def report_counts(counts):
+    print(
+        f"✓ {counts['inserted']:,} inserted, {counts['updated']:,} updated, "
+        f"{counts['skipped']:,} unchanged rows skipped"
+    )
 
+def prepare_for_load(df):
     # Fix datetime conversions FIRST
     for col in df.columns:
         if pd.api.types.is_datetime64_any_dtype(df[col]):
@@ -249,40 +430,385 @@ def refresh_year(url, table_name):
             df[col] = df[col].where(df[col].notna(), None)  # convert NaT → None
 
     # Now safely convert other null types
-    df = df.where(pd.notnull(df), None)
-    
-    delete_old_rows(table_name, engine)
+    return df.where(pd.notnull(df), None)
+
+def stream_load(path, table_name, store, chunksize=CHUNK_ROWS, stages=None, changes=None):
+    # Parse → clean → load one chunk at a time; peak memory tracks the chunk size, not the file size
+    stages = stages or Run().scope(table_name)
+    seen_cases = set()
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    total_read = total_cleaned = 0
+    run_start = chunk_start = time.perf_counter()
+    chunks = parse_extract_chunks(path, chunksize)
+
+    for i in itertools.count(1):
+        # The file size is counted once, on the first chunk
+        with stages.stage("parse", bytes=os.path.getsize(path) if i == 1 else None) as stage:
+            chunk = next(chunks, None)
+            stage["rows_out"] = 0 if chunk is None else len(chunk)
+        if chunk is None:
+            break
 
-    upsert(df, table_name, engine)
-    
-    export_table_to_csv(
-        table_name="houston_311",
-        engine=engine,
-        output_path="data/clean/Houston_311_Export.csv"
+        with stages.stage("clean", rows_in=len(chunk)) as stage:
+            df = clean_extract(chunk)
+
+            # Keep the first occurrence of a case across chunks (same as drop_duplicates on the full file)
+            df = drop_seen_cases(df, seen_cases, raw_cases(chunk))
+
+            df = prepare_for_load(df)
+            stage["rows_out"] = len(df)
+
+        with db_turn(stages):
+            if i == 1:
+                retention_stage(table_name, store, stages, changes)
+
+            for key, n in load_stage(df, table_name, store, stages, changes).items():
+                counts[key] += n
+
+        elapsed = time.perf_counter() - chunk_start
+        total_read += len(chunk)
+        total_cleaned += len(df)
+        print(
+            f"  chunk {i}: {len(chunk):,} rows read, {len(df):,} cleaned "
+            f"in {elapsed:.1f}s ({len(chunk) / elapsed:,.0f} rows/sec)"
+        )
+        chunk_start = time.perf_counter()
+
+    elapsed = time.perf_counter() - run_start
+    print(
+        f"✓ Streamed {total_read:,} rows ({total_cleaned:,} cleaned) "
+        f"in {elapsed:.1f}s ({total_read / max(elapsed, 1e-9):,.0f} rows/sec)"
     )
+    report_counts(counts)
+
+# PIPELINE
+# Each stage is a task that takes items from the queue before it and puts its results on the
+# queue after it; None marks the end of the stream. A full queue makes the stage before it wait,
+# so at most PIPELINE_QUEUE items sit between two stages and memory stays at a few chunks.
+
+def next_block(blocks):
+    # One step of a blocking byte source: (block, None) until it ends, then (None, its return value)
+    try:
+        return next(blocks), None
+    except StopIteration as done:
+        return None, done.value
+
+def extract_blocks(url, full=FULL_RELOAD):
+    # The extract's bytes as they download; after a 304, the archived copy if it still needs loading.
+    # Returns (path, changed, streamed), `streamed` being whether any bytes went to the consumer.
+    blocks = stream_extract(url)
+    streamed = 0
+    while True:
+        block, returned = next_block(blocks)
+        if block is None:
+            break
+        streamed += len(block)
+        yield block
+
+    path, changed = returned
+    if not streamed and (changed or full):
+        yield from read_blocks(path)
+        streamed = path.stat().st_size
+    return path, changed, streamed > 0
+
+def parse_lines(header, data, reader=READER):
+    # Executor: parse one run of complete lines under the extract's header
+    return parse_extract(io.BytesIO(header + data), reader=reader, skip_lines=0)
+
+def clean_chunk(chunk, reader=READER):
+    # Executor: clean one parsed chunk; its raw case numbers come back for the cross-chunk dedup
+    return prepare_for_load(clean_extract(chunk, reader=reader)), raw_cases(chunk).unique()
+
+def load_chunk(df, table_name, store, stages, first, changes=None):
+    with db_turn(stages):
+        if first:
+            retention_stage(table_name, store, stages, changes)
+        return load_stage(df, table_name, store, stages, changes)
+
+async def download_blocks(blocks, raw, stages, result):
+    # The source is pulled on a thread, one block at a time; while `raw` is full nothing is
+    # pulled, so a slow consumer backs up into the socket instead of into memory
+    wall = total = 0
+    started = time.time()
+    while True:
+        start = time.perf_counter()
+        block, returned = await asyncio.to_thread(next_block, blocks)
+        wall += time.perf_counter() - start
+        if block is None:
+            break
+        total += len(block)
+        await raw.put(block)
+
+    result["source"] = returned
+    stages.run.add(stages.scope, "download", wall, {"bytes": total}, started=started)
+    await raw.put(None)
+
+async def split_lines(raw, lines, chunksize, skip_lines=5):
+    # Re-cut the byte stream into runs of about `chunksize` complete lines, after the preamble and header
+    header, head = None, b""
+    pending, newlines = [], 0
+    while (block := await raw.get()) is not None:
+        if header is None:
+            head += block
+            parts = head.split(b"\n", skip_lines + 1)
+            if len(parts) <= skip_lines + 1:
+                continue
+            header, block = parts[skip_lines] + b"\n", parts[-1]
+
+        pending.append(block)
+        newlines += block.count(b"\n")
+        if newlines >= chunksize:
+            data = b"".join(pending)
+            cut = data.rfind(b"\n") + 1
+            await lines.put((header, data[:cut]))
+            pending, newlines = [data[cut:]], 0
+
+    data = b"".join(pending)
+    if data.strip():
+        await lines.put((header, data))
+    await lines.put(None)
+
+async def parse_chunks(lines, parsed, executor, stages):
+    loop = asyncio.get_running_loop()
+    while (item := await lines.get()) is not None:
+        header, data = item
+        with stages.stage("parse", bytes=len(data)) as stage:
+            chunk = await loop.run_in_executor(executor, parse_lines, header, data)
+            stage["rows_out"] = len(chunk)
+        await parsed.put(chunk)
+    await parsed.put(None)
+
+async def clean_chunks(parsed, cleaned, executor, stages):
+    loop = asyncio.get_running_loop()
+    seen_cases = set()
+    while (chunk := await parsed.get()) is not None:
+        with stages.stage("clean", rows_in=len(chunk)) as stage:
+            df, cases = await loop.run_in_executor(executor, clean_chunk, chunk)
+
+            # Keep the first occurrence of a case across chunks (same as drop_duplicates on the full file)
+            df = drop_seen_cases(df, seen_cases, cases)
+            stage["rows_out"] = len(df)
+        await cleaned.put((len(chunk), df))
+    await cleaned.put(None)
+
+async def load_chunks(cleaned, table_name, store, stages, totals, changes=None):
+    # The load runs on its own thread, so downloading and parsing carry on during the COPY
+    for i in itertools.count(1):
+        item = await cleaned.get()
+        if item is None:
+            break
+        rows_read, df = item
+        counts = await asyncio.to_thread(load_chunk, df, table_name, store, stages, i == 1, changes)
+        for key, n in counts.items():
+            totals[key] += n
+        totals["read"] += rows_read
+        totals["cleaned"] += len(df)
+        print(f"  chunk {i}: {rows_read:,} rows read, {len(df):,} cleaned and loaded")
+
+async def run_pipeline(blocks, table_name, store, chunksize, stages, executor, changes=None):
+    raw, lines, parsed, cleaned = (asyncio.Queue(maxsize=PIPELINE_QUEUE) for _ in range(4))
+    result = {}
+    totals = {"inserted": 0, "updated": 0, "skipped": 0, "read": 0, "cleaned": 0}
+
+    try:
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(download_blocks(blocks, raw, stages, result))
+            tasks.create_task(split_lines(raw, lines, chunksize))
+            tasks.create_task(parse_chunks(lines, parsed, executor, stages))
+            tasks.create_task(clean_chunks(parsed, cleaned, executor, stages))
+            tasks.create_task(load_chunks(cleaned, table_name, store, stages, totals, changes))
+    except ExceptionGroup as group:
+        # The first stage to fail cancels the others; re-raise its error as itself
+        raise group.exceptions[0] from None
+
+    return result["source"], totals
+
+def pipeline_load(blocks, table_name, store, chunksize=CHUNK_ROWS, stages=None, executor=PIPELINE_EXECUTOR,
+                  changes=None):
+    # Same result as stream_load, but download, parse, clean and load run at the same time on
+    # consecutive chunks, so a refresh takes about as long as its slowest stage rather than the sum.
+    # `blocks` yields the extract's bytes (stream_extract, extract_blocks, read_blocks); its return value is returned.
+    stages = stages or Run().scope(table_name)
+    start = time.perf_counter()
+
+    if executor == "process":
+        # forkserver: refresh_years calls this from a thread, and forking a threaded process is unsafe
+        pool = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("forkserver"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=2)
+    with pool:
+        source, totals = asyncio.run(run_pipeline(blocks, table_name, store, chunksize, stages, pool, changes))
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✓ Pipelined {totals['read']:,} rows ({totals['cleaned']:,} cleaned) "
+        f"in {elapsed:.1f}s ({totals['read'] / max(elapsed, 1e-9):,.0f} rows/sec)"
+    )
+    report_counts(totals)
+    return source
+
+def refresh_tail(url, table_name, store, stages=None, changes=None):
+    # Load only the rows appended upstream; False means the tail can't be trusted and a full refresh is needed
+    stages = stages or Run().scope(table_name)
+
+    with stages.stage("download") as stage:
+        tail = fetch_tail(url)
+        stage["bytes"] = 0 if tail is None else len(tail[0])
+    if tail is None:
+        return False
+
+    data, state = tail
+    with stages.stage("parse", bytes=len(data)) as stage:
+        df = parse_extract(io.BytesIO(data), skip_lines=0)
+        stage["rows_out"] = len(df)
+
+    # Keep the first occurrence of a case, as the full refresh does: a tail row of a case the
+    # prefix already had (loaded or filtered out there) is dropped before cleaning
+    tail_cases = raw_cases(df).unique()
+    df = df[~df["Case Number"].str.strip().isin(prefix_cases(url))]
+
+    if not df.empty:
+        with stages.stage("clean", rows_in=len(df)) as stage:
+            df = prepare_for_load(clean_extract(df))
+            stage["rows_out"] = len(df)
+        with db_turn(stages):
+            report_counts(load_stage(df, table_name, store, stages, changes))
+
+    mark_tail_loaded(url, state, tail_cases)
+    return True
+
+def export_stage(store, stages):
+    with stages.stage("export") as stage:
+        manifest = store.export_snapshot("houston_311")
+        stage["rows_out"] = manifest["rows"]
+        stage["bytes"] = sum(f["bytes"] for f in manifest["files"]) + EXPORT_CSV.stat().st_size
+
+# MAIN REFRESH
+def refresh_year(url, table_name, chunksize=CHUNK_ROWS, incremental=INCREMENTAL,
+                 store=None, stages=None, export=True, workers=PARSE_WORKERS, pipeline=PIPELINE, changes=None):
+    print(f"\n=== Refreshing {table_name} ({url}) ===")
+    store = store or get_store()
+    stages = stages or Run().scope(table_name)
+
+    if incremental and refresh_tail(url, table_name, store, stages, changes):
+        print(f"Completed incremental refresh for {table_name}")
+        return
+
+    pipelined = pipeline and chunksize and workers <= 1
+    streamed = False
+    if pipelined:
+        # Loading starts while the extract is still downloading
+        try:
+            path, changed, streamed = pipeline_load(
+                extract_blocks(url), table_name, store, chunksize, stages, changes=changes,
+            )
+        except RestartedDownload as e:
+            print(f"⚠ {e} — refreshing from a complete download instead")
+            pipelined = False
+
+    if not pipelined:
+        with stages.stage("download") as stage:
+            path, changed = fetch_extract(url)
+            stage["bytes"] = path.stat().st_size
+    if not changed and not FULL_RELOAD:
+        if streamed:
+            # A new ETag or date over the same bytes: the hash is only known once the whole file is in,
+            # by which time its rows have gone through the load (unchanged ones as skips)
+            print(f"✓ Extract content matches the one already loaded for {table_name} — nothing further to refresh")
+        else:
+            print(f"✓ Extract already loaded — nothing to refresh for {table_name}")
+        return
+
+    if pipelined:
+        pass  # already loaded, chunk by chunk, as it downloaded
+    elif chunksize and workers <= 1:
+        stream_load(path, table_name, store, chunksize, stages, changes)
+    else:
+        if workers > 1:
+            # Parse and clean happen together in the worker processes
+            with stages.stage("parse", bytes=path.stat().st_size) as stage:
+                df = parse_parallel(path, workers)
+                stage["rows_out"] = len(df)
+            with stages.stage("clean", rows_in=len(df)) as stage:
+                df = prepare_for_load(df)
+                stage["rows_out"] = len(df)
+        else:
+            with stages.stage("parse", bytes=path.stat().st_size) as stage:
+                df = parse_extract(path)
+                stage["rows_out"] = len(df)
+            with stages.stage("clean", rows_in=len(df)) as stage:
+                df = prepare_for_load(clean_extract(df))
+                stage["rows_out"] = len(df)
+
+        with db_turn(stages):
+            retention_stage(table_name, store, stages, changes)
+
+            report_counts(load_stage(df, table_name, store, stages, changes))
+
+    mark_loaded(url, path, extract_cases(path))
+
+    if export:
+        export_stage(store, stages)
     
     print(f"Completed refresh for {table_name}")
 
+def refresh_years(targets, run=None):
+    # Download and parse every year concurrently; database loads take turns on one shared store.
+    # Returns the manifest of the run's change feed (see ingest.changes).
+    store = get_store()
+    run = run or Run()
+    changes = ChangeFeed(run.run_id)
+    years = [Path(url).stem.rsplit("-", 1)[-1] for url, _ in targets]
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            futures = [
+                pool.submit(
+                    refresh_year, url, table_name, store=store, stages=run.scope(year), export=False, changes=changes,
+                )
+                for (url, table_name), year in zip(targets, years)
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        # Written even if a year failed, so the rows that did change are still reported
+        manifest = changes.write()
+
+    export_stage(store, run.scope("all"))
+    return manifest
+
+def run_precompute(run):
+    # precompute.py shares its name with the precompute/ package, so it is loaded by path
+    import runpy
+    # The precompute modules open the store from their own processes; a DuckDB file stays
+    # locked while this process holds it for writing
+    close_store()
+    pipeline = runpy.run_path(str(Path(__file__).with_name("precompute.py")), run_name="precompute_pipeline")
+    pipeline["main"](run.scope("all"))
+
 if __name__ == "__main__":
     current_month = datetime.now().month
+    targets = []
 
     # Only refresh previous year if we are not past April
     if current_month <= 4:
         print("Month is April or earlier — refreshing previous year's data...")
-        refresh_year(URL_PREVIOUS, TABLE_PREVIOUS)
+        targets.append((URL_PREVIOUS, TABLE_PREVIOUS))
     else:
         print("Month is after April — skipping previous year's data refresh.")
 
     # Always refresh current year
-    refresh_year(URL_CURRENT, TABLE_CURRENT)
+    targets.append((URL_CURRENT, TABLE_CURRENT))
 
-    print("\n✔ All done! Daily refresh complete.")
-    
-    # Run precompute after data refresh
-    print("\n⚙️  Running precompute pipeline...")
+    run = Run()
+    try:
+        refresh_years(targets, run)
 
-    import runpy
-    from pathlib import Path
-    runpy.run_path(str(Path(__file__).with_name("precompute.py")), run_name="__main__")
+        print("\n✔ All done! Daily refresh complete.")
 
-    print("✅ Precompute complete.")
\ No newline at end of file
+        # Run precompute after data refresh
+        print("\n⚙️  Running precompute pipeline...")
+        run_precompute(run)
+        print("✅ Precompute complete.")
+    finally:
+        run.finish()
\ No newline at end of file